@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark the monitored-address store against the previous dict-of-dicts layout.
+
+Builds ``count`` addresses both ways (half without metadata, the rest sharing
+one of a few feed descriptions, 1% above the alert threshold) and reports
+memory, build time, a full listing and the periodic threshold check.
+
+Usage: python benchmarks/bench_address_store.py [count]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.address_store import AddressStore  # noqa: E402
+from utils.pagination import KeysetIndex  # noqa: E402
+
+ALERT_THRESHOLD = 5
+FEEDS = [f"Imported from feed {i}" for i in range(20)]
+
+
+def build_rows(count: int):
+    """(address, added_at, suspicious_count, metadata) for every address."""
+    now = datetime.now().timestamp()
+    rows = []
+    for i in range(count):
+        address = f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"
+        count_ = ALERT_THRESHOLD + 1 if i % 100 == 0 else i % ALERT_THRESHOLD
+        metadata = {"description": FEEDS[i % len(FEEDS)]} if i % 2 else {}
+        rows.append((address, now - i, count_, metadata))
+    return rows
+
+
+def build_dicts(rows):
+    """The previous layout: a dict of ``datetime`` values and a metadata dict per address."""
+    addresses = {}
+    for record_id, (address, added_at, count, metadata) in enumerate(rows, 1):
+        moment = datetime.fromtimestamp(added_at)
+        addresses[address] = {"id": record_id, "added_at": moment, "suspicious_count": count,
+                              "last_checked": moment, "metadata": dict(metadata)}
+    return addresses
+
+
+def build_store(rows):
+    store = AddressStore()
+    for address, added_at, count, metadata in rows:
+        store.add(address, added_at, count, added_at, dict(metadata))
+    return store
+
+
+def measure(build, rows):
+    """Build with ``build`` and return (result, seconds, MB allocated)."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(rows)
+    elapsed = time.perf_counter() - started
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, size / 1024 / 1024
+
+
+def timed(label: str, func) -> None:
+    started = time.perf_counter()
+    result = func()
+    print(f"  {label:<28} {(time.perf_counter() - started) * 1000:>9.1f} ms  ({result:,})")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rows = build_rows(count)
+    print(f"{count:,} addresses")
+    
+    dicts, seconds, size = measure(build_dicts, rows)
+    print(f"dicts: built in {seconds:.2f}s, {size:,.0f} MB")
+    timed("list (copy every entry)", lambda: len([{"address": a, **d} for a, d in dicts.items()]))
+    timed("threshold check (scan)",
+          lambda: sum(1 for d in dicts.values() if d["suspicious_count"] >= ALERT_THRESHOLD))
+    del dicts
+    
+    store, seconds, size = measure(build_store, rows)
+    print(f"store: built in {seconds:.2f}s, {size:,.0f} MB ({store.get_status()['distinct_metadata']} distinct metadata)")
+    timed("list (live view)", lambda: sum(1 for _ in store.items()))
+    index = KeysetIndex()
+    for key in sorted((record.suspicious_count, record.id) for record in store.records()):
+        index.add(key)
+    timed("threshold check (index)", lambda: len(index.at_least((ALERT_THRESHOLD, 0))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop lag while a large log backlog is parsed on and off the loop.
+
+Parses the same batch of Cowrie JSON lines three ways: directly on the event
+loop, in chunks on the executor tier's thread pool and in chunks on its
+process pool. For each it reports wall-clock time and how late a 5 ms timer
+fires meanwhile, which is the delay commands and enforcement would see.
+Parsing is pure Python, so threads keep the loop responsive only between GIL
+switches; processes take the work off the loop entirely. Finally it cancels
+a process-pool map part-way through and checks that the queued chunks are
+dropped rather than run.
+
+Usage: python benchmarks/bench_executors.py [lines] [processes]
+"""
+import asyncio
+import functools
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.ingestion import parse_event_lines  # noqa: E402
+from utils import json_codec  # noqa: E402
+from utils.executors import ExecutorTier  # noqa: E402
+
+CHUNK_LINES = 2000
+TICK = 0.005
+
+
+def make_lines(count: int):
+    """Build ``count`` Cowrie-style event lines."""
+    return [
+        json_codec.dumps({
+            "eventid": "cowrie.login.failed", "src_ip": f"10.{i // 65536}.{i // 256 % 256}.{i % 256}",
+            "dst_port": 22, "username": "root", "password": f"hunter{i}", "session": f"{i:08x}",
+            "timestamp": "2024-01-01T00:00:00.000000Z"
+        }).encode() + b"\n"
+        for i in range(count)
+    ]
+
+
+async def measure(label: str, work) -> None:
+    """Run ``work()`` while sampling loop lag, then print the results."""
+    lags = []
+    
+    async def ticker():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - started - TICK)
+    
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK * 2)
+    started = time.perf_counter()
+    reports = await work()
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(TICK * 2)  # Let a tick delayed by the work record its lag
+    tick_task.cancel()
+    
+    lags.sort()
+    print(f"  {label:<8} {elapsed * 1000:7.0f} ms, {reports:,} reports, "
+          f"loop lag p50 {lags[len(lags) // 2] * 1000:.1f} ms, max {lags[-1] * 1000:.1f} ms")
+
+
+async def run(lines, processes: int) -> None:
+    executors = ExecutorTier(thread_workers=4, process_workers=processes)
+    parse = functools.partial(parse_event_lines, source="bench")
+    # Start the process pool before timing, as a long-running bot would have
+    await executors.map_chunks(parse, lines[:CHUNK_LINES * processes], CHUNK_LINES)
+    
+    async def inline():
+        return len(parse(lines)[0])
+    
+    async def chunked(process: bool):
+        results = await executors.map_chunks(parse, lines, CHUNK_LINES, process=process)
+        return sum(len(reports) for reports, _ in results)
+    
+    await measure("loop", inline)
+    await measure("threads", functools.partial(chunked, False))
+    await measure("processes", functools.partial(chunked, True))
+    
+    # Cancellation: chunks that haven't started must not run
+    before = executors.stats["process"].snapshot()
+    task = asyncio.ensure_future(executors.map_chunks(parse, lines, CHUNK_LINES // 4))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    after = executors.stats["process"].snapshot()
+    chunks = -(-len(lines) // (CHUNK_LINES // 4))
+    print(f"cancel after 50 ms: {after['cancelled'] - before['cancelled']} of {chunks} chunks dropped, "
+          f"{after['completed'] - before['completed']} completed, returned in "
+          f"{(time.perf_counter() - started) * 1000:.1f} ms")
+    
+    for kind, status in executors.get_status().items():
+        print(f"{kind} pool: {status['completed']} tasks, in flight {status['in_flight']}, "
+              f"latency p50 {status['latency_p50_ms']} ms, p95 {status['latency_p95_ms']} ms")
+    executors.shutdown()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else max(2, os.cpu_count() or 1)
+    lines = make_lines(count)
+    print(f"{count:,} lines in chunks of {CHUNK_LINES}, {processes} worker processes, {os.cpu_count()} CPU(s)")
+    asyncio.run(run(lines, processes))
+
+
+if __name__ == "__main__":
+    main()
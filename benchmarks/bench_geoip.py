@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark GeoIP range loading and lookup latency, cached and uncached.
+
+Builds a synthetic range CSV the size of a full country database, so no
+download is needed.
+
+Usage: python benchmarks/bench_geoip.py [ranges]
+"""
+import csv
+import ipaddress
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.geoip import GeoIPDatabase  # noqa: E402
+
+COUNTRIES = ["US", "CN", "DE", "RU", "BR", "IN", "FR", "GB", "NL", "KR", "JP", "VN"]
+LOOKUPS = 200_000
+HOT_ADDRESSES = 5000  # Distinct addresses in the cached workload
+
+
+def write_ranges(path: Path, count: int) -> None:
+    """Write ``count`` contiguous IPv4 ranges (and a tenth as many IPv6) with country and ASN columns."""
+    rng = random.Random(1)
+    step = (1 << 32) // count
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["start_ip", "end_ip", "country", "asn", "as_org"])
+        for i in range(count):
+            start = i * step
+            writer.writerow([ipaddress.IPv4Address(start), ipaddress.IPv4Address(start + step - 1),
+                             rng.choice(COUNTRIES), 64512 + i % 1000, f"Network {i % 1000}"])
+        base = int(ipaddress.IPv6Address("2001::"))
+        for i in range(count // 10):
+            start = base + (i << 96)
+            writer.writerow([ipaddress.IPv6Address(start), ipaddress.IPv6Address(start + (1 << 96) - 1),
+                             rng.choice(COUNTRIES), 64512 + i % 1000, f"Network {i % 1000}"])
+
+
+def time_lookups(database: GeoIPDatabase, addresses) -> float:
+    """Mean seconds per lookup over ``addresses``."""
+    lookup = database.lookup
+    started = time.perf_counter()
+    for address in addresses:
+        lookup(address)
+    return (time.perf_counter() - started) / len(addresses)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(2)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ranges.csv"
+        write_ranges(path, count)
+        
+        database = GeoIPDatabase(cache_size=65536)
+        started = time.perf_counter()
+        ranges = database.load_csv(str(path))
+        print(f"loaded {ranges:,} ranges in {time.perf_counter() - started:.1f}s")
+        
+        # Memory is measured on a second load, since tracing slows loading down several times
+        tracemalloc.start()
+        database = GeoIPDatabase(cache_size=65536)
+        database.load_csv(str(path))
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"index {current / 1024 / 1024:.1f} MB (peak {peak / 1024 / 1024:.1f} MB while loading)")
+    
+    unique = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(LOOKUPS)]
+    database.lookup.cache_clear()
+    print(f"uncached IPv4: {time_lookups(database, unique) * 1e9:,.0f} ns/lookup")
+    
+    hot = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(HOT_ADDRESSES)]
+    workload = [rng.choice(hot) for _ in range(LOOKUPS)]
+    time_lookups(database, hot)  # Warm the cache
+    print(f"cached:        {time_lookups(database, workload) * 1e9:,.0f} ns/lookup  {database.lookup.cache_info()}")
+    
+    ipv6 = [str(ipaddress.IPv6Address(int(ipaddress.IPv6Address("2001::")) + rng.getrandbits(112)))
+            for _ in range(LOOKUPS // 10)]
+    print(f"uncached IPv6: {time_lookups(database, ipv6) * 1e9:,.0f} ns/lookup  sample {database.lookup(ipv6[0])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming bulk import and export of monitored addresses.
+
+Usage: python benchmarks/bench_import.py [rows] [format]
+"""
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.database import DatabaseManager  # noqa: E402
+from services.honeypot_service import HoneypotService  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+
+def generate_feed(rows: int, fmt: str) -> bytes:
+    """Build a feed of random IPv4 addresses in the given format."""
+    rng = random.Random(42)
+    addresses = [
+        f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}"
+        for _ in range(rows)
+    ]
+    if fmt == "json":
+        return json.dumps(addresses).encode()
+    if fmt == "csv":
+        return ("address,description\n" + "\n".join(f"{a},feed" for a in addresses)).encode()
+    return "\n".join(addresses).encode()
+
+
+async def stream(data: bytes):
+    """Yield the feed in attachment-sized chunks."""
+    for i in range(0, len(data), CHUNK_SIZE):
+        yield data[i:i + CHUNK_SIZE]
+
+
+async def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fmt = sys.argv[2] if len(sys.argv) > 2 else "txt"
+    data = generate_feed(rows, fmt)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        bot = SimpleNamespace(db=DatabaseManager(str(Path(directory) / "bench.db")))
+        service = HoneypotService(bot)
+        
+        start = time.perf_counter()
+        stats = await service.import_addresses(stream(data), f"feed.{fmt}")
+        elapsed = time.perf_counter() - start
+        print(f"import {rows:,} rows ({fmt}, {len(data) / 1e6:.1f} MB): {elapsed:.2f}s "
+              f"({rows / elapsed:,.0f} rows/s) {stats}")
+        
+        start = time.perf_counter()
+        count = await service.export_addresses(Path(directory) / "export.csv.gz")
+        elapsed = time.perf_counter() - start
+        size = (Path(directory) / "export.csv.gz").stat().st_size
+        print(f"export {count:,} rows: {elapsed:.2f}s ({size / 1e6:.1f} MB compressed)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
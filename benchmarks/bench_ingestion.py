@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark sensor event ingestion throughput and its impact on event loop latency.
+
+Events are published by an in-process MQTT broker stand-in, so no broker is needed.
+
+Usage: python benchmarks/bench_ingestion.py [events] [events_per_message]
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.database import DatabaseManager  # noqa: E402
+from services.honeypot_service import HoneypotService  # noqa: E402
+from services.mqtt_ingestion_service import MqttIngestionService  # noqa: E402
+from utils import json_codec  # noqa: E402
+
+ADDRESS_COUNT = 10000
+
+
+class FakeMqttClient:
+    """Stands in for asyncio_mqtt.Client, replaying prepared payloads as fast as they are consumed."""
+    
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.done = asyncio.Event()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    async def subscribe(self, topic, qos=0):
+        pass
+    
+    @asynccontextmanager
+    async def messages(self, queue_maxsize=0):
+        yield self._replay()
+    
+    async def _replay(self):
+        for payload in self.payloads:
+            yield SimpleNamespace(topic="honeypot/bench", payload=payload)
+        self.done.set()
+        await asyncio.Event().wait()  # Stay connected like a real broker
+
+
+def build_payloads(events: int, per_message: int):
+    """Build Cowrie-style events against a fixed set of monitored addresses."""
+    addresses = [f"10.{i // 256 % 256}.{i % 256}.1" for i in range(ADDRESS_COUNT)]
+    records = [
+        {"eventid": "cowrie.login.failed", "src_ip": addresses[i % ADDRESS_COUNT], "sensor": "bench",
+         "username": "root", "timestamp": "2024-01-01T00:00:00"}
+        for i in range(events)
+    ]
+    payloads = [
+        json_codec.dumps(records[i:i + per_message] if per_message > 1 else records[i]).encode()
+        for i in range(0, events, per_message)
+    ]
+    return addresses, payloads
+
+
+async def measure_lag(stop: asyncio.Event, interval: float = 0.01):
+    """Track how late a periodic timer fires, as a proxy for gateway handling delay."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    per_message = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    addresses, payloads = build_payloads(events, per_message)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        bot = SimpleNamespace(db=DatabaseManager(str(Path(directory) / "bench.db")), services={})
+        honeypot = HoneypotService(bot)
+        bot.services["honeypot"] = honeypot
+        await honeypot.import_addresses(_chunks("\n".join(addresses).encode()), "addresses.txt")
+        await honeypot.start()
+        
+        client = FakeMqttClient(payloads)
+        service = MqttIngestionService(bot, client_factory=lambda: client)
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(measure_lag(stop))
+        
+        start = time.perf_counter()
+        await service.start()
+        await client.done.wait()
+        await service.pipeline.queue.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        worst_lag = await lag_task
+        
+        status = service.get_status()
+        print(f"ingested {status['reported']:,} events in {len(payloads):,} messages: {elapsed:.2f}s "
+              f"({status['reported'] / elapsed:,.0f} events/s), worst loop lag {worst_lag * 1000:.1f} ms")
+        await service.stop()
+        await honeypot.stop()
+
+
+async def _chunks(data: bytes):
+    yield data
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark content pattern matching as the pattern count grows.
+
+Compares the compiled PatternSet (Aho-Corasick phrases plus one combined
+regex) with running one regex per pattern, on synthetic chat messages.
+
+Usage: python benchmarks/bench_patterns.py [messages]
+"""
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.patterns import ContentPattern, PatternSet, tokenize  # noqa: E402
+
+PATTERN_COUNTS = (10, 100, 1000, 10000)
+NAIVE_LIMIT = 1000  # One regex per pattern gets too slow to time beyond this
+REGEXES = [
+    r"discord(?:app)?\.(?:gg|com/invite)/\w+",
+    r"\b(?:btc|eth|usdt)\s+giveaway\b",
+    r"free\s+nitro",
+    r"\bairdrop\b.*\bclaim\b",
+    r"https?://\S+\.(?:ru|tk|top)/",
+]
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+
+
+def build_patterns(count: int, rng: random.Random):
+    """``count`` random two-to-four word phrases, plus a few regexes."""
+    phrases = [" ".join(random_word(rng) for _ in range(rng.randint(2, 4))) for _ in range(count)]
+    patterns = [ContentPattern(f"phrase {i}", phrase, rng.choice(("log", "delete", "ban")))
+                for i, phrase in enumerate(phrases)]
+    patterns += [ContentPattern(f"regex {i}", regex, "delete", regex=True) for i, regex in enumerate(REGEXES)]
+    return patterns
+
+
+def build_messages(count: int, rng: random.Random):
+    """Chat-like messages of 3-30 random words."""
+    return [" ".join(random_word(rng) for _ in range(rng.randint(3, 30))) for _ in range(count)]
+
+
+def time_per_message(func, messages) -> float:
+    started = time.perf_counter()
+    for message in messages:
+        func(message)
+    return (time.perf_counter() - started) / len(messages)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(3)
+    messages = build_messages(count, rng)
+    mean_length = sum(map(len, messages)) / len(messages)
+    print(f"{count:,} messages, {mean_length:.0f} characters on average, {len(REGEXES)} regexes")
+    for pattern_count in PATTERN_COUNTS:
+        patterns = build_patterns(pattern_count, rng)
+        started = time.perf_counter()
+        pattern_set = PatternSet(patterns)
+        build_seconds = time.perf_counter() - started
+        # Plant some hits so the match path is exercised too
+        sample = [m + " " + patterns[i % pattern_count].pattern if i % 100 == 0 else m
+                  for i, m in enumerate(messages)]
+        compiled = time_per_message(pattern_set.match, sample)
+        phrases = time_per_message(lambda m: pattern_set.phrases.search(tokenize(m)), sample)
+        line = (f"{pattern_count:>6,} phrases: build {build_seconds:.2f}s, {pattern_set.phrases.state_count:,} states, "
+                f"{compiled * 1e6:5.1f} us/message ({phrases * 1e6:4.1f} us in phrases)")
+        if pattern_count <= NAIVE_LIMIT:
+            naive_regexes = [re.compile(re.escape(p.pattern) if not p.regex else p.pattern, re.IGNORECASE)
+                             for p in patterns]
+            naive = time_per_message(lambda m: [r.search(m) for r in naive_regexes], sample[:2000])
+            line += f"  (one regex per pattern: {naive * 1e6:,.1f} us/message)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
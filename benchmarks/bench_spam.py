@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark cross-channel spam detection: per-message cost and detection accuracy.
+
+Replays synthetic chat (random sentences from a fixed vocabulary across many
+channels) with spam bursts mixed in, where each spammer pastes lightly edited
+copies of one message into several channels.
+
+Usage: python benchmarks/bench_spam.py [messages]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import config  # noqa: E402
+from services.spam_detection_service import SpamDetectionService  # noqa: E402
+
+CHANNELS = 40
+AUTHORS = 2000
+VOCABULARY = 5000
+SPAM_SHARE = 0.01  # Share of messages that start a spam burst
+MESSAGES_PER_SECOND = 50
+
+
+def build_messages(count: int):
+    """Build (author_id, channel_id, content, spammer) tuples."""
+    rng = random.Random(7)
+    words = [f"w{i}" for i in range(VOCABULARY)]
+    messages = []
+    spammer = AUTHORS
+    while len(messages) < count:
+        if rng.random() < SPAM_SHARE:
+            spammer += 1
+            text = ["free", "nitro", "claim", "gift", "now"] + rng.sample(words, 15)
+            for channel in rng.sample(range(CHANNELS), config.SPAM_CHANNEL_THRESHOLD + 1):
+                copy = list(text)
+                copy[rng.randrange(len(copy))] = rng.choice(words)  # Light edit per paste
+                messages.append((spammer, channel, " ".join(copy), True))
+        else:
+            length = rng.randint(1, 30)
+            messages.append((rng.randrange(AUTHORS), rng.randrange(CHANNELS),
+                             " ".join(rng.choice(words) for _ in range(length)), False))
+    return messages[:count]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    messages = build_messages(count)
+    service = SpamDetectionService(SimpleNamespace(services={}))
+    
+    flagged_spammers = set()
+    false_flags = 0
+    started = time.perf_counter()
+    for i, (author, channel, content, is_spam) in enumerate(messages):
+        match = service.check(1, author, channel, content, timestamp=i / MESSAGES_PER_SECOND)
+        if match is not None:
+            if is_spam:
+                flagged_spammers.add(author)
+            else:
+                false_flags += 1
+    elapsed = time.perf_counter() - started
+    
+    spammers = {author for author, _, _, is_spam in messages if is_spam}
+    print(f"{count:,} messages, {len(spammers):,} spammers, threshold {config.SPAM_CHANNEL_THRESHOLD} channels "
+          f"in {config.SPAM_WINDOW_SECONDS}s")
+    print(f"{elapsed / count * 1e6:.1f} us/message, {len(flagged_spammers):,} spammers caught, "
+          f"{false_flags} false flags, {service.get_status()['indexed_messages']:,} messages indexed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTTP webhook ingestion endpoint with batches of 1, 100 and 10,000 events.
+
+Reports requests/s and the end-to-end cost per event (until every event has been
+reported to HoneypotService). Pass "db" to also persist activity to SQLite.
+
+Usage: python benchmarks/bench_webhook.py [events_per_size] [db]
+"""
+import asyncio
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import config  # noqa: E402
+from config.database import DatabaseManager  # noqa: E402
+from services.honeypot_service import HoneypotService  # noqa: E402
+from services.webhook_ingestion_service import WebhookIngestionService  # noqa: E402
+from utils import json_codec  # noqa: E402
+
+ADDRESS_COUNT = 10000
+BATCH_SIZES = (1, 100, 10000)
+CONCURRENCY = 16
+TOKEN = "bench-token"
+
+
+def free_port() -> int:
+    """Pick an unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def build_body(addresses, start: int, size: int, ndjson: bool) -> bytes:
+    """Build one request body of Cowrie-style events."""
+    events = [
+        {"eventid": "cowrie.session.connect", "src_ip": addresses[(start + i) % ADDRESS_COUNT], "dst_port": 22}
+        for i in range(size)
+    ]
+    if ndjson:
+        return b"\n".join(json_codec.dumps(event).encode() for event in events)
+    return json_codec.dumps(events if size > 1 else events[0]).encode()
+
+
+async def run_size(session, url: str, service, addresses, batch_size: int, total_events: int):
+    """POST ``total_events`` events in batches from concurrent clients and time it."""
+    requests = max(1, total_events // batch_size)
+    # Alternate array and NDJSON bodies so both parsers are exercised
+    bodies = [build_body(addresses, i * batch_size, batch_size, ndjson=i % 2 == 1) for i in range(min(requests, 64))]
+    headers = {"Authorization": f"Bearer {TOKEN}", "Content-Type": "application/json"}
+    next_request = iter(range(requests))
+    throttled = 0
+    
+    async def client():
+        nonlocal throttled
+        for i in next_request:
+            while True:
+                async with session.post(url, data=bodies[i % len(bodies)], headers=headers) as response:
+                    await response.read()
+                    if response.status != 429:
+                        break
+                throttled += 1
+                await asyncio.sleep(0.01)
+    
+    before = service.pipeline.stats["reported"]
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(CONCURRENCY)))
+    http_elapsed = time.perf_counter() - start
+    await service.pipeline.queue.join()
+    elapsed = time.perf_counter() - start
+    reported = service.pipeline.stats["reported"] - before
+    print(f"batch {batch_size:>6,}: {requests:>6,} requests, {requests / http_elapsed:>8,.0f} req/s, "
+          f"{reported / elapsed:>9,.0f} events/s, {elapsed / reported * 1e6:6.1f} us/event, {throttled} throttled")
+
+
+async def main():
+    total_events = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    use_db = len(sys.argv) > 2 and sys.argv[2] == "db"
+    addresses = [f"10.{i // 256 % 256}.{i % 256}.1" for i in range(ADDRESS_COUNT)]
+    
+    config.WEBHOOK_TOKENS = f"bench:{TOKEN}"
+    config.WEBHOOK_HOST = "127.0.0.1"
+    config.WEBHOOK_PORT = free_port()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseManager(str(Path(directory) / "bench.db")) if use_db else None
+        bot = SimpleNamespace(db=db, services={})
+        honeypot = HoneypotService(bot)
+        bot.services["honeypot"] = honeypot
+        await honeypot.import_addresses(_chunks("\n".join(addresses).encode()), "addresses.txt")
+        await honeypot.start()
+        service = WebhookIngestionService(bot)
+        await service.start()
+        
+        url = f"http://127.0.0.1:{config.WEBHOOK_PORT}/ingest"
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=CONCURRENCY)) as session:
+            for batch_size in BATCH_SIZES:
+                events = total_events if batch_size > 1 else min(total_events, 20000)
+                await run_size(session, url, service, addresses, batch_size, events)
+        
+        await service.stop()
+        await honeypot.stop()
+
+
+async def _chunks(data: bytes):
+    yield data
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark webhook ingestion in the bot process against ingestion in worker processes.
+
+A separate load generator process POSTs batches of events. For each mode this
+reports wall-clock throughput, the gateway process's CPU time per event and
+how late a 5 ms timer on the gateway's event loop fires while the load runs,
+which is what command and enforcement latency would feel. HoneypotService is
+replaced by a counter, so only ingestion and transport are measured.
+
+Usage: python benchmarks/bench_workers.py [events] [workers]
+"""
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TOKEN = "bench-token"
+BATCH_SIZE = 500
+CONCURRENCY = 8
+TICK = 0.005
+
+
+def free_port() -> int:
+    """Pick an unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def generate_load(port: int, total: int) -> None:
+    """Load generator process: POST ``total`` events from concurrent clients."""
+    import aiohttp
+    
+    from utils import json_codec
+    
+    body = json_codec.dumps([
+        {"eventid": "cowrie.session.connect", "src_ip": f"10.{i // 65536}.{i // 256 % 256}.{i % 256}", "dst_port": 22}
+        for i in range(BATCH_SIZE)
+    ]).encode()
+    requests = iter(range(total // BATCH_SIZE))
+    
+    async def client(session):
+        for _ in requests:
+            while True:
+                async with session.post(f"http://127.0.0.1:{port}/ingest", data=body,
+                                        headers={"Authorization": f"Bearer {TOKEN}"}) as response:
+                    if response.status != 429:
+                        break
+                await asyncio.sleep(0.01)
+    
+    async def main():
+        # A new connection per request, so SO_REUSEPORT can spread requests across workers
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(force_close=True)) as session:
+            await asyncio.gather(*(client(session) for _ in range(CONCURRENCY)))
+    
+    asyncio.run(main())
+
+
+class CountingHoneypot:
+    """Stand-in for HoneypotService that only counts reports."""
+    
+    dependencies = ()
+    ready = True
+    
+    def __init__(self):
+        self.reports = 0
+    
+    async def report_activities(self, reports) -> int:
+        self.reports += len(reports)
+        return len(reports)
+    
+    async def flush(self) -> None:
+        pass
+
+
+async def measure(service, honeypot: CountingHoneypot, port: int, total: int) -> None:
+    """Run the load against a started ingestion service and print the results."""
+    lags = []
+    
+    async def ticker():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - started - TICK)
+    
+    tick_task = asyncio.create_task(ticker())
+    cpu_started, started = time.process_time(), time.perf_counter()
+    load = multiprocessing.Process(target=generate_load, args=(port, total))
+    load.start()
+    while honeypot.reports < total:
+        await asyncio.sleep(0.05)
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+    tick_task.cancel()
+    load.join()
+    await service.stop()
+    
+    lags.sort()
+    print(f"  {total / elapsed:,.0f} events/s, gateway CPU {cpu / total * 1e6:.1f} us/event, "
+          f"loop lag p50 {lags[len(lags) // 2] * 1000:.1f} ms, p99 {lags[int(len(lags) * 0.99)] * 1000:.1f} ms, "
+          f"max {lags[-1] * 1000:.1f} ms")
+
+
+async def run_mode(workers: int, total: int) -> None:
+    port = free_port()
+    os.environ.update(WEBHOOK_ENABLED="True", WEBHOOK_TOKENS=f"bench:{TOKEN}", WEBHOOK_PORT=str(port),
+                      LOG_LEVEL="WARNING", WORKER_COUNT=str(workers))
+    from config import config
+    config.WEBHOOK_TOKENS, config.WEBHOOK_PORT, config.WORKER_COUNT = f"bench:{TOKEN}", port, workers
+    
+    honeypot = CountingHoneypot()
+    bot = SimpleNamespace(services={"honeypot": honeypot})
+    if workers:
+        from services.worker_hub_service import WorkerHubService
+        service = WorkerHubService(bot)
+        await service.start()
+        while not all(worker["connected"] for worker in service.workers.values()):
+            await asyncio.sleep(0.1)
+        await asyncio.sleep(1.0)  # Let the workers finish binding the webhook port
+        print(f"{workers} worker process(es):")
+    else:
+        from services.webhook_ingestion_service import WebhookIngestionService
+        service = WebhookIngestionService(bot)
+        await service.start()
+        print("in-process ingestion:")
+    await measure(service, honeypot, port, total)
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(WORKER_SOCKET_PATH=os.path.join(tmp, "workers.sock"), LOG_FILE=os.path.join(tmp, "bot.log"))
+        print(f"{total:,} events in batches of {BATCH_SIZE}, {CONCURRENCY} concurrent clients, "
+              f"{os.cpu_count()} CPU(s)")
+        for mode in (0, workers):
+            asyncio.run(run_mode(mode, total))
+
+
+if __name__ == "__main__":
+    main()
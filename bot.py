@@ -3,13 +3,37 @@ Main Discord bot entry point.
 """
 import asyncio
 import sys
+from datetime import datetime, timedelta
 
 import discord
 from discord.ext import commands
 
+from commands.deferred import DeferredRunner
 from config import config
-from services import HoneypotService, NotificationService
+from config.database import DatabaseManager
+from services import (BackupService, ContentFilterService, CorrelationService, FileTailService, GeoIPService,
+                      HoneypotService, MaintenanceService, MqttIngestionService, NotificationService, OverloadService,
+                      ServiceManager, SpamDetectionService, StatsService, SystemMonitorService, WatchdogService,
+                      WebhookIngestionService, WorkerHubService)
+from utils.executors import ExecutorTier
 from utils.logger import logger
+from utils.overload import DEFER_PURGES, DROP_COSMETIC, ESSENTIAL_ONLY, SKIP_COMMANDS
+from utils.response_cache import ResponseCache
+
+# Channel the bot guards: anyone posting here is banned
+TARGET_CHANNEL_ID = 1418079817256931350
+# Channel where responses and ban logs are sent
+LOG_CHANNEL_ID = 385510724912283648
+GHOST_ROLE_ID = 462663247934390275
+# Role IDs that are ignored completely
+WHITELIST_ROLE_IDS = {
+    462663247934390275,  # Ghost role
+    213335817823715328,  # mods
+    359424853285142539,  # Knowledgeable
+    890067789832929280,  # Helpful
+    213334124767739904,  # Daunzo
+}
+ELIMINATION_GIF_URL = "https://tenor.com/view/itachi-sharingan-mangekyou-tsukuyomi-tsukyomi-gif-2677620834910513053"
 
 
 class HoneypotWatcherBot(commands.Bot):
@@ -35,14 +59,53 @@ class HoneypotWatcherBot(commands.Bot):
             "commands.honeypot",
         ]
         
+        # Shared persistent storage
+        self.db = DatabaseManager(config.DATABASE_PATH)
+        
+        # Shared thread and process pools for work that must stay off the event loop
+        self.executors = ExecutorTier(config.EXECUTOR_THREADS, config.EXECUTOR_PROCESSES)
+        
+        # Prebuilt command responses; events below invalidate the ones built from guild data
+        self.response_cache = ResponseCache()
+        
+        # Bounded, deferred execution for commands that hit storage
+        self.command_runner = DeferredRunner(config.COMMAND_CONCURRENCY, config.COMMAND_QUEUE_LIMIT)
+        
         # Initialize services
         self.services = {}
         self._init_services()
+        self.service_manager = ServiceManager(self.services)
     
     def _init_services(self):
         """Initialize bot services."""
         self.services['honeypot'] = HoneypotService(self)
         self.services['notification'] = NotificationService(self)
+        self.services['maintenance'] = MaintenanceService(self)
+        if config.BACKUP_ENABLED:
+            self.services['backup'] = BackupService(self)
+        if config.GEOIP_PATHS:
+            self.services['geoip'] = GeoIPService(self)
+        self.services['stats'] = StatsService(self)
+        self.services['correlation'] = CorrelationService(self)
+        self.services['system_monitor'] = SystemMonitorService(self)
+        if config.OVERLOAD_ENABLED:
+            self.services['overload'] = OverloadService(self)
+        if config.WATCHDOG_ENABLED:
+            self.services['watchdog'] = WatchdogService(self)
+        if config.WORKER_COUNT > 0:
+            # Sensor ingestion runs in worker processes that forward reports here
+            self.services['worker_hub'] = WorkerHubService(self)
+        else:
+            if config.MQTT_ENABLED:
+                self.services['mqtt_ingestion'] = MqttIngestionService(self)
+            if config.WEBHOOK_ENABLED:
+                self.services['webhook_ingestion'] = WebhookIngestionService(self)
+            if config.TAIL_ENABLED:
+                self.services['file_tail'] = FileTailService(self)
+        if config.SPAM_DETECTION_ENABLED:
+            self.services['spam_detection'] = SpamDetectionService(self)
+        if config.CONTENT_FILTER_ENABLED:
+            self.services['content_filter'] = ContentFilterService(self)
     
     async def setup_hook(self):
         """Called when the bot is starting up."""
@@ -56,13 +119,11 @@ class HoneypotWatcherBot(commands.Bot):
             except Exception as e:
                 logger.error(f"Failed to load extension {extension}: {e}")
         
-        # Start services
-        for service_name, service in self.services.items():
-            try:
-                await service.start()
-                logger.info(f"Started service: {service_name}")
-            except Exception as e:
-                logger.error(f"Failed to start service {service_name}: {e}")
+        # Start services concurrently in dependency order
+        results = await self.service_manager.start_all()
+        failed = [name for name, ok in results.items() if not ok]
+        if failed:
+            logger.error(f"Services failed to start: {', '.join(failed)}")
         
         # Sync commands
         if config.DISCORD_GUILD_ID:
@@ -79,6 +140,8 @@ class HoneypotWatcherBot(commands.Bot):
         logger.info(f"Bot is ready! Logged in as {self.user}")
         logger.info(f"Bot ID: {self.user.id}")
         logger.info(f"Connected to {len(self.guilds)} guilds")
+        # Counts cached while members were still being chunked are stale now
+        self.response_cache.invalidate("guilds")
         
         # Set bot status
         activity = discord.Activity(
@@ -88,17 +151,35 @@ class HoneypotWatcherBot(commands.Bot):
         await self.change_presence(activity=activity)
         
         # Send "Pathetic." message to specific channel
-        target_channel_id = 1418079817256931350
-        log_channel_id = 385510724912283648
         try:
-            channel = self.get_channel(target_channel_id)
+            channel = self.get_channel(TARGET_CHANNEL_ID)
             if channel:
                 await channel.send("Pathetic.")
-                logger.info(f"Sent 'Pathetic.' message to channel {target_channel_id}")
+                logger.info(f"Sent 'Pathetic.' message to channel {TARGET_CHANNEL_ID}")
             else:
-                logger.warning(f"Could not find channel with ID {target_channel_id}")
+                logger.warning(f"Could not find channel with ID {TARGET_CHANNEL_ID}")
         except Exception as e:
-            logger.error(f"Failed to send message to channel {target_channel_id}: {e}")
+            logger.error(f"Failed to send message to channel {TARGET_CHANNEL_ID}: {e}")
+    
+    async def on_guild_available(self, guild):
+        """Called when a guild becomes available, e.g. after startup chunking or an outage."""
+        self.response_cache.invalidate("guilds")
+    
+    async def on_guild_join(self, guild):
+        """Called when the bot joins a guild."""
+        self.response_cache.invalidate("guilds")
+    
+    async def on_guild_remove(self, guild):
+        """Called when the bot leaves a guild."""
+        self.response_cache.invalidate("guilds")
+    
+    async def on_member_join(self, member):
+        """Called when a member joins a guild."""
+        self.response_cache.invalidate("guilds")
+    
+    async def on_member_remove(self, member):
+        """Called when a member leaves a guild."""
+        self.response_cache.invalidate("guilds")
     
     async def on_command_error(self, ctx, error):
         """Handle command errors."""
@@ -117,122 +198,203 @@ class HoneypotWatcherBot(commands.Bot):
         await ctx.send("❌ An error occurred while executing the command.")
     
     async def on_message(self, message):
-        """Handle incoming messages."""
+        """Handle incoming messages, counting in-flight handlers for overload control."""
+        overload = self.services.get('overload')
+        if overload is None:
+            await self._handle_message(message)
+            return
+        overload.in_flight += 1
+        try:
+            await self._handle_message(message)
+        finally:
+            overload.in_flight -= 1
+    
+    def _degraded(self, level: int) -> bool:
+        """Whether the overload controller is at ``level`` or above."""
+        overload = self.services.get('overload')
+        return overload is not None and overload.level >= level
+    
+    async def _handle_message(self, message):
+        """Enforce channel rules on a message, then process commands."""
         # Ignore messages from the bot itself
         if message.author == self.user:
             return
         
-        # Whitelist of role IDs that should be ignored
-        whitelist_roles = [
-            462663247934390275,  # Ghost role
-            213335817823715328,  # mods
-            359424853285142539,  # Knowledgeable
-            890067789832929280,  # Helpful
-            213334124767739904,  # Daunzo
-        ]
-        
-        # Check if user has any whitelisted roles
-        user_role_ids = [role.id for role in message.author.roles]
-        if any(role_id in whitelist_roles for role_id in user_role_ids):
-            # User has a whitelisted role, ignore completely
+        # Users with a whitelisted role are ignored completely
+        if self._is_whitelisted(message.author):
             return
         
-        # Check if message is in the target channel
-        target_channel_id = 1418079817256931350
-        log_channel_id = 385510724912283648
-        if message.channel.id == target_channel_id:
+        if message.channel.id == TARGET_CHANNEL_ID:
+            await self._handle_honeypot_message(message)
+        elif message.guild is not None:
+            if await self._check_content_patterns(message):
+                return
+            if not self._degraded(ESSENTIAL_ONLY):
+                await self._check_cross_channel_spam(message)
+        
+        # Process commands (important for command handling), unless shedding load
+        if not self._degraded(SKIP_COMMANDS):
+            await self.process_commands(message)
+    
+    def _is_whitelisted(self, member) -> bool:
+        """Whether a message author has any whitelisted role."""
+        return any(role.id in WHITELIST_ROLE_IDS for role in getattr(member, "roles", ()))
+    
+    async def _handle_honeypot_message(self, message):
+        """Delete a message posted in the target channel and ban its author."""
+        try:
+            # Delete the user's message first
             try:
-                # Check if user has the ghost role
-                ghost_role_id = 462663247934390275
-                has_ghost_role = any(role.id == ghost_role_id for role in message.author.roles)
-                
-                # Delete the user's message first
+                await message.delete()
+                logger.info(f"Deleted message from {message.author.name}")
+            except Exception as delete_error:
+                logger.error(f"Failed to delete message from {message.author.name}: {delete_error}")
+            
+            await self.ban_author(message, reason="Posted in restricted channel - auto-ban")
+        except Exception as e:
+            logger.error(f"Failed to respond to message in channel {TARGET_CHANNEL_ID}: {e}")
+    
+    async def _check_content_patterns(self, message) -> bool:
+        """Act on known scam phrases. Returns True if the message was removed."""
+        content_filter = self.services.get('content_filter')
+        if not content_filter or not content_filter.ready:
+            return False
+        match = content_filter.scan(message.content)
+        if match is None:
+            return False
+        
+        pattern = match.pattern
+        logger.warning(f"Message from {message.author.name} ({message.author.id}) matched pattern "
+                       f"'{pattern.name}' ({pattern.action})")
+        try:
+            if pattern.action != "log":
                 try:
                     await message.delete()
-                    logger.info(f"Deleted message from {message.author.name}")
                 except Exception as delete_error:
                     logger.error(f"Failed to delete message from {message.author.name}: {delete_error}")
-                
-                # BAN THE USER AND DELETE THEIR MESSAGES FROM PAST 24 HOURS
+            if pattern.action == "ban":
+                await self.ban_author(message, reason=f"Matched content pattern '{pattern.name}' - auto-ban")
+                return True
+            if self._degraded(DROP_COSMETIC):
+                return pattern.action != "log"
+            log_channel = self.get_channel(LOG_CHANNEL_ID)
+            if log_channel:
+                await log_channel.send(
+                    f"🚫 **PATTERN MATCH**\n**User:** {message.author.name} ({message.author.id})\n"
+                    f"**Channel:** {message.channel.name} ({message.channel.id})\n"
+                    f"**Pattern:** {pattern.name}\n**Matched:** {match.text[:100]}\n"
+                    f"**Action:** {'MESSAGE DELETED' if pattern.action == 'delete' else 'LOGGED'}"
+                )
+        except Exception as e:
+            logger.error(f"Failed to act on pattern match from {message.author.name}: {e}")
+        return pattern.action != "log"
+    
+    async def _check_cross_channel_spam(self, message):
+        """Flag or ban an author pasting near-identical text across channels."""
+        spam_service = self.services.get('spam_detection')
+        if not spam_service or not spam_service.ready:
+            return
+        match = spam_service.check(message.guild.id, message.author.id, message.channel.id, message.content)
+        if match is None:
+            return
+        
+        channels = ", ".join(f"<#{channel_id}>" for channel_id in match.channel_ids)
+        logger.warning(f"Cross-channel spam from {message.author.name} ({message.author.id}) in {channels}")
+        try:
+            if config.SPAM_ACTION == "ban":
+                await self.ban_author(message, reason=f"Cross-channel spam in {len(match.channel_ids)} channels - auto-ban")
+                return
+            if self._degraded(DROP_COSMETIC):
+                return
+            log_channel = self.get_channel(LOG_CHANNEL_ID)
+            if log_channel:
+                await log_channel.send(
+                    f"⚠️ **CROSS-CHANNEL SPAM**\n**User:** {message.author.name} ({message.author.id})\n"
+                    f"**Channels:** {channels}\n**Similar messages:** {match.similar_messages}\n"
+                    f"**Message:** {message.content[:100]}{'...' if len(message.content) > 100 else ''}"
+                )
+        except Exception as e:
+            logger.error(f"Failed to act on cross-channel spam from {message.author.name}: {e}")
+    
+    async def ban_author(self, message, reason: str):
+        """Ban a message's author, purge their messages from the past 24 hours and log it."""
+        has_ghost_role = any(role.id == GHOST_ROLE_ID for role in getattr(message.author, "roles", ()))
+        
+        # BAN THE USER AND DELETE THEIR MESSAGES FROM PAST 24 HOURS
+        try:
+            # Ban the user
+            await message.author.ban(reason=reason)
+            logger.warning(f"BANNED user {message.author.name} ({message.author.id}): {reason}")
+            
+            # Delete all messages from this user in ALL CHANNELS in the past 24 hours; under load this waits
+            cutoff_time = datetime.utcnow() - timedelta(hours=24)
+            if self._degraded(DEFER_PURGES):
+                guild, author = message.guild, message.author
+                self.services['overload'].defer(
+                    lambda: self._purge_and_log(guild, author, cutoff_time),
+                    f"purge of user {author.id} ({author.name}) in guild {guild.id} after {cutoff_time.isoformat()} UTC"
+                )
+                logger.warning(f"Deferred purge of {message.author.name}'s messages until load drops")
+            else:
+                await self._purge_and_log(message.guild, message.author, cutoff_time)
+        
+        except Exception as ban_error:
+            logger.error(f"Failed to ban user {message.author.name}: {ban_error}")
+        
+        if self._degraded(DROP_COSMETIC):
+            return
+        
+        # Send elimination messages to log channel instead
+        log_channel = self.get_channel(LOG_CHANNEL_ID)
+        if log_channel:
+            await log_channel.send(f"***{message.author.name} eliminated.***")
+            await log_channel.send(ELIMINATION_GIF_URL)
+        
+        # Log activity to the log channel
+        try:
+            if log_channel:
+                log_message = f"💥 **NUCLEAR BAN EXECUTED**\n**User:** {message.author.name} ({message.author.id})\n**Channel:** {message.channel.name} ({message.channel.id})\n**Ghost Role:** {'Yes' if has_ghost_role else 'No'}\n**Reason:** {reason}\n**Message:** {message.content[:100]}{'...' if len(message.content) > 100 else ''}\n**Action:** BANNED + ALL MESSAGES PURGED FROM ALL CHANNELS (past 24h)"
+                await log_channel.send(log_message)
+            else:
+                logger.warning(f"Could not find log channel with ID {LOG_CHANNEL_ID}")
+        except Exception as log_error:
+            logger.error(f"Failed to log activity to channel {LOG_CHANNEL_ID}: {log_error}")
+        
+        logger.info(f"Responded to message from {message.author.name} in channel {message.channel.id} (ghost role: {has_ghost_role})")
+    
+    async def _purge_and_log(self, guild, author, cutoff_time: datetime):
+        """Purge a banned author's messages since ``cutoff_time`` and log how many were deleted."""
+        deleted_count, total_channels = await self._purge_recent_messages(guild, author.id, cutoff_time)
+        logger.warning(f"NUCLEAR PURGE: Deleted {deleted_count} messages from banned user {author.name} across {total_channels} channels")
+    
+    async def _purge_recent_messages(self, guild, author_id: int, cutoff_time: datetime):
+        """Delete an author's messages sent after ``cutoff_time`` (UTC) in every channel. Returns (deleted, channels)."""
+        deleted_count = 0
+        total_channels = 0
+        
+        # Loop through ALL channels in the server
+        for channel in guild.channels:
+            if hasattr(channel, 'history'):  # Only text channels have history
+                total_channels += 1
                 try:
-                    # Ban the user
-                    await message.author.ban(reason="Posted in restricted channel - auto-ban")
-                    logger.warning(f"BANNED user {message.author.name} ({message.author.id}) for posting in restricted channel")
-                    
-                    # Delete all messages from this user in ALL CHANNELS in the past 24 hours
-                    from datetime import datetime, timedelta
-                    cutoff_time = datetime.utcnow() - timedelta(hours=24)
-                    
-                    deleted_count = 0
-                    total_channels = 0
-                    
-                    # Loop through ALL channels in the server
-                    for channel in message.guild.channels:
-                        if hasattr(channel, 'history'):  # Only text channels have history
-                            total_channels += 1
+                    async for msg in channel.history(limit=None, after=cutoff_time):
+                        if msg.author.id == author_id:
                             try:
-                                async for msg in channel.history(limit=None, after=cutoff_time):
-                                    if msg.author.id == message.author.id:
-                                        try:
-                                            await msg.delete()
-                                            deleted_count += 1
-                                        except Exception as msg_delete_error:
-                                            logger.error(f"Failed to delete message {msg.id} in {channel.name}: {msg_delete_error}")
-                            except Exception as channel_error:
-                                logger.error(f"Failed to access channel {channel.name}: {channel_error}")
-                    
-                    logger.warning(f"NUCLEAR PURGE: Deleted {deleted_count} messages from banned user {message.author.name} across {total_channels} channels")
-                    
-                except Exception as ban_error:
-                    logger.error(f"Failed to ban user {message.author.name}: {ban_error}")
-                
-                # Send elimination messages to log channel instead
-                log_channel = self.get_channel(log_channel_id)
-                if log_channel:
-                    if has_ghost_role:
-                        # Special message for ghost role users
-                        await log_channel.send(f"***{message.author.name} eliminated.***")
-                        
-                        # Send the GIF
-                        gif_url = "https://tenor.com/view/itachi-sharingan-mangekyou-tsukuyomi-tsukyomi-gif-2677620834910513053"
-                        await log_channel.send(gif_url)
-                    else:
-                        # Regular elimination message
-                        await log_channel.send(f"***{message.author.name} eliminated.***")
-                        
-                        # Send the GIF
-                        gif_url = "https://tenor.com/view/itachi-sharingan-mangekyou-tsukuyomi-tsukyomi-gif-2677620834910513053"
-                        await log_channel.send(gif_url)
-                
-                # Log activity to the log channel
-                try:
-                    log_channel = self.get_channel(log_channel_id)
-                    if log_channel:
-                        log_message = f"💥 **NUCLEAR BAN EXECUTED**\n**User:** {message.author.name} ({message.author.id})\n**Channel:** {message.channel.name} ({message.channel.id})\n**Ghost Role:** {'Yes' if has_ghost_role else 'No'}\n**Message:** {message.content[:100]}{'...' if len(message.content) > 100 else ''}\n**Action:** BANNED + ALL MESSAGES PURGED FROM ALL CHANNELS (past 24h)"
-                        await log_channel.send(log_message)
-                    else:
-                        logger.warning(f"Could not find log channel with ID {log_channel_id}")
-                except Exception as log_error:
-                    logger.error(f"Failed to log activity to channel {log_channel_id}: {log_error}")
- 
-                logger.info(f"Responded to message from {message.author.name} in channel {target_channel_id} (ghost role: {has_ghost_role})")
-            except Exception as e:
-                logger.error(f"Failed to respond to message in channel {target_channel_id}: {e}")
-        
-        # Process commands (important for command handling)
-        await self.process_commands(message)
+                                await msg.delete()
+                                deleted_count += 1
+                            except Exception as msg_delete_error:
+                                logger.error(f"Failed to delete message {msg.id} in {channel.name}: {msg_delete_error}")
+                except Exception as channel_error:
+                    logger.error(f"Failed to access channel {channel.name}: {channel_error}")
+        return deleted_count, total_channels
     
     async def close(self):
         """Called when the bot is shutting down."""
         logger.info("Bot is shutting down...")
         
-        # Stop services
-        for service_name, service in self.services.items():
-            try:
-                await service.stop()
-                logger.info(f"Stopped service: {service_name}")
-            except Exception as e:
-                logger.error(f"Failed to stop service {service_name}: {e}")
+        # Stop services in reverse dependency order
+        await self.service_manager.stop_all()
+        self.executors.shutdown(wait=False)
         
         await super().close()
 
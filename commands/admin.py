@@ -1,18 +1,57 @@
 """
 Admin commands for the Discord bot.
 """
+import os
+from typing import Literal
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 from utils.logger import logger
 
+# Metrics shown in /admin_status: (snapshot key, label, unit, decimals)
+SYSTEM_METRICS = (
+    ("rss_mb", "Memory", " MB", 1),
+    ("cpu_percent", "CPU", "%", 1),
+    ("open_fds", "Open FDs", "", 0),
+    ("tasks", "Tasks", "", 0),
+    ("loop_lag_ms", "Loop lag", " ms", 1),
+    ("gateway_latency_ms", "Gateway", " ms", 0),
+    ("overload_level", "Overload level", "", 1)
+)
+
+
+def _format_system_metrics(snapshot) -> str:
+    """Render each metric's latest value and its min/avg/max per window."""
+    lines = []
+    for key, label, unit, decimals in SYSTEM_METRICS:
+        metric = snapshot["metrics"][key]
+        if metric["current"] is None:
+            lines.append(f"**{label}:** n/a")
+            continue
+        windows = [
+            f"{window} {'/'.join(f'{value:.{decimals}f}' for value in summary)}"
+            for window, summary in metric.items() if window != "current" and summary
+        ]
+        lines.append(f"**{label}:** {metric['current']:.{decimals}f}{unit} ({' · '.join(windows)})")
+    return "\n".join(lines) + "\n*min/avg/max over 1m · 5m · 15m*"
+
 
 class AdminCommands(commands.Cog):
     """Administrative commands."""
     
     def __init__(self, bot):
         self.bot = bot
+        self.cache = bot.response_cache
+    
+    async def cog_load(self):
+        """Build the static responses up front."""
+        self.cache.get("admin_config", self._build_config, tags=(self.qualified_name,))
+    
+    async def cog_unload(self):
+        """Drop this cog's cached responses so a reload rebuilds them."""
+        self.cache.invalidate(self.qualified_name)
     
     def cog_check(self, ctx):
         """Check if user has admin permissions."""
@@ -29,50 +68,240 @@ class AdminCommands(commands.Cog):
         # Bot info
         embed.add_field(
             name="Bot Information",
-            value=f"**Name:** {self.bot.user.name}\n**ID:** {self.bot.user.id}\n**Version:** discord.py {discord.__version__}",
+            value=self.cache.get(
+                "admin_status_bot",
+                lambda: f"**Name:** {self.bot.user.name}\n**ID:** {self.bot.user.id}\n"
+                        f"**Version:** discord.py {discord.__version__}",
+                tags=(self.qualified_name,)
+            ),
             inline=False
         )
         
-        # System info
-        import os
-
-        import psutil
-        process = psutil.Process(os.getpid())
-        memory_usage = process.memory_info().rss / 1024 / 1024  # MB
+        # System info, from the background sampler's latest snapshot
+        monitor = getattr(self.bot, 'services', {}).get('system_monitor')
+        if monitor and monitor.snapshot:
+            system_info = _format_system_metrics(monitor.snapshot)
+        else:
+            system_info = "System sampler is not running"
         
         embed.add_field(
             name="System Information",
-            value=f"**Memory Usage:** {memory_usage:.2f} MB\n**CPU Usage:** {process.cpu_percent():.1f}%",
+            value=system_info,
             inline=False
         )
         
-        # Guild info
+        # Guild info, rebuilt only on guild and member events
         embed.add_field(
             name="Guild Information",
-            value=f"**Total Guilds:** {len(self.bot.guilds)}\n**Total Users:** {len(self.bot.users)}",
+            value=self.cache.get(
+                "admin_status_guilds",
+                lambda: f"**Total Guilds:** {len(self.bot.guilds)}\n**Total Users:** {len(self.bot.users)}",
+                tags=("guilds", self.qualified_name)
+            ),
+            inline=False
+        )
+        
+        # Services status, rebuilt only when a service starts or stops
+        embed.add_field(
+            name="Services Status",
+            value=self.cache.get("admin_status_services", self._build_services_status,
+                                 tags=("services", self.qualified_name)),
             inline=False
         )
         
-        # Services status
+        # Overload control: current degradation level and what has been shed
+        overload = getattr(self.bot, 'services', {}).get('overload')
+        if overload and overload.ready:
+            overload_status = overload.get_status()
+            embed.add_field(
+                name="Overload Control",
+                value=f"**Level:** {overload_status['level']} ({overload_status['level_name']}) · "
+                      f"**In flight:** {overload_status['in_flight']} (peak {overload_status['peak_in_flight']})\n"
+                      f"**Level changes:** {overload_status['level_changes']:,} · "
+                      f"**Deferred purges:** {overload_status['deferred']:,} "
+                      f"({overload_status['dropped_deferred']:,} dropped)",
+                inline=False
+            )
+        
+        # Deferred command execution: queue depth and per-command latency
+        command_runner = getattr(self.bot, 'command_runner', None)
+        if command_runner and command_runner.histograms:
+            runner_status = command_runner.get_status()
+            lines = [f"**Running:** {runner_status['running']} · **Waiting:** {runner_status['waiting']} · "
+                     f"**Rejected:** {runner_status['rejected']:,} · **Failed:** {runner_status['failed']:,}"]
+            busiest = sorted(runner_status["commands"].items(), key=lambda item: item[1]["count"], reverse=True)
+            for name, latency in busiest[:8]:
+                lines.append(f"• `/{name}`: {latency['count']:,} runs, p50 ≤{latency['p50_ms']:.0f} ms, "
+                             f"p95 ≤{latency['p95_ms']:.0f} ms, max {latency['max_ms']:.0f} ms")
+            embed.add_field(
+                name="Commands",
+                value="\n".join(lines),
+                inline=False
+            )
+        
+        # Response cache effectiveness
+        cache_status = self.cache.get_status()
+        if cache_status["hit_rate"] is not None:
+            embed.add_field(
+                name="Response Cache",
+                value=f"**Entries:** {cache_status['entries']} · **Hits:** {cache_status['hits']:,} · "
+                      f"**Builds:** {cache_status['builds']:,} · **Hit rate:** {cache_status['hit_rate']:.0%}",
+                inline=False
+            )
+        
+        # Shared executor pools: queue depth and recent task latency
+        executors = getattr(self.bot, 'executors', None)
+        if executors:
+            lines = []
+            for kind, pool in executors.get_status().items():
+                latency = f"p50 {pool['latency_p50_ms']} ms, p95 {pool['latency_p95_ms']} ms" \
+                    if pool["latency_p50_ms"] is not None else "no tasks yet"
+                lines.append(f"• {kind}: {pool['workers']} workers, {pool['in_flight']} in flight, "
+                             f"{pool['completed']:,} done, {latency}")
+            embed.add_field(
+                name="Executors",
+                value="\n".join(lines),
+                inline=False
+            )
+        
+        # Per-process ingestion throughput in multi-process mode
+        worker_hub = getattr(self.bot, 'services', {}).get('worker_hub')
+        if worker_hub and worker_hub.ready:
+            hub_status = worker_hub.get_status()
+            gateway = hub_status["gateway"]
+            lines = [f"• gateway (pid {gateway['pid']}): {gateway['events_per_second']:,.1f} ev/s, "
+                     f"{gateway['cpu_percent']:.0f}% CPU, {gateway['rss_mb']:.0f} MB"]
+            for index, worker in hub_status["workers"].items():
+                state = "🟢" if worker["connected"] else "🔴"
+                line = f"• {state} worker {index} (pid {worker['pid']}): {worker['events_per_second']:,.1f} ev/s"
+                if "cpu_percent" in worker:
+                    line += f", {worker['cpu_percent']:.0f}% CPU, {worker['rss_mb']:.0f} MB"
+                if worker["restarts"]:
+                    line += f", {worker['restarts']} restart(s)"
+                lines.append(line)
+            embed.add_field(
+                name="Processes",
+                value="\n".join(lines),
+                inline=False
+            )
+        
+        await interaction.response.send_message(embed=embed)
+    
+    def _build_services_status(self) -> str:
+        """List each service with its state."""
         services_status = "**Services:**\n"
         if hasattr(self.bot, 'services'):
             for service_name, service in self.bot.services.items():
-                status = "🟢 Running" if service.running else "🔴 Stopped"
+                if service.ready:
+                    status = f"🟢 Ready ({service.startup_duration:.2f}s)"
+                elif service.running:
+                    status = "🟡 Running"
+                else:
+                    status = "🔴 Stopped"
                 services_status += f"• {service_name}: {status}\n"
         else:
             services_status += "No services loaded"
+        return services_status
+    
+    @app_commands.command(name="admin_stalls", description="Show call sites that blocked the event loop (Admin only)")
+    async def admin_stalls(self, interaction: discord.Interaction, reset: bool = False):
+        """Show the call sites that blocked the event loop longest."""
+        watchdog_service = getattr(self.bot, 'services', {}).get('watchdog')
+        if not watchdog_service or not watchdog_service.ready:
+            await interaction.response.send_message("❌ The event loop watchdog is not running.", ephemeral=True)
+            return
         
-        embed.add_field(
-            name="Services Status",
-            value=services_status,
-            inline=False
+        watchdog = watchdog_service.watchdog
+        embed = discord.Embed(
+            title="⏱️ Event Loop Stalls",
+            description=f"**{watchdog.total_stalls:,}** stalls over {watchdog.threshold * 1000:.0f} ms, "
+                        f"**{watchdog.total_blocked:.2f}s** blocked in total",
+            color=discord.Color.orange() if watchdog.total_stalls else discord.Color.green()
         )
+        sites = watchdog.top_sites(5)
+        for entry in sites:
+            embed.add_field(
+                name=entry["site"][:256],
+                value=f"**Count:** {entry['count']:,} · **Total:** {entry['total']:.2f}s · "
+                      f"**Max:** {entry['max']:.2f}s · **Last:** {entry['last_seen'][:19]}",
+                inline=False
+            )
+        if sites:
+            # The stack of the single worst stall at the top call site
+            embed.add_field(
+                name="Worst stack",
+                value=f"```\n{sites[0]['stack'][-1000:]}```",
+                inline=False
+            )
+        if reset:
+            watchdog.reset()
+            embed.set_footer(text="Counters reset")
         
         await interaction.response.send_message(embed=embed)
     
+    @app_commands.command(name="admin_backup", description="Back up the database or verify snapshots (Admin only)")
+    @app_commands.describe(action="Take a snapshot now, integrity-check every snapshot, or list them")
+    async def admin_backup(self, interaction: discord.Interaction, action: Literal["run", "verify", "list"] = "list"):
+        """Take a database snapshot, verify the existing ones, or list them."""
+        backup_service = getattr(self.bot, 'services', {}).get('backup')
+        if not backup_service or not backup_service.ready:
+            await interaction.response.send_message("❌ Database backups are not enabled.", ephemeral=True)
+            return
+        
+        await interaction.response.defer(thinking=True)
+        if action == "run":
+            result = await backup_service.run_backup()
+            if not result:
+                await interaction.followup.send("❌ Backup failed; check the logs.")
+                return
+            embed = discord.Embed(
+                title="✅ Backup Complete",
+                description=f"`{os.path.basename(result['path'])}` ({result['bytes'] / 1024 / 1024:.1f} MB)",
+                color=discord.Color.green()
+            )
+            embed.add_field(
+                name="Details",
+                value=f"**Pages:** {result['pages']:,} in {result['steps']:,} steps\n"
+                      f"**Addresses:** {result['addresses']:,}\n**Activity logs:** {result['activity_logs']:,}\n"
+                      f"**Took:** {result['seconds']}s",
+                inline=False
+            )
+        elif action == "verify":
+            results = await backup_service.verify_snapshots()
+            failed = [name for name, result in results.items() if not result["ok"]]
+            embed = discord.Embed(
+                title="🔍 Snapshot Verification",
+                description=f"{len(results) - len(failed)} of {len(results)} snapshots passed the integrity check",
+                color=discord.Color.red() if failed else discord.Color.green()
+            )
+            lines = []
+            for name, result in list(results.items())[-15:]:
+                if result["ok"]:
+                    lines.append(f"✅ `{name}`: {result['addresses']:,} addresses, {result['seconds']}s")
+                else:
+                    lines.append(f"❌ `{name}`: {result['problems'][0][:80]}")
+            embed.add_field(name="Snapshots", value="\n".join(lines) or "No snapshots yet", inline=False)
+        else:
+            snapshots = backup_service.list_snapshots()
+            lines = [f"• `{os.path.basename(path)}` ({os.path.getsize(path) / 1024 / 1024:.1f} MB)"
+                     for path in snapshots[-15:]]
+            embed = discord.Embed(
+                title="💾 Database Snapshots",
+                description="\n".join(lines) or "No snapshots yet",
+                color=discord.Color.blue()
+            )
+            embed.set_footer(text=f"{len(snapshots)} snapshot(s) in {backup_service.directory}")
+        
+        await interaction.followup.send(embed=embed)
+    
     @app_commands.command(name="admin_config", description="Show bot configuration (Admin only)")
     async def admin_config(self, interaction: discord.Interaction):
         """Show bot configuration."""
+        embed = self.cache.get("admin_config", self._build_config, tags=(self.qualified_name,))
+        await interaction.response.send_message(embed=embed)
+    
+    def _build_config(self) -> discord.Embed:
+        """Build the configuration embed; config and intents are fixed for the life of the process."""
         from config import config
         
         embed = discord.Embed(
@@ -108,8 +337,7 @@ class AdminCommands(commands.Cog):
             value="\n".join(intents_list),
             inline=False
         )
-        
-        await interaction.response.send_message(embed=embed)
+        return embed
     
     @app_commands.command(name="admin_reload", description="Reload bot extensions (Admin only)")
     async def admin_reload(self, interaction: discord.Interaction, extension: str):
@@ -0,0 +1,101 @@
+"""
+Deferred execution for slash commands whose work may outlast Discord's response deadline.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import discord
+
+from utils.logger import logger
+from utils.metrics import LatencyHistogram
+
+# Work returns the keyword arguments for the follow-up message, or None if it responded itself
+CommandWork = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class DeferredRunner:
+    """Defers interactions at once, then runs their work under global and per-command limits.
+    
+    At most ``max_concurrency`` commands run at a time, and each command name
+    has its own limit on top. Up to ``queue_limit`` more may wait for a slot;
+    beyond that the user is told to retry instead of the backlog growing.
+    Every command's latency, from the call to ``run`` until its follow-up is
+    sent, goes into a per-command histogram.
+    """
+    
+    def __init__(self, max_concurrency: int, queue_limit: int):
+        self.max_concurrency = max_concurrency
+        self.queue_limit = queue_limit
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._command_slots: Dict[str, asyncio.Semaphore] = {}
+        self.waiting = 0
+        self.running = 0
+        self.rejected = 0
+        self.failed = 0
+        self.histograms: Dict[str, LatencyHistogram] = {}
+    
+    async def run(self, interaction: discord.Interaction, name: str, work: CommandWork, limit: int = 1,
+                  ephemeral: bool = False) -> None:
+        """Defer ``interaction``, run ``work`` once a slot is free and send its result as a follow-up.
+        
+        The first follow-up replaces the "thinking" response and takes its
+        visibility, so ``ephemeral`` decides who sees the result or error.
+        A rejection before deferring is always ephemeral.
+        """
+        started = time.perf_counter()
+        if self.waiting >= self.queue_limit:
+            self.rejected += 1
+            message = "⏳ The bot is busy right now; please try again shortly."
+            if interaction.response.is_done():
+                await interaction.followup.send(message)
+            else:
+                await interaction.response.send_message(message, ephemeral=True)
+            return
+        
+        if not interaction.response.is_done():
+            await interaction.response.defer(thinking=True, ephemeral=ephemeral)
+        
+        command_slots = self._command_slots.get(name)
+        if command_slots is None:
+            command_slots = self._command_slots[name] = asyncio.Semaphore(limit)
+        
+        self.waiting += 1
+        try:
+            await command_slots.acquire()
+            try:
+                await self._slots.acquire()
+            except BaseException:
+                command_slots.release()
+                raise
+        finally:
+            self.waiting -= 1
+        
+        self.running += 1
+        try:
+            response = await work()
+            if response is not None:
+                await interaction.followup.send(**response)
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Command {name} failed: {e}")
+            try:
+                await interaction.followup.send(f"❌ `/{name}` failed; please try again.")
+            except discord.HTTPException:
+                pass
+        finally:
+            self.running -= 1
+            self._slots.release()
+            command_slots.release()
+            self.histograms.setdefault(name, LatencyHistogram()).record(time.perf_counter() - started)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Queue depth, rejections and per-command latency."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "commands": {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+        }
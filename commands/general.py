@@ -13,6 +13,15 @@ class GeneralCommands(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
+        self.cache = bot.response_cache
+    
+    async def cog_load(self):
+        """Build the static responses up front."""
+        self.cache.get("help", self._build_help, tags=(self.qualified_name,))
+    
+    async def cog_unload(self):
+        """Drop this cog's cached responses so a reload rebuilds them."""
+        self.cache.invalidate(self.qualified_name)
     
     @app_commands.command(name="ping", description="Check bot latency")
     async def ping(self, interaction: discord.Interaction):
@@ -28,6 +37,11 @@ class GeneralCommands(commands.Cog):
     @app_commands.command(name="help", description="Show bot help information")
     async def help_command(self, interaction: discord.Interaction):
         """Show bot help information."""
+        embed = self.cache.get("help", self._build_help, tags=(self.qualified_name,))
+        await interaction.response.send_message(embed=embed)
+    
+    def _build_help(self) -> discord.Embed:
+        """Build the help embed."""
         embed = discord.Embed(
             title="🤖 HoneypotWatcher Bot Help",
             description="A Discord bot for monitoring honeypot activities.",
@@ -53,7 +67,7 @@ class GeneralCommands(commands.Cog):
         )
         
         embed.set_footer(text="Use / before commands to use slash commands")
-        await interaction.response.send_message(embed=embed)
+        return embed
     
     @app_commands.command(name="status", description="Show bot status")
     async def status(self, interaction: discord.Interaction):
@@ -70,10 +84,14 @@ class GeneralCommands(commands.Cog):
             inline=False
         )
         
-        # Guild info
+        # Guild info; counting users copies the whole user cache, so the text is rebuilt only on guild events
         embed.add_field(
             name="Guild Info",
-            value=f"**Guilds:** {len(self.bot.guilds)}\n**Users:** {len(self.bot.users)}",
+            value=self.cache.get(
+                "status_guilds",
+                lambda: f"**Guilds:** {len(self.bot.guilds)}\n**Users:** {len(self.bot.users)}",
+                tags=("guilds", self.qualified_name)
+            ),
             inline=False
         )
         
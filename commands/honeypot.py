@@ -1,12 +1,40 @@
 """
 Honeypot monitoring commands for the Discord bot.
 """
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Literal, Optional
+
+import aiohttp
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from commands.views import PaginatedView
 from utils.logger import logger
 
+# Seconds a deferred command waits for its service before giving up
+SERVICE_READY_TIMEOUT = 10.0
+LIST_PAGE_SIZE = 10
+SEARCH_PAGE_SIZE = 5
+AUTOCOMPLETE_LIMIT = 25  # Discord's maximum number of autocomplete choices
+IMPORT_CHUNK_SIZE = 64 * 1024  # Bytes read from an attachment at a time
+PROGRESS_INTERVAL = 2.0  # Minimum seconds between import progress edits
+EXPORT_FILENAME = "monitored_addresses.csv.gz"
+DEFAULT_UPLOAD_LIMIT = 10 * 1024 * 1024  # Discord's upload limit outside boosted guilds
+# Concurrent runs allowed per command; bulk file commands get one each
+COMMAND_LIMITS = {
+    "monitor_add": 4,
+    "monitor_remove": 4,
+    "monitor_report": 4,
+    "monitor_list": 2,
+    "monitor_search": 2,
+    "monitor_stats": 2,
+    "monitor_import": 1,
+    "monitor_export": 1
+}
+
 
 class HoneypotCommands(commands.Cog):
     """Honeypot monitoring commands."""
@@ -21,132 +49,321 @@ class HoneypotCommands(commands.Cog):
         if hasattr(self.bot, 'services') and 'honeypot' in self.bot.services:
             self.honeypot_service = self.bot.services['honeypot']
     
+    async def _run_deferred(self, interaction: discord.Interaction, name: str, work, service_name: str = "honeypot") -> None:
+        """Defer the interaction and run ``work`` on the bot's command runner under the command's limit.
+    
+        The service is waited for after deferring, so a slow start can't run
+        past the interaction deadline.
+        """
+        service = self.bot.services.get(service_name) if hasattr(self.bot, 'services') else None
+        
+        async def run_when_ready():
+            if not service or not await service.wait_until_ready(timeout=SERVICE_READY_TIMEOUT):
+                return {"content": f"❌ {service_name.capitalize()} service is not available."}
+            return await work()
+        
+        await self.bot.command_runner.run(interaction, name, run_when_ready, limit=COMMAND_LIMITS[name])
+    
     @app_commands.command(name="monitor_add", description="Add an address to honeypot monitoring")
     @app_commands.describe(address="The address to monitor")
     @app_commands.describe(description="Optional description for the address")
     async def monitor_add(self, interaction: discord.Interaction, address: str, description: str = None):
         """Add an address to monitoring."""
-        if not self.honeypot_service:
-            await interaction.response.send_message("❌ Honeypot service is not available.", ephemeral=True)
-            return
-        
         metadata = {"description": description} if description else {}
-        success = await self.honeypot_service.add_monitored_address(address, metadata)
+        metadata["added_by"] = interaction.user.name
         
-        if success:
-            embed = discord.Embed(
-                title="✅ Address Added",
-                description=f"Successfully added `{address}` to monitoring.",
-                color=discord.Color.green()
-            )
-            if description:
-                embed.add_field(name="Description", value=description, inline=False)
-        else:
-            embed = discord.Embed(
-                title="❌ Add Failed",
-                description=f"Failed to add `{address}` to monitoring.",
-                color=discord.Color.red()
-            )
+        async def work():
+            success = await self.honeypot_service.add_monitored_address(address, metadata)
+            if success:
+                embed = discord.Embed(
+                    title="✅ Address Added",
+                    description=f"Successfully added `{address}` to monitoring.",
+                    color=discord.Color.green()
+                )
+                if description:
+                    embed.add_field(name="Description", value=description, inline=False)
+            else:
+                embed = discord.Embed(
+                    title="❌ Add Failed",
+                    description=f"Failed to add `{address}` to monitoring.",
+                    color=discord.Color.red()
+                )
+            return {"embed": embed}
         
-        await interaction.response.send_message(embed=embed)
+        await self._run_deferred(interaction, "monitor_add", work)
     
     @app_commands.command(name="monitor_remove", description="Remove an address from honeypot monitoring")
     @app_commands.describe(address="The address to remove from monitoring")
     async def monitor_remove(self, interaction: discord.Interaction, address: str):
         """Remove an address from monitoring."""
-        if not self.honeypot_service:
-            await interaction.response.send_message("❌ Honeypot service is not available.", ephemeral=True)
-            return
-        
-        success = await self.honeypot_service.remove_monitored_address(address)
-        
-        if success:
-            embed = discord.Embed(
-                title="✅ Address Removed",
-                description=f"Successfully removed `{address}` from monitoring.",
-                color=discord.Color.green()
-            )
-        else:
-            embed = discord.Embed(
-                title="❌ Remove Failed",
-                description=f"Failed to remove `{address}` from monitoring. Address may not exist.",
-                color=discord.Color.red()
-            )
+        async def work():
+            success = await self.honeypot_service.remove_monitored_address(address)
+            if success:
+                embed = discord.Embed(
+                    title="✅ Address Removed",
+                    description=f"Successfully removed `{address}` from monitoring.",
+                    color=discord.Color.green()
+                )
+            else:
+                embed = discord.Embed(
+                    title="❌ Remove Failed",
+                    description=f"Failed to remove `{address}` from monitoring. Address may not exist.",
+                    color=discord.Color.red()
+                )
+            return {"embed": embed}
         
-        await interaction.response.send_message(embed=embed)
+        await self._run_deferred(interaction, "monitor_remove", work)
     
     @app_commands.command(name="monitor_list", description="List all monitored addresses")
-    async def monitor_list(self, interaction: discord.Interaction):
-        """List all monitored addresses."""
-        if not self.honeypot_service:
-            await interaction.response.send_message("❌ Honeypot service is not available.", ephemeral=True)
-            return
+    @app_commands.describe(min_suspicious="Only show addresses with at least this many suspicious reports")
+    @app_commands.describe(sort="Order by most recently added or by suspicious count")
+    async def monitor_list(self, interaction: discord.Interaction, min_suspicious: app_commands.Range[int, 0] = 0,
+                           sort: Literal["recent", "count"] = "recent"):
+        """List monitored addresses one page at a time."""
+        async def fetch_page(cursor, direction):
+            return await self.honeypot_service.get_monitored_addresses_page(
+                limit=LIST_PAGE_SIZE, cursor=cursor, direction=direction,
+                min_suspicious=min_suspicious, sort=sort
+            )
         
-        addresses = await self.honeypot_service.get_monitored_addresses()
+        def render_page(page, page_number):
+            return self._render_address_page(page, page_number, min_suspicious)
         
-        if not addresses:
-            embed = discord.Embed(
-                title="📋 Monitored Addresses",
-                description="No addresses are currently being monitored.",
-                color=discord.Color.blue()
-            )
-        else:
-            embed = discord.Embed(
+        async def work():
+            view = PaginatedView(fetch_page, render_page, author_id=interaction.user.id)
+            await view.send(interaction)
+        
+        await self._run_deferred(interaction, "monitor_list", work)
+    
+    def _render_address_page(self, page, page_number: int, min_suspicious: int) -> discord.Embed:
+        """Build the embed for one page of monitored addresses."""
+        if not page["items"]:
+            if page["total"]:
+                description = f"No addresses have at least {min_suspicious} suspicious report(s)."
+            else:
+                description = "No addresses are currently being monitored."
+            return discord.Embed(
                 title="📋 Monitored Addresses",
-                description=f"Currently monitoring {len(addresses)} address(es):",
+                description=description,
                 color=discord.Color.blue()
             )
+        
+        description = f"Currently monitoring {page['total']} address(es)"
+        if min_suspicious:
+            description += f", showing those with at least {min_suspicious} suspicious report(s)"
+        embed = discord.Embed(
+            title="📋 Monitored Addresses",
+            description=description + ":",
+            color=discord.Color.blue()
+        )
+        
+        first = (page_number - 1) * LIST_PAGE_SIZE + 1
+        for i, addr_data in enumerate(page["items"], first):
+            address = addr_data["address"]
+            added_at = addr_data["added_at"].strftime("%Y-%m-%d %H:%M")
+            suspicious_count = addr_data["suspicious_count"]
+            description = addr_data.get("metadata", {}).get("description", "No description")
+            value = f"**Added:** {added_at}\n**Suspicious:** {suspicious_count}\n**Description:** {description}"
+            location = self.honeypot_service.describe_location(address)
+            if location:
+                value += f"\n**Location:** {location}"
             
-            for i, addr_data in enumerate(addresses[:10], 1):  # Limit to 10 addresses
-                address = addr_data["address"]
-                added_at = addr_data["added_at"].strftime("%Y-%m-%d %H:%M")
-                suspicious_count = addr_data["suspicious_count"]
-                description = addr_data.get("metadata", {}).get("description", "No description")
-                
-                embed.add_field(
-                    name=f"{i}. {address}",
-                    value=f"**Added:** {added_at}\n**Suspicious:** {suspicious_count}\n**Description:** {description}",
-                    inline=False
-                )
+            embed.add_field(
+                name=f"{i}. {address}",
+                value=value,
+                inline=False
+            )
             
-            if len(addresses) > 10:
-                embed.set_footer(text=f"... and {len(addresses) - 10} more addresses")
-        
-        await interaction.response.send_message(embed=embed)
+        embed.set_footer(text=f"Page {page_number}")
+        return embed
     
     @app_commands.command(name="monitor_report", description="Report suspicious activity for an address")
     @app_commands.describe(address="The address to report activity for")
     @app_commands.describe(activity="Description of the suspicious activity")
     async def monitor_report(self, interaction: discord.Interaction, address: str, activity: str):
         """Report suspicious activity for an address."""
-        if not self.honeypot_service:
-            await interaction.response.send_message("❌ Honeypot service is not available.", ephemeral=True)
-            return
-        
         activity_data = {
             "reported_by": interaction.user.name,
             "activity": activity,
             "timestamp": discord.utils.utcnow().isoformat()
         }
         
-        success = await self.honeypot_service.report_suspicious_activity(address, activity_data)
+        async def work():
+            success = await self.honeypot_service.report_suspicious_activity(address, activity_data)
+            if success:
+                embed = discord.Embed(
+                    title="✅ Activity Reported",
+                    description=f"Successfully reported suspicious activity for `{address}`.",
+                    color=discord.Color.green()
+                )
+                embed.add_field(name="Activity", value=activity, inline=False)
+                embed.add_field(name="Reported by", value=interaction.user.name, inline=True)
+            else:
+                embed = discord.Embed(
+                    title="❌ Report Failed",
+                    description=f"Failed to report activity for `{address}`. Address may not be monitored.",
+                    color=discord.Color.red()
+                )
+            return {"embed": embed}
+        
+        await self._run_deferred(interaction, "monitor_report", work)
+    
+    @app_commands.command(name="monitor_import", description="Bulk import monitored addresses from a file")
+    @app_commands.describe(file="Newline-separated, CSV or JSON/NDJSON list of addresses")
+    async def monitor_import(self, interaction: discord.Interaction, file: discord.Attachment):
+        """Bulk import monitored addresses from an attachment."""
+        async def work():
+            last_update = time.monotonic()
         
-        if success:
+            async def report_progress(stats: Dict[str, int]) -> None:
+                nonlocal last_update
+                if time.monotonic() - last_update < PROGRESS_INTERVAL:
+                    return
+                last_update = time.monotonic()
+                await interaction.edit_original_response(
+                    content=f"⏳ Importing `{file.filename}`: {stats['read']:,} read, {stats['imported']:,} added..."
+                )
+            
+            try:
+                # Stream the attachment instead of reading it into memory in one go
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(file.url) as response:
+                        response.raise_for_status()
+                        stats = await self.honeypot_service.import_addresses(
+                            response.content.iter_chunked(IMPORT_CHUNK_SIZE), file.filename, progress=report_progress
+                        )
+            except Exception as e:
+                logger.error(f"Failed to import {file.filename}: {e}")
+                embed = discord.Embed(
+                    title="❌ Import Failed",
+                    description=f"Failed to import `{file.filename}`: {e}",
+                    color=discord.Color.red()
+                )
+                await interaction.edit_original_response(content=None, embed=embed)
+                return
+            
             embed = discord.Embed(
-                title="✅ Activity Reported",
-                description=f"Successfully reported suspicious activity for `{address}`.",
+                title="✅ Import Complete",
+                description=f"Imported addresses from `{file.filename}`.",
                 color=discord.Color.green()
             )
-            embed.add_field(name="Activity", value=activity, inline=False)
-            embed.add_field(name="Reported by", value=interaction.user.name, inline=True)
-        else:
+            embed.add_field(name="Added", value=f"{stats['imported']:,}", inline=True)
+            embed.add_field(name="Already monitored", value=f"{stats['duplicates']:,}", inline=True)
+            embed.add_field(name="Invalid", value=f"{stats['invalid']:,}", inline=True)
+            await interaction.edit_original_response(content=None, embed=embed)
+        
+        await self._run_deferred(interaction, "monitor_import", work)
+    
+    @app_commands.command(name="monitor_export", description="Export monitored addresses as a compressed CSV file")
+    async def monitor_export(self, interaction: discord.Interaction):
+        """Export all monitored addresses as a gzip-compressed CSV attachment."""
+        async def work():
+            with tempfile.TemporaryDirectory() as directory:
+                path = Path(directory) / EXPORT_FILENAME
+                try:
+                    count = await self.honeypot_service.export_addresses(path)
+                except Exception as e:
+                    logger.error(f"Failed to export monitored addresses: {e}")
+                    return {"content": "❌ Failed to export monitored addresses."}
+            
+                size_limit = interaction.guild.filesize_limit if interaction.guild else DEFAULT_UPLOAD_LIMIT
+                if path.stat().st_size > size_limit:
+                    return {
+                        "content": f"❌ The export of {count:,} addresses is larger than this server's upload limit."
+                    }
+                # Sent here, while the temporary file still exists
+                await interaction.followup.send(
+                    f"📦 Exported {count:,} monitored address(es).",
+                    file=discord.File(path, filename=EXPORT_FILENAME)
+                )
+        
+        await self._run_deferred(interaction, "monitor_export", work)
+    
+    @app_commands.command(name="monitor_search", description="Search reported activity by free text")
+    @app_commands.describe(query='Words to search for; use "quotes" for phrases and a trailing * for prefixes')
+    @app_commands.describe(address="Only search activity for this address")
+    async def monitor_search(self, interaction: discord.Interaction, query: str, address: Optional[str] = None):
+        """Search reported activity, best matches first, one page at a time."""
+        async def fetch_page(cursor, direction):
+            return await self.honeypot_service.search_activity(
+                query, limit=SEARCH_PAGE_SIZE, cursor=cursor, direction=direction, address=address
+            )
+        
+        async def work():
+            total = await self.honeypot_service.count_activity_matches(query, address)
+        
+            def render_page(page, page_number):
+                return self._render_search_page(page, page_number, query, total)
+            
+            view = PaginatedView(fetch_page, render_page, author_id=interaction.user.id)
+            await view.send(interaction)
+        
+        await self._run_deferred(interaction, "monitor_search", work)
+    
+    def _render_search_page(self, page, page_number: int, query: str, total: int) -> discord.Embed:
+        """Build the embed for one page of activity search results."""
+        embed = discord.Embed(
+            title="🔎 Activity Search",
+            description=f"{total:,} match(es) for `{query}`" + (":" if page["items"] else "."),
+            color=discord.Color.blue()
+        )
+        
+        first = (page_number - 1) * SEARCH_PAGE_SIZE + 1
+        for i, hit in enumerate(page["items"], first):
+            timestamp = (hit["timestamp"] or "")[:16].replace("T", " ")
+            details = f"**Type:** {hit['activity_type']} · **Reported by:** {hit['reported_by'] or 'unknown'}"
+            embed.add_field(
+                name=f"{i}. {hit['address']} · {timestamp}",
+                value=f"{(hit['snippet'] or '*No text*')[:900]}\n{details}",
+                inline=False
+            )
+        
+        if page["items"]:
+            embed.set_footer(text=f"Page {page_number}")
+        return embed
+    
+    @app_commands.command(name="monitor_stats", description="Show top reported addresses and reporters")
+    @app_commands.describe(window="Time window to summarize")
+    @app_commands.describe(top="Number of entries to show per list")
+    async def monitor_stats(self, interaction: discord.Interaction, window: Literal["1h", "24h", "7d"] = "1h",
+                            top: app_commands.Range[int, 1, 25] = 10):
+        """Show the most reported addresses and most active reporters over a time window."""
+        async def work():
+            stats_service = self.bot.services['stats']
+            stats = stats_service.get_stats(window, top)
             embed = discord.Embed(
-                title="❌ Report Failed",
-                description=f"Failed to report activity for `{address}`. Address may not be monitored.",
-                color=discord.Color.red()
+                title=f"📈 Activity Stats ({window})",
+                description=f"**{stats['total']:,}** report(s), {stats['rate_per_hour']:,.1f} per hour",
+                color=discord.Color.blue()
             )
+            embed.add_field(name="Top Addresses", value=self._format_ranking(stats["top_addresses"]), inline=True)
+            embed.add_field(name="Top Reporters", value=self._format_ranking(stats["top_reporters"]), inline=True)
+            if stats_service.geoip and stats_service.geoip.ready:
+                embed.add_field(name="Top Countries", value=self._format_ranking(stats["top_countries"]), inline=True)
+                embed.add_field(name="Top Networks", value=self._format_ranking(stats["top_asns"]), inline=True)
+            embed.set_footer(text="Counts are approximate for very busy windows")
+            return {"embed": embed}
+        
+        await self._run_deferred(interaction, "monitor_stats", work, service_name="stats")
+    
+    def _format_ranking(self, entries) -> str:
+        """Format (name, count) pairs as a numbered list within Discord's field limit."""
+        if not entries:
+            return "No activity"
+        lines = [f"{i}. `{name}` ({count:,})" for i, (name, count) in enumerate(entries, 1)]
+        text = "\n".join(lines)
+        return text if len(text) <= 1024 else text[:1020] + "\n…"
+    
+    @monitor_remove.autocomplete("address")
+    @monitor_report.autocomplete("address")
+    @monitor_search.autocomplete("address")
+    async def address_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Suggest monitored addresses matching what the user has typed so far."""
+        if not self.honeypot_service or not self.honeypot_service.ready:
+            return []
         
-        await interaction.response.send_message(embed=embed)
+        suggestions = await self.honeypot_service.suggest_addresses(current, limit=AUTOCOMPLETE_LIMIT)
+        return [app_commands.Choice(name=address[:100], value=address) for address in suggestions]
     
     @commands.Cog.listener()
     async def on_ready(self):
@@ -0,0 +1,83 @@
+"""
+Reusable interactive views for command responses.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import discord
+
+from utils.logger import logger
+
+PageFetcher = Callable[[Optional[Any], str], Awaitable[Dict[str, Any]]]
+PageRenderer = Callable[[Dict[str, Any], int], discord.Embed]
+
+
+class PaginatedView(discord.ui.View):
+    """Previous/next buttons over a cursor-paginated data source.
+    
+    ``fetch_page(cursor, direction)`` returns a page dict with ``items``,
+    ``next_cursor`` and ``prev_cursor``; ``render_page(page, page_number)``
+    turns it into an embed. Only the page on screen is ever held in memory.
+    """
+    
+    def __init__(self, fetch_page: PageFetcher, render_page: PageRenderer, author_id: int, timeout: float = 180):
+        super().__init__(timeout=timeout)
+        self.fetch_page = fetch_page
+        self.render_page = render_page
+        self.author_id = author_id
+        self.page: Dict[str, Any] = {}
+        self.page_number = 1
+        self.message: Optional[discord.Message] = None
+    
+    async def send(self, interaction: discord.Interaction) -> None:
+        """Fetch the first page and send it as the interaction response (a follow-up if deferred)."""
+        self.page = await self.fetch_page(None, "next")
+        self._update_buttons()
+        embed = self.render_page(self.page, self.page_number)
+        if interaction.response.is_done():
+            self.message = await interaction.followup.send(embed=embed, view=self, wait=True)
+            return
+        await interaction.response.send_message(embed=embed, view=self)
+        self.message = await interaction.original_response()
+    
+    def _update_buttons(self) -> None:
+        self.previous_page.disabled = self.page.get("prev_cursor") is None
+        self.next_page.disabled = self.page.get("next_cursor") is None
+    
+    async def _show(self, interaction: discord.Interaction, direction: str) -> None:
+        cursor_key = "prev_cursor" if direction == "prev" else "next_cursor"
+        page = await self.fetch_page(self.page.get(cursor_key), direction)
+        if page["items"]:
+            self.page = page
+            self.page_number += -1 if direction == "prev" else 1
+            self._update_buttons()
+        else:
+            # Rows changed under the cursor; nothing further in this direction
+            (self.previous_page if direction == "prev" else self.next_page).disabled = True
+        await interaction.response.edit_message(embed=self.render_page(self.page, self.page_number), view=self)
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Only the user who ran the command may page through the results."""
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("❌ Only the command author can use these buttons.", ephemeral=True)
+            return False
+        return True
+    
+    @discord.ui.button(label="Previous", emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Show the previous page."""
+        await self._show(interaction, "prev")
+    
+    @discord.ui.button(label="Next", emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Show the next page."""
+        await self._show(interaction, "next")
+    
+    async def on_timeout(self) -> None:
+        """Disable the buttons once the view expires."""
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException as e:
+                logger.debug(f"Could not disable expired pagination buttons: {e}")
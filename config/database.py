@@ -1,13 +1,82 @@
 """
 Database configuration and models for the Discord bot.
 """
-import json
+import re
 import sqlite3
+import time
+from contextlib import closing
 from datetime import datetime
+from itertools import takewhile
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
+from utils import json_codec
 from utils.logger import logger
+from utils.pagination import Cursor, build_page
+
+# Flattens every string value of a JSON activity payload into searchable text;
+# non-JSON payloads are indexed as-is
+ACTIVITY_TEXT_SQL = """(
+    SELECT group_concat(value, ' ')
+    FROM json_tree(CASE WHEN json_valid({data}) THEN {data} ELSE json_quote({data}) END)
+    WHERE type = 'text' AND COALESCE(key, '') NOT IN ('timestamp', 'reported_by')
+)"""
+
+# Frequently queried JSON keys exposed as virtual generated columns: column -> (JSON column, path)
+GENERATED_COLUMNS = {
+    "monitored_addresses": {
+        "meta_added_by": ("metadata", "$.added_by"),
+        "meta_source": ("metadata", "$.source")
+    },
+    "activity_logs": {
+        "data_activity": ("activity_data", "$.activity"),
+        "data_source": ("activity_data", "$.source")
+    }
+}
+GENERATED_COLUMN_INDEXES = (
+    ("idx_monitored_addresses_added_by", "monitored_addresses", ("meta_added_by",)),
+    ("idx_monitored_addresses_source", "monitored_addresses", ("meta_source",)),
+    ("idx_activity_logs_source", "activity_logs", ("data_source", "timestamp"))
+)
+
+# Filters accepted by the query API, mapped to the column (or generated column) they compare
+ADDRESS_FILTERS = {
+    "address": "address",
+    "description": "description",
+    "added_by": "meta_added_by",
+    "source": "meta_source"
+}
+ACTIVITY_FILTERS = {
+    "address": "address",
+    "activity_type": "activity_type",
+    "reported_by": "reported_by",
+    "activity": "data_activity",
+    "source": "data_source"
+}
+ACTIVITY_LOG_COLUMNS = "id, address, activity_type, activity_data, reported_by, timestamp"
+
+# Column weights for bm25 ranking: address, activity_type, activity_text
+SEARCH_WEIGHTS = "4.0, 1.0, 2.0"
+SEARCH_TERM_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def build_search_query(text: str) -> Optional[str]:
+    """Turn free text into a safe FTS5 MATCH expression, or None if it has no terms.
+    
+    Every word or "quoted phrase" becomes a quoted FTS5 string, so user input can
+    never inject query syntax. Terms are ANDed; a trailing ``*`` on a word keeps
+    prefix matching.
+    """
+    terms = []
+    for phrase, word in SEARCH_TERM_PATTERN.findall(text):
+        term = phrase or word
+        prefix = len(word) > 1 and word.endswith("*")
+        if prefix:
+            term = term.rstrip("*")
+        term = term.replace('"', '""').strip()
+        if term:
+            terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    return " ".join(terms) or None
 
 
 class DatabaseManager:
@@ -23,6 +92,9 @@ class DatabaseManager:
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
+            # WAL lets readers (listing, export) run while bulk imports write
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Create monitored addresses table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS monitored_addresses (
@@ -71,9 +143,158 @@ class DatabaseManager:
                 )
             """)
             
+            # Archive of compacted raw activity rows (used when raw rows are archived, not deleted)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS activity_logs_archive (
+                    id INTEGER PRIMARY KEY,
+                    address TEXT NOT NULL,
+                    activity_type TEXT NOT NULL,
+                    activity_data TEXT,
+                    reported_by TEXT,
+                    timestamp TIMESTAMP
+                )
+            """)
+            
+            # Per-address activity rollups, one row per address, type and hour/day
+            for table in ("activity_rollups_hourly", "activity_rollups_daily"):
+                cursor.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        address TEXT NOT NULL,
+                        activity_type TEXT NOT NULL,
+                        bucket_start TEXT NOT NULL,
+                        event_count INTEGER NOT NULL,
+                        first_seen TEXT,
+                        last_seen TEXT,
+                        PRIMARY KEY (address, activity_type, bucket_start)
+                    ) WITHOUT ROWID
+                """)
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_bucket ON {table} (bucket_start)")
+            
+            # Key/value store for schema migrations and background job cursors
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            # Byte offsets of tailed sensor log files, so ingestion resumes where it stopped
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+                    path TEXT PRIMARY KEY,
+                    inode INTEGER NOT NULL,
+                    offset INTEGER NOT NULL,
+                    updated_at TEXT
+                )
+            """)
+            
+            self.search_enabled = self._init_search_index(conn)
+            self._column_sql = self._init_generated_columns(conn)
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_activity_logs_timestamp ON activity_logs (timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_activity_logs_address ON activity_logs (address, timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_activity_logs_reporter ON activity_logs (reported_by, timestamp)")
+            
+            # Indexes backing keyset pagination of monitored addresses
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_monitored_addresses_recent
+                ON monitored_addresses (is_active, added_at, id)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_monitored_addresses_count
+                ON monitored_addresses (is_active, suspicious_count, id)
+            """)
+            
             conn.commit()
             logger.info("Database initialized successfully")
     
+    def _init_search_index(self, conn: sqlite3.Connection) -> bool:
+        """Create the FTS5 activity search index and its sync trigger if missing.
+        
+        The index stores its own copy of each row (keyed by the activity log id)
+        so search keeps working after raw rows are compacted away. Rows that
+        predate the index are queued for ``backfill_search_index``.
+        """
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'activity_search'").fetchone():
+            return True
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE activity_search USING fts5(
+                    address, activity_type, activity_text, reported_by UNINDEXED, timestamp UNINDEXED
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text search disabled, SQLite has no FTS5 support: {e}")
+            return False
+        
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS activity_logs_search_insert AFTER INSERT ON activity_logs
+            BEGIN
+                INSERT INTO activity_search (rowid, address, activity_type, activity_text, reported_by, timestamp)
+                VALUES (NEW.id, NEW.address, NEW.activity_type, {ACTIVITY_TEXT_SQL.format(data="NEW.activity_data")},
+                        NEW.reported_by, NEW.timestamp);
+            END
+        """)
+        backfill_upto = conn.execute("""
+            SELECT MAX(COALESCE((SELECT MAX(id) FROM activity_logs), 0),
+                       COALESCE((SELECT MAX(id) FROM activity_logs_archive), 0))
+        """).fetchone()[0]
+        conn.executemany("INSERT OR REPLACE INTO schema_meta (key, value) VALUES (?, ?)", [
+            ("search_backfill_upto", str(backfill_upto)),
+            ("search_backfill_cursor", "0")
+        ])
+        logger.info(f"Created activity search index, {backfill_upto} existing row ids queued for backfill")
+        return True
+    
+    def _init_generated_columns(self, conn: sqlite3.Connection) -> Dict[str, str]:
+        """Add and index the generated JSON columns, returning the SQL to use for each.
+        
+        SQLite older than 3.31 has no generated columns; there the raw
+        ``json_extract`` expression is used instead, which filters correctly but
+        cannot use an index.
+        """
+        column_sql: Dict[str, str] = {}
+        for table, columns in GENERATED_COLUMNS.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+            for column, (source, path) in columns.items():
+                expression = f"(CASE WHEN json_valid({source}) THEN json_extract({source}, '{path}') END)"
+                if column not in existing:
+                    try:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT GENERATED ALWAYS AS {expression} VIRTUAL")
+                    except sqlite3.OperationalError as e:
+                        logger.warning(f"Generated column {table}.{column} unavailable, filtering without an index: {e}")
+                        column_sql[column] = expression
+                        continue
+                column_sql[column] = column
+        
+        for name, table, columns in GENERATED_COLUMN_INDEXES:
+            # A fallback expression has no column to index
+            if column_sql[columns[0]] == columns[0]:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+        return column_sql
+    
+    def _filter_clause(self, filters: Dict[str, Any], allowed: Dict[str, str]) -> Tuple[str, List[Any]]:
+        """Build ``AND``-joined SQL conditions for whitelisted equality filters.
+        
+        A list, tuple or set value matches any of its members and ``None``
+        matches missing values. Unknown filter names raise ``ValueError``.
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        for name, value in filters.items():
+            if name not in allowed:
+                raise ValueError(f"Unknown filter: {name}")
+            column = self._column_sql.get(allowed[name], allowed[name])
+            if value is None:
+                conditions.append(f"{column} IS NULL")
+            elif isinstance(value, (list, tuple, set)):
+                values = list(value)
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})" if values else "0")
+                params.extend(values)
+            else:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        return "".join(f" AND {condition}" for condition in conditions), params
+    
     def add_monitored_address(self, address: str, description: str = None, metadata: Dict[str, Any] = None) -> bool:
         """Add a monitored address to the database."""
         try:
@@ -86,7 +307,7 @@ class DatabaseManager:
                 """, (
                     address,
                     description,
-                    json.dumps(metadata or {}),
+                    json_codec.dumps(metadata or {}),
                     datetime.now().isoformat(),
                     0,
                     datetime.now().isoformat(),
@@ -98,6 +319,31 @@ class DatabaseManager:
             logger.error(f"Failed to add monitored address: {e}")
             return False
     
+    def add_monitored_addresses_batch(self, entries: List[Tuple[str, Optional[str]]]) -> int:
+        """Insert or reactivate many addresses in one transaction. Returns rows written."""
+        now = datetime.now().isoformat()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA cache_size=-65536")  # 64 MB, keeps the address index hot
+                before = conn.total_changes
+                conn.executemany("""
+                    INSERT INTO monitored_addresses
+                    (address, description, metadata, added_at, suspicious_count, last_checked, is_active)
+                    VALUES (?, ?, ?, ?, 0, ?, 1)
+                    ON CONFLICT(address) DO UPDATE SET
+                        is_active = 1,
+                        description = COALESCE(excluded.description, monitored_addresses.description)
+                """, (
+                    (address, description, json_codec.dumps({"description": description}) if description else "{}", now, now)
+                    for address, description in entries
+                ))
+                conn.commit()
+                return conn.total_changes - before
+        except Exception as e:
+            logger.error(f"Failed to add monitored addresses batch: {e}")
+            return 0
+    
     def remove_monitored_address(self, address: str) -> bool:
         """Remove a monitored address from the database."""
         try:
@@ -127,6 +373,63 @@ class DatabaseManager:
             logger.error(f"Failed to get monitored addresses: {e}")
             return []
     
+    def iter_monitored_addresses(self, batch_size: int = 5000) -> Iterator[Dict[str, Any]]:
+        """Iterate over active monitored addresses in id order, ``batch_size`` rows at a time."""
+        for rows in self.iter_monitored_address_batches(batch_size=batch_size, as_dicts=True):
+            yield from rows
+    
+    def iter_monitored_address_batches(self, columns: Sequence[str] = ("*",), batch_size: int = 5000,
+                                       as_dicts: bool = False) -> Iterator[List[Any]]:
+        """Yield active monitored address rows in id-ordered batches using keyset pagination."""
+        last_id = 0
+        with sqlite3.connect(self.db_path) as conn:
+            if as_dicts:
+                conn.row_factory = sqlite3.Row
+            while True:
+                # NOT INDEXED keeps this a rowid range scan instead of an is_active index scan plus sort
+                rows = conn.execute(f"""
+                    SELECT id, {", ".join(columns)} FROM monitored_addresses NOT INDEXED
+                    WHERE is_active = 1 AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                """, (last_id, batch_size)).fetchall()
+                if not rows:
+                    return
+                last_id = rows[-1][0]
+                yield [dict(row) for row in rows] if as_dicts else [row[1:] for row in rows]
+    
+    def get_monitored_addresses_page(self, limit: int = 10, cursor: Optional[Cursor] = None,
+                                     direction: str = "next", min_suspicious: int = 0,
+                                     sort: str = "recent") -> Dict[str, Any]:
+        """Get one page of active monitored addresses using keyset pagination.
+        
+        Cursors are ``(added_at, id)`` for ``sort="recent"`` and
+        ``(suspicious_count, id)`` for ``sort="count"``; each page is an index
+        range scan of ``limit + 1`` rows regardless of table size. With
+        ``min_suspicious`` and ``sort="recent"`` the filter is applied while
+        walking the ``added_at`` index.
+        """
+        sort_column = "suspicious_count" if sort == "count" else "added_at"
+        comparison, order = (">", "ASC") if direction == "prev" else ("<", "DESC")
+        
+        query = "SELECT * FROM monitored_addresses WHERE is_active = 1 AND suspicious_count >= ?"
+        params: List[Any] = [min_suspicious]
+        if cursor is not None:
+            query += f" AND ({sort_column}, id) {comparison} (?, ?)"
+            params.extend(cursor)
+        query += f" ORDER BY {sort_column} {order}, id {order} LIMIT ?"
+        params.append(limit + 1)
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                rows = [dict(row) for row in conn.execute(query, params).fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to get monitored addresses page: {e}")
+            rows = []
+        
+        return build_page(rows, limit, cursor, direction, key=lambda row: (row[sort_column], row["id"]))
+    
     def update_suspicious_count(self, address: str, count: int) -> bool:
         """Update the suspicious count for an address."""
         try:
@@ -155,7 +458,7 @@ class DatabaseManager:
                 """, (
                     address,
                     activity_type,
-                    json.dumps(activity_data),
+                    json_codec.dumps(activity_data),
                     reported_by,
                     datetime.now().isoformat()
                 ))
@@ -165,29 +468,455 @@ class DatabaseManager:
             logger.error(f"Failed to log activity: {e}")
             return False
     
+    def log_activities(self, activities: List[Tuple[str, str, Dict[str, Any], Optional[str], str]]) -> int:
+        """Log many ``(address, type, data, reported_by, timestamp)`` activities in one transaction."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA cache_size=-65536")  # 64 MB, keeps search index pages hot for the insert trigger
+                conn.executemany("""
+                    INSERT INTO activity_logs
+                    (address, activity_type, activity_data, reported_by, timestamp)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (
+                    (address, activity_type, json_codec.dumps(activity_data), reported_by, timestamp)
+                    for address, activity_type, activity_data, reported_by, timestamp in activities
+                ))
+                conn.commit()
+                return len(activities)
+        except Exception as e:
+            logger.error(f"Failed to log activities: {e}")
+            return 0
+    
+    def update_suspicious_counts(self, counts: List[Tuple[str, int]]) -> bool:
+        """Update the suspicious counts of many addresses in one transaction."""
+        now = datetime.now().isoformat()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany("""
+                    UPDATE monitored_addresses
+                    SET suspicious_count = ?, last_checked = ?
+                    WHERE address = ? AND is_active = 1
+                """, ((count, now, address) for address, count in counts))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Failed to update suspicious counts: {e}")
+            return False
+    
     def get_activity_logs(self, address: str = None, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get activity logs, optionally filtered by address."""
+        """Get activity logs, optionally filtered by address.
+        
+        Recent raw rows come first. Older history that has been compacted is
+        filled in from the hourly rollups and then, for days whose hourly rows
+        have expired, the daily rollups. Rollup rows carry an ``event_count``
+        and a ``granularity`` of ``"hourly"`` or ``"daily"``.
+        """
         try:
             with sqlite3.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
                 if address:
-                    cursor.execute("""
-                        SELECT * FROM activity_logs 
+                    cursor.execute(f"""
+                        SELECT {ACTIVITY_LOG_COLUMNS} FROM activity_logs
                         WHERE address = ? 
                         ORDER BY timestamp DESC 
                         LIMIT ?
                     """, (address, limit))
                 else:
-                    cursor.execute("""
-                        SELECT * FROM activity_logs 
+                    cursor.execute(f"""
+                        SELECT {ACTIVITY_LOG_COLUMNS} FROM activity_logs
                         ORDER BY timestamp DESC 
                         LIMIT ?
                     """, (limit,))
                 
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                rows = [dict(row, granularity="raw", event_count=1) for row in cursor.fetchall()]
+                if len(rows) < limit:
+                    rows.extend(self._get_rollup_logs(conn, address, limit - len(rows)))
+                return rows
         except Exception as e:
             logger.error(f"Failed to get activity logs: {e}")
             return []
+
+    def _get_rollup_logs(self, conn: sqlite3.Connection, address: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """Fetch compacted history, newest first, shaped like activity log rows."""
+        address_filter = "AND address = ?" if address else ""
+        params: List[Any] = [address] if address else []
+        
+        # Hourly rows are pruned on whole-day boundaries, so daily rows before the
+        # first remaining hourly day never overlap the hourly rows
+        first_hour = conn.execute("SELECT MIN(bucket_start) FROM activity_rollups_hourly").fetchone()[0]
+        boundary = first_hour[:10] if first_hour else "9999-12-31"
+        
+        rows: List[Dict[str, Any]] = []
+        for table, granularity, bound in (
+            ("activity_rollups_hourly", "hourly", None),
+            ("activity_rollups_daily", "daily", boundary)
+        ):
+            if len(rows) >= limit:
+                break
+            bound_filter = "AND bucket_start < ?" if bound else ""
+            query = f"""
+                SELECT address, activity_type, bucket_start, event_count, first_seen, last_seen
+                FROM {table}
+                WHERE 1 = 1 {address_filter} {bound_filter}
+                ORDER BY bucket_start DESC
+                LIMIT ?
+            """
+            for row in conn.execute(query, params + ([bound] if bound else []) + [limit - len(rows)]):
+                rows.append({
+                    "id": None,
+                    "address": row["address"],
+                    "activity_type": row["activity_type"],
+                    "activity_data": json_codec.dumps({"first_seen": row["first_seen"], "last_seen": row["last_seen"]}),
+                    "reported_by": None,
+                    "timestamp": row["bucket_start"],
+                    "granularity": granularity,
+                    "event_count": row["event_count"]
+                })
+        return rows
+    
+    def get_activity_counts(self, since: str) -> Tuple[List[Tuple[str, Optional[str], str, int]], Optional[str]]:
+        """Count activity since ``since`` as ``(address, reporter, bucket_start, count)`` rows.
+        
+        Raw rows are bucketed per minute and keep their reporter; compacted
+        history comes from the hourly rollups with a reporter of None. Also
+        returns the newest raw timestamp in the same read snapshot (None if
+        there is no raw activity), so callers can tell which later reports
+        the counts are missing.
+        """
+        try:
+            with closing(sqlite3.connect(self.db_path, isolation_level=None)) as conn:
+                conn.execute("BEGIN")
+                try:
+                    high_water = conn.execute("SELECT MAX(timestamp) FROM activity_logs").fetchone()[0]
+                    rows = conn.execute("""
+                        SELECT address, COALESCE(reported_by, 'unknown'),
+                               replace(substr(timestamp, 1, 16), ' ', 'T') || ':00', COUNT(*)
+                        FROM activity_logs
+                        WHERE timestamp >= ?
+                        GROUP BY 1, 2, 3
+                    """, (since,)).fetchall()
+                    rows.extend(conn.execute("""
+                        SELECT address, NULL, bucket_start, SUM(event_count)
+                        FROM activity_rollups_hourly
+                        WHERE bucket_start >= ?
+                        GROUP BY 1, 3
+                    """, (since[:13] + ":00:00",)).fetchall())
+                finally:
+                    conn.execute("COMMIT")
+                return rows, high_water
+        except Exception as e:
+            logger.error(f"Failed to get activity counts: {e}")
+            return [], None
+    
+    def compact_activity_logs(self, cutoff: str, batch_size: int = 1000, archive: bool = False) -> int:
+        """Roll one batch of raw activity older than ``cutoff`` into the rollup tables.
+        
+        The batch is aggregated into hourly and daily rollups, then archived or
+        deleted, all in one short transaction so writers are never blocked for
+        long. Returns the number of raw rows compacted; call until it returns 0.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                last_id = conn.execute("""
+                    SELECT MAX(id) FROM (
+                        SELECT id FROM activity_logs WHERE timestamp < ? ORDER BY id LIMIT ?
+                    )
+                """, (cutoff, batch_size)).fetchone()[0]
+                if last_id is None:
+                    return 0
+                
+                batch = "FROM activity_logs WHERE id <= ? AND timestamp < ?"
+                for table, bucket in (
+                    ("activity_rollups_hourly", "replace(substr(timestamp, 1, 13), ' ', 'T') || ':00:00'"),
+                    ("activity_rollups_daily", "substr(timestamp, 1, 10)")
+                ):
+                    conn.execute(f"""
+                        INSERT INTO {table} (address, activity_type, bucket_start, event_count, first_seen, last_seen)
+                        SELECT address, activity_type, {bucket}, COUNT(*), MIN(timestamp), MAX(timestamp)
+                        {batch}
+                        GROUP BY 1, 2, 3
+                        ON CONFLICT (address, activity_type, bucket_start) DO UPDATE SET
+                            event_count = event_count + excluded.event_count,
+                            first_seen = MIN(first_seen, excluded.first_seen),
+                            last_seen = MAX(last_seen, excluded.last_seen)
+                    """, (last_id, cutoff))
+                
+                if archive:
+                    conn.execute(f"""
+                        INSERT OR IGNORE INTO activity_logs_archive ({ACTIVITY_LOG_COLUMNS})
+                        SELECT {ACTIVITY_LOG_COLUMNS} {batch}
+                    """, (last_id, cutoff))
+                compacted = conn.execute(f"DELETE {batch}", (last_id, cutoff)).rowcount
+                conn.commit()
+                return compacted
+        except Exception as e:
+            logger.error(f"Failed to compact activity logs: {e}")
+            return 0
+    
+    def prune_hourly_rollups(self, cutoff_day: str, batch_size: int = 1000) -> int:
+        """Delete one batch of hourly rollups for days before ``cutoff_day`` (YYYY-MM-DD).
+        
+        Daily rollups already hold the same events, so nothing is lost.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                deleted = conn.execute("""
+                    DELETE FROM activity_rollups_hourly
+                    WHERE (address, activity_type, bucket_start) IN (
+                        SELECT address, activity_type, bucket_start
+                        FROM activity_rollups_hourly WHERE bucket_start < ? LIMIT ?
+                    )
+                """, (cutoff_day, batch_size)).rowcount
+                conn.commit()
+                return deleted
+        except Exception as e:
+            logger.error(f"Failed to prune hourly rollups: {e}")
+            return 0
+
+    def backfill_search_index(self, batch_size: int = 1000) -> int:
+        """Index one batch of activity rows that predate the search index.
+        
+        Walks raw and archived rows in id order from a cursor kept in
+        ``schema_meta``. Returns the number of rows indexed; call until it returns 0.
+        """
+        if not self.search_enabled:
+            return 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                meta = dict(conn.execute("SELECT key, value FROM schema_meta WHERE key LIKE 'search_backfill_%'"))
+                position = int(meta.get("search_backfill_cursor", 0))
+                upto = int(meta.get("search_backfill_upto", 0))
+                if position >= upto:
+                    return 0
+                conn.execute("PRAGMA cache_size=-65536")
+                
+                rows = conn.execute(f"""
+                    SELECT id, address, activity_type, {ACTIVITY_TEXT_SQL.format(data="activity_data")},
+                           reported_by, timestamp
+                    FROM (
+                        SELECT {ACTIVITY_LOG_COLUMNS} FROM activity_logs WHERE id > ? AND id <= ?
+                        UNION ALL
+                        SELECT {ACTIVITY_LOG_COLUMNS} FROM activity_logs_archive WHERE id > ? AND id <= ?
+                    )
+                    ORDER BY id
+                    LIMIT ?
+                """, (position, upto, position, upto, batch_size)).fetchall()
+                conn.executemany("""
+                    INSERT INTO activity_search (rowid, address, activity_type, activity_text, reported_by, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, rows)
+                position = rows[-1][0] if len(rows) == batch_size else upto
+                conn.execute("UPDATE schema_meta SET value = ? WHERE key = 'search_backfill_cursor'", (str(position),))
+                conn.commit()
+                return len(rows)
+        except Exception as e:
+            logger.error(f"Failed to backfill search index: {e}")
+            return 0
+    
+    def prune_search_index(self, cutoff: str, batch_size: int = 1000) -> int:
+        """Delete one batch of search index rows older than ``cutoff``.
+        
+        Ids grow with time, so the oldest rows are found by a cheap rowid-order
+        scan instead of filtering on the unindexed timestamp column.
+        """
+        if not self.search_enabled:
+            return 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                oldest = conn.execute(
+                    "SELECT rowid, timestamp FROM activity_search ORDER BY rowid LIMIT ?", (batch_size,)
+                ).fetchall()
+                expired = list(takewhile(lambda row: (row[1] or "") < cutoff, oldest))
+                if not expired:
+                    return 0
+                deleted = conn.execute("DELETE FROM activity_search WHERE rowid <= ?", (expired[-1][0],)).rowcount
+                conn.commit()
+                return deleted
+        except Exception as e:
+            logger.error(f"Failed to prune search index: {e}")
+            return 0
+    
+    def search_activity_logs(self, query: str, limit: int = 10, cursor: Optional[Cursor] = None,
+                             direction: str = "next", address: Optional[str] = None) -> Dict[str, Any]:
+        """Get one page of activity matching a free-text query, best matches first.
+        
+        Results are ranked by bm25 and paged with ``(score, id)`` cursors. Each
+        row carries a ``snippet`` of the matching text with hits in bold.
+        """
+        match = build_search_query(query)
+        if not self.search_enabled or not match:
+            return build_page([], limit, cursor, direction, key=lambda row: (row["score"], row["id"]))
+        
+        comparison, order = (">", "ASC") if direction == "prev" else ("<", "DESC")
+        address_filter = "AND address = ?" if address else ""
+        cursor_filter = f"AND (score, id) {comparison} (?, ?)" if cursor is not None else ""
+        params: List[Any] = [match] + ([address] if address else []) + (list(cursor) if cursor is not None else [])
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                rows = [dict(row) for row in conn.execute(f"""
+                    SELECT * FROM (
+                        SELECT rowid AS id, address, activity_type, reported_by, timestamp,
+                               snippet(activity_search, 2, '**', '**', '…', 16) AS snippet,
+                               -bm25(activity_search, {SEARCH_WEIGHTS}) AS score
+                        FROM activity_search
+                        WHERE activity_search MATCH ? {address_filter}
+                    )
+                    WHERE 1 = 1 {cursor_filter}
+                    ORDER BY score {order}, id {order}
+                    LIMIT ?
+                """, params + [limit + 1]).fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to search activity logs: {e}")
+            rows = []
+        
+        return build_page(rows, limit, cursor, direction, key=lambda row: (row["score"], row["id"]))
+    
+    def count_activity_matches(self, query: str, address: Optional[str] = None) -> int:
+        """Count activity rows matching a free-text query."""
+        match = build_search_query(query)
+        if not self.search_enabled or not match:
+            return 0
+        address_filter = "AND address = ?" if address else ""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                return conn.execute(
+                    f"SELECT COUNT(*) FROM activity_search WHERE activity_search MATCH ? {address_filter}",
+                    [match] + ([address] if address else [])
+                ).fetchone()[0]
+        except Exception as e:
+            logger.error(f"Failed to count activity matches: {e}")
+            return 0
+
+    def query_monitored_addresses(self, limit: int = 100, min_suspicious: int = 0, active_only: bool = True,
+                                  **filters: Any) -> List[Dict[str, Any]]:
+        """Get monitored addresses matching equality filters, most suspicious first.
+        
+        Filters are ``address``, ``description``, ``added_by`` and ``source``;
+        the JSON metadata keys are read from indexed generated columns.
+        """
+        clause, params = self._filter_clause(filters, ADDRESS_FILTERS)
+        query = f"""
+            SELECT * FROM monitored_addresses
+            WHERE suspicious_count >= ? {"AND is_active = 1" if active_only else ""} {clause}
+            ORDER BY suspicious_count DESC, id DESC
+            LIMIT ?
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                return [dict(row) for row in conn.execute(query, [min_suspicious] + params + [limit])]
+        except Exception as e:
+            logger.error(f"Failed to query monitored addresses: {e}")
+            return []
+    
+    def query_activity_logs(self, limit: int = 100, since: Optional[str] = None, until: Optional[str] = None,
+                            **filters: Any) -> List[Dict[str, Any]]:
+        """Get raw activity logs matching equality filters, newest first.
+        
+        Filters are ``address``, ``activity_type``, ``reported_by``, ``activity``
+        and ``source``; ``since``/``until`` bound the timestamp (inclusive/exclusive).
+        """
+        clause, params = self._filter_clause(filters, ACTIVITY_FILTERS)
+        if since:
+            clause += " AND timestamp >= ?"
+            params.append(since)
+        if until:
+            clause += " AND timestamp < ?"
+            params.append(until)
+        query = f"""
+            SELECT {ACTIVITY_LOG_COLUMNS} FROM activity_logs
+            WHERE 1 = 1 {clause}
+            ORDER BY timestamp DESC
+            LIMIT ?
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                return [dict(row) for row in conn.execute(query, params + [limit])]
+        except Exception as e:
+            logger.error(f"Failed to query activity logs: {e}")
+            return []
+
+    def get_ingest_checkpoint(self, path: str) -> Optional[Tuple[int, int]]:
+        """Get the saved ``(inode, offset)`` for a tailed file, if any."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute("SELECT inode, offset FROM ingest_checkpoints WHERE path = ?", (path,)).fetchone()
+                return (row[0], row[1]) if row else None
+        except Exception as e:
+            logger.error(f"Failed to get ingest checkpoint for {path}: {e}")
+            return None
+    
+    def save_ingest_checkpoint(self, path: str, inode: int, offset: int) -> bool:
+        """Save the ``(inode, offset)`` reached in a tailed file."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    INSERT INTO ingest_checkpoints (path, inode, offset, updated_at) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET
+                        inode = excluded.inode, offset = excluded.offset, updated_at = excluded.updated_at
+                """, (path, inode, offset, datetime.now().isoformat()))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Failed to save ingest checkpoint for {path}: {e}")
+            return False
+
+    def backup_to(self, target_path: str, pages_per_step: int = 256,
+                  step_sleep: float = 0.01) -> Optional[Dict[str, int]]:
+        """Copy the live database to ``target_path`` with SQLite's online backup API.
+        
+        The copy runs inside one read transaction, so it is a consistent
+        snapshot and writes from other connections don't restart it; in WAL
+        mode writers are never blocked, the WAL just can't be checkpointed
+        past the snapshot until the copy ends. ``pages_per_step`` pages are
+        copied per step with ``step_sleep`` seconds between steps, so the copy
+        never saturates the disk. Returns page and step counts, or None on failure.
+        """
+        stats = {"pages": 0, "steps": 0}
+        
+        def progress(status: int, remaining: int, total: int) -> None:
+            stats["steps"] += 1
+            stats["pages"] = total
+        
+        try:
+            with closing(sqlite3.connect(self.db_path, isolation_level=None)) as source, \
+                    closing(sqlite3.connect(target_path)) as target:
+                source.execute("BEGIN")
+                source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()  # Pins the read snapshot
+                try:
+                    source.backup(target, pages=pages_per_step, progress=progress, sleep=step_sleep)
+                finally:
+                    source.execute("COMMIT")
+                # The copy inherits WAL mode; switch it back so the snapshot is one self-contained file
+                target.execute("PRAGMA journal_mode=DELETE")
+            return stats
+        except Exception as e:
+            logger.error(f"Failed to back up database to {target_path}: {e}")
+            return None
+    
+    @staticmethod
+    def verify_snapshot(path: str) -> Dict[str, Any]:
+        """Open a database file read-only and run SQLite's integrity check on it.
+        
+        The file is opened as immutable, so no ``-wal`` or ``-shm`` files are
+        created next to it even if it is in WAL mode.
+        """
+        started = time.perf_counter()
+        try:
+            with closing(sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro&immutable=1", uri=True)) as conn:
+                problems = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+                ok = problems == ["ok"]
+                result = {"ok": ok, "problems": [] if ok else problems[:10]}
+                if ok:
+                    result["addresses"] = conn.execute("SELECT COUNT(*) FROM monitored_addresses").fetchone()[0]
+                    result["activity_logs"] = conn.execute("SELECT COUNT(*) FROM activity_logs").fetchone()[0]
+        except Exception as e:
+            result = {"ok": False, "problems": [str(e)]}
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        return result
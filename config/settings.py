@@ -2,7 +2,7 @@
 Configuration settings for the Discord bot.
 """
 import os
-from typing import Optional
+from typing import List, Optional
 
 from dotenv import load_dotenv
 
@@ -16,11 +16,115 @@ class BotConfig:
     # Discord settings
     DISCORD_TOKEN: str = os.getenv("DISCORD_TOKEN", "")
     DISCORD_GUILD_ID: Optional[int] = int(os.getenv("DISCORD_GUILD_ID", "0")) or None
+    ALERT_CHANNEL_ID: Optional[int] = int(os.getenv("ALERT_CHANNEL_ID", "0")) or None  # Honeypot alerts
     
     # Bot settings
     BOT_PREFIX: str = os.getenv("BOT_PREFIX", "!")
     BOT_DEBUG: bool = os.getenv("BOT_DEBUG", "False").lower() == "true"
     
+    # Storage settings
+    DATABASE_PATH: str = os.getenv("DATABASE_PATH", "data/bot.db")
+    
+    # Activity log retention settings
+    ACTIVITY_RAW_RETENTION_HOURS: int = int(os.getenv("ACTIVITY_RAW_RETENTION_HOURS", "24"))
+    ACTIVITY_HOURLY_RETENTION_DAYS: int = int(os.getenv("ACTIVITY_HOURLY_RETENTION_DAYS", "30"))
+    ACTIVITY_ARCHIVE_RAW: bool = os.getenv("ACTIVITY_ARCHIVE_RAW", "False").lower() == "true"
+    COMPACTION_INTERVAL_SECONDS: int = int(os.getenv("COMPACTION_INTERVAL_SECONDS", "300"))
+    COMPACTION_BATCH_SIZE: int = int(os.getenv("COMPACTION_BATCH_SIZE", "1000"))
+    SEARCH_RETENTION_DAYS: int = int(os.getenv("SEARCH_RETENTION_DAYS", "180"))  # 0 keeps search history forever
+    
+    # Statistics settings
+    STATS_SKETCH_CAPACITY: int = int(os.getenv("STATS_SKETCH_CAPACITY", "200"))
+    STATS_REFRESH_SECONDS: int = int(os.getenv("STATS_REFRESH_SECONDS", "3600"))
+    
+    # Report de-duplication: "bloom", "exact" or "off"
+    DEDUP_MODE: str = os.getenv("DEDUP_MODE", "bloom")
+    DEDUP_WINDOW_SECONDS: int = int(os.getenv("DEDUP_WINDOW_SECONDS", "3600"))
+    DEDUP_CAPACITY: int = int(os.getenv("DEDUP_CAPACITY", "500000"))  # Distinct reports per window
+    DEDUP_ERROR_RATE: float = float(os.getenv("DEDUP_ERROR_RATE", "0.001"))
+    
+    # Cross-channel spam detection: act when one author's near-identical text spans this many channels
+    SPAM_DETECTION_ENABLED: bool = os.getenv("SPAM_DETECTION_ENABLED", "False").lower() == "true"
+    SPAM_ACTION: str = os.getenv("SPAM_ACTION", "flag")  # "flag" (log channel) or "ban"
+    SPAM_CHANNEL_THRESHOLD: int = int(os.getenv("SPAM_CHANNEL_THRESHOLD", "3"))
+    SPAM_WINDOW_SECONDS: int = int(os.getenv("SPAM_WINDOW_SECONDS", "60"))
+    SPAM_MIN_TOKENS: int = int(os.getenv("SPAM_MIN_TOKENS", "5"))  # Shorter messages are too generic to compare
+    SPAM_MAX_DISTANCE: int = int(os.getenv("SPAM_MAX_DISTANCE", "12"))  # SimHash bits (of 64) that may differ
+    SPAM_INDEX_SIZE: int = int(os.getenv("SPAM_INDEX_SIZE", "10000"))  # Recent messages remembered per guild
+    
+    # Content filter: JSON list of phrases/regexes with per-pattern actions (log, delete, ban)
+    CONTENT_FILTER_ENABLED: bool = os.getenv("CONTENT_FILTER_ENABLED", "False").lower() == "true"
+    CONTENT_PATTERNS_PATH: str = os.getenv("CONTENT_PATTERNS_PATH", "data/content_patterns.json")
+    CONTENT_RELOAD_INTERVAL: float = float(os.getenv("CONTENT_RELOAD_INTERVAL", "10"))  # Seconds between file checks
+    
+    # Offline GeoIP/ASN enrichment: comma-separated range CSVs (country and/or ASN)
+    GEOIP_PATHS: List[str] = [p.strip() for p in os.getenv("GEOIP_PATHS", "").split(",") if p.strip()]
+    GEOIP_CACHE_SIZE: int = int(os.getenv("GEOIP_CACHE_SIZE", "65536"))
+    
+    # Cross-sensor correlation: alert when this many distinct sources report an address within the window
+    CORRELATION_WINDOW_SECONDS: int = int(os.getenv("CORRELATION_WINDOW_SECONDS", "60"))
+    CORRELATION_MIN_SOURCES: int = int(os.getenv("CORRELATION_MIN_SOURCES", "3"))
+    
+    # Sensor ingestion settings
+    INGEST_QUEUE_SIZE: int = int(os.getenv("INGEST_QUEUE_SIZE", "10000"))
+    INGEST_BATCH_SIZE: int = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+    MQTT_ENABLED: bool = os.getenv("MQTT_ENABLED", "False").lower() == "true"
+    MQTT_HOST: str = os.getenv("MQTT_HOST", "localhost")
+    MQTT_PORT: int = int(os.getenv("MQTT_PORT", "1883"))
+    MQTT_USERNAME: Optional[str] = os.getenv("MQTT_USERNAME") or None
+    MQTT_PASSWORD: Optional[str] = os.getenv("MQTT_PASSWORD") or None
+    MQTT_CLIENT_ID: str = os.getenv("MQTT_CLIENT_ID", "honeypot-watcher")
+    MQTT_TOPICS: List[str] = [t.strip() for t in os.getenv("MQTT_TOPICS", "honeypot/#").split(",") if t.strip()]
+    MQTT_QOS: int = int(os.getenv("MQTT_QOS", "0"))
+    WEBHOOK_ENABLED: bool = os.getenv("WEBHOOK_ENABLED", "False").lower() == "true"
+    WEBHOOK_HOST: str = os.getenv("WEBHOOK_HOST", "127.0.0.1")
+    WEBHOOK_PORT: int = int(os.getenv("WEBHOOK_PORT", "8080"))
+    WEBHOOK_TOKENS: str = os.getenv("WEBHOOK_TOKENS", "")  # Comma-separated name:token pairs
+    WEBHOOK_MAX_BODY_BYTES: int = int(os.getenv("WEBHOOK_MAX_BODY_BYTES", str(64 * 1024 * 1024)))
+    WEBHOOK_QUEUE_SIZE: int = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))  # Parsed batches, not events
+    TAIL_ENABLED: bool = os.getenv("TAIL_ENABLED", "False").lower() == "true"
+    TAIL_PATHS: List[str] = [p.strip() for p in os.getenv("TAIL_PATHS", "").split(",") if p.strip()]
+    TAIL_POLL_INTERVAL: float = float(os.getenv("TAIL_POLL_INTERVAL", "1.0"))
+    TAIL_FROM_START: bool = os.getenv("TAIL_FROM_START", "False").lower() == "true"  # For files with no checkpoint
+    # Unread bytes above which reading and parsing move to a worker thread
+    TAIL_EXECUTOR_THRESHOLD: int = int(os.getenv("TAIL_EXECUTOR_THRESHOLD", str(4 * 1024 * 1024)))
+    TAIL_MAX_LINE_BYTES: int = int(os.getenv("TAIL_MAX_LINE_BYTES", str(8 * 1024 * 1024)))  # Longer lines are skipped
+    
+    # Multi-process mode: sensor ingestion runs in this many worker processes (0 keeps it in the bot process)
+    WORKER_COUNT: int = int(os.getenv("WORKER_COUNT", "0"))
+    WORKER_SOCKET_PATH: str = os.getenv("WORKER_SOCKET_PATH", "data/workers.sock")
+    WORKER_METRICS_INTERVAL: float = float(os.getenv("WORKER_METRICS_INTERVAL", "5"))
+    
+    # Shared executor tier: threads for blocking I/O and compression, processes for CPU-bound parsing
+    EXECUTOR_THREADS: int = int(os.getenv("EXECUTOR_THREADS", str(min(32, (os.cpu_count() or 1) + 4))))
+    EXECUTOR_PROCESSES: int = int(os.getenv("EXECUTOR_PROCESSES", str(os.cpu_count() or 1)))  # 0 uses threads only
+    
+    # Storage-backed slash commands: deferred, then run at most this many at once (plus per-command limits)
+    COMMAND_CONCURRENCY: int = int(os.getenv("COMMAND_CONCURRENCY", "8"))
+    COMMAND_QUEUE_LIMIT: int = int(os.getenv("COMMAND_QUEUE_LIMIT", "50"))  # Waiting commands before refusing more
+    
+    # Overload control: per-level thresholds for defer_purges, drop_cosmetic, skip_commands, essential_only
+    OVERLOAD_ENABLED: bool = os.getenv("OVERLOAD_ENABLED", "True").lower() == "true"
+    OVERLOAD_IN_FLIGHT: str = os.getenv("OVERLOAD_IN_FLIGHT", "25,50,100,200")  # on_message handlers in flight
+    OVERLOAD_LAG_MS: str = os.getenv("OVERLOAD_LAG_MS", "100,250,500,1000")  # Event-loop lag
+    OVERLOAD_COOLDOWN: float = float(os.getenv("OVERLOAD_COOLDOWN", "15"))  # Calm seconds per step back down
+    
+    # System sampler behind /admin_status (keeps 15 minutes of samples)
+    SYSTEM_SAMPLE_INTERVAL: float = float(os.getenv("SYSTEM_SAMPLE_INTERVAL", "5"))
+    
+    # Online database backups
+    BACKUP_ENABLED: bool = os.getenv("BACKUP_ENABLED", "True").lower() == "true"
+    BACKUP_DIR: str = os.getenv("BACKUP_DIR", "data/backups")
+    BACKUP_INTERVAL_HOURS: float = float(os.getenv("BACKUP_INTERVAL_HOURS", "24"))
+    BACKUP_KEEP: int = int(os.getenv("BACKUP_KEEP", "7"))  # 0 keeps every snapshot
+    BACKUP_COMPRESS: bool = os.getenv("BACKUP_COMPRESS", "True").lower() == "true"
+    BACKUP_PAGES_PER_STEP: int = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+    BACKUP_STEP_SLEEP: float = float(os.getenv("BACKUP_STEP_SLEEP", "0.01"))  # Seconds between steps
+    
+    # Event-loop watchdog: record the call site of any stall longer than the threshold (seconds)
+    WATCHDOG_ENABLED: bool = os.getenv("WATCHDOG_ENABLED", "True").lower() == "true"
+    WATCHDOG_THRESHOLD: float = float(os.getenv("WATCHDOG_THRESHOLD", "0.5"))
+    
     # Logging settings
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE: str = os.getenv("LOG_FILE", "logs/bot.log")
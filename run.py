@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 """
 Simple script to run the Discord bot.
+
+Usage: python run.py [--workers N]
 """
+import argparse
 import asyncio
 import sys
 from pathlib import Path
@@ -10,7 +13,20 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from bot import main
+from config import config
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Run the HoneypotWatcher bot.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="run sensor ingestion in N worker processes (overrides WORKER_COUNT)")
+    parser.add_argument("--worker", type=int, default=None, help=argparse.SUPPRESS)  # Set by the gateway
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        from worker import main as worker_main
+        asyncio.run(worker_main(args.worker))
+    else:
+        if args.workers is not None:
+            config.WORKER_COUNT = args.workers
+        from bot import main
+        asyncio.run(main())
@@ -1,8 +1,27 @@
 """
 Services package for the Discord bot.
 """
+from .backup_service import BackupService
 from .base_service import BaseService
+from .content_filter_service import ContentFilterService
+from .correlation_service import CorrelationService
+from .file_tail_service import FileTailService
+from .gateway_client_service import GatewayClientService
+from .geoip_service import GeoIPService
 from .honeypot_service import HoneypotService
+from .maintenance_service import MaintenanceService
+from .mqtt_ingestion_service import MqttIngestionService
 from .notification_service import NotificationService
+from .overload_service import OverloadService
+from .service_manager import ServiceManager
+from .spam_detection_service import SpamDetectionService
+from .stats_service import StatsService
+from .system_monitor_service import SystemMonitorService
+from .watchdog_service import WatchdogService
+from .webhook_ingestion_service import WebhookIngestionService
+from .worker_hub_service import WorkerHubService
 
-__all__ = ["BaseService", "HoneypotService", "NotificationService"]
+__all__ = ["BackupService", "BaseService", "ContentFilterService", "CorrelationService", "FileTailService",
+           "GatewayClientService", "GeoIPService", "HoneypotService", "MaintenanceService", "MqttIngestionService",
+           "NotificationService", "OverloadService", "ServiceManager", "SpamDetectionService", "StatsService",
+           "SystemMonitorService", "WatchdogService", "WebhookIngestionService", "WorkerHubService"]
@@ -0,0 +1,190 @@
+"""
+Service for scheduled online database backups.
+"""
+import asyncio
+import gzip
+import os
+import shutil
+import tempfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import config
+from config.database import DatabaseManager
+from services.base_service import BaseService
+from utils.logger import logger
+
+SNAPSHOT_PREFIX = "bot-"
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def _compress(source: str, target: str) -> None:
+    """Gzip ``source`` into ``target``, renaming into place so a partial archive is never left behind."""
+    partial = f"{target}.partial"
+    try:
+        with open(source, "rb") as raw, gzip.open(partial, "wb", compresslevel=6) as packed:
+            shutil.copyfileobj(raw, packed, COPY_CHUNK_BYTES)
+        os.replace(partial, target)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def _verify_file(path: str) -> Dict[str, Any]:
+    """Integrity-check a snapshot, decompressing it to a temporary file first if needed."""
+    if not path.endswith(".gz"):
+        return DatabaseManager.verify_snapshot(path)
+    fd, scratch = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.open(path, "rb") as packed:
+            shutil.copyfileobj(packed, raw, COPY_CHUNK_BYTES)
+        return DatabaseManager.verify_snapshot(scratch)
+    except (OSError, EOFError, zlib.error) as e:
+        return {"ok": False, "problems": [f"Could not decompress: {e}"]}
+    finally:
+        for leftover in (scratch, f"{scratch}-wal", f"{scratch}-shm"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+class BackupService(BaseService):
+    """Service that snapshots the database on a schedule without stopping writers.
+    
+    Snapshots are taken with the SQLite online backup API a few pages at a
+    time (see ``DatabaseManager.backup_to``), integrity-checked, optionally
+    gzipped and rotated so only the newest ``BACKUP_KEEP`` remain. All file
+    and database work runs on the executor thread pool.
+    """
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.db = getattr(bot, "db", None)
+        self.directory = Path(config.BACKUP_DIR)
+        self.interval = config.BACKUP_INTERVAL_HOURS * 3600
+        self.keep = config.BACKUP_KEEP
+        self.compress = config.BACKUP_COMPRESS
+        self.backup_task: Optional[asyncio.Task] = None
+        self.last_backup: Optional[Dict[str, Any]] = None
+        self._lock = asyncio.Lock()
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the backup service."""
+        logger.info("Initializing BackupService...")
+        if not self.db:
+            raise RuntimeError("No database configured")
+        self.directory.mkdir(parents=True, exist_ok=True)
+    
+    async def _on_start(self) -> None:
+        """Start the backup schedule."""
+        logger.info(f"Starting database backups every {config.BACKUP_INTERVAL_HOURS}h to {self.directory}...")
+        self.backup_task = asyncio.create_task(self._backup_loop())
+    
+    async def _on_stop(self) -> None:
+        """Stop the backup schedule."""
+        logger.info("Stopping database backups...")
+        if self.backup_task:
+            self.backup_task.cancel()
+            try:
+                await self.backup_task
+            except asyncio.CancelledError:
+                pass
+    
+    def _seconds_until_due(self) -> float:
+        """Seconds until the next backup is due, based on the newest snapshot on disk."""
+        snapshots = self.list_snapshots()
+        if not snapshots:
+            return 0.0
+        age = datetime.now().timestamp() - os.path.getmtime(snapshots[-1])
+        return max(0.0, self.interval - age)
+    
+    async def _backup_loop(self) -> None:
+        """Take a snapshot whenever one is due."""
+        while True:
+            try:
+                await asyncio.sleep(self._seconds_until_due())
+                await self.run_backup()
+                await asyncio.sleep(self.interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in backup loop: {e}")
+                await asyncio.sleep(self.interval)
+    
+    def list_snapshots(self) -> List[str]:
+        """Snapshot paths, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        names = [name for name in os.listdir(self.directory)
+                 if name.startswith(SNAPSHOT_PREFIX) and name.endswith((".db", ".db.gz"))]
+        return [str(self.directory / name) for name in sorted(names)]
+    
+    async def run_backup(self) -> Optional[Dict[str, Any]]:
+        """Take, verify, compress and rotate one snapshot. Returns its details, or None on failure."""
+        async with self._lock:
+            started = datetime.now()
+            path = str(self.directory / f"{SNAPSHOT_PREFIX}{started:%Y%m%d-%H%M%S}.db")
+            partial = f"{path}.partial"
+            try:
+                stats = await self._run_blocking(
+                    self.db.backup_to, partial, config.BACKUP_PAGES_PER_STEP, config.BACKUP_STEP_SLEEP
+                )
+                if stats is None:
+                    return None
+                verification = await self._run_blocking(DatabaseManager.verify_snapshot, partial)
+                if not verification["ok"]:
+                    logger.error(f"New snapshot failed its integrity check: {verification['problems']}")
+                    return None
+                if self.compress:
+                    path += ".gz"
+                    await self._run_blocking(_compress, partial, path)
+                else:
+                    os.replace(partial, path)
+            finally:
+                if os.path.exists(partial):
+                    os.remove(partial)
+            
+            removed = self._rotate()
+            self.last_backup = {
+                "path": path,
+                "time": started.isoformat(),
+                "seconds": round((datetime.now() - started).total_seconds(), 2),
+                "bytes": os.path.getsize(path),
+                "addresses": verification["addresses"],
+                "activity_logs": verification["activity_logs"],
+                **stats
+            }
+            logger.info(f"Backed up database to {path} ({stats['pages']} pages in {stats['steps']} steps, "
+                        f"{self.last_backup['seconds']}s), removed {removed} old")
+            return self.last_backup
+    
+    def _rotate(self) -> int:
+        """Delete the oldest snapshots beyond ``keep``."""
+        expired = self.list_snapshots()[:-self.keep] if self.keep > 0 else []
+        for path in expired:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Could not remove old snapshot {path}: {e}")
+        return len(expired)
+    
+    async def verify_snapshots(self) -> Dict[str, Dict[str, Any]]:
+        """Open every snapshot and run an integrity check on it, oldest first."""
+        results = {}
+        for path in self.list_snapshots():
+            result = await self._run_blocking(_verify_file, path)
+            if not result["ok"]:
+                logger.error(f"Snapshot {path} failed verification: {result['problems']}")
+            results[os.path.basename(path)] = result
+        return results
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status.update({
+            "directory": str(self.directory),
+            "snapshots": len(self.list_snapshots()),
+            "last_backup": self.last_backup
+        })
+        return status
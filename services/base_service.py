@@ -1,8 +1,11 @@
 """
 Base service class for all bot services.
 """
+import asyncio
+import functools
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from utils.logger import logger
 
@@ -10,10 +13,18 @@ from utils.logger import logger
 class BaseService(ABC):
     """Base class for all bot services."""
     
+    # Keys in ``bot.services`` that must be running before this service starts
+    dependencies: Tuple[str, ...] = ()
+    start_timeout: float = 30.0  # Seconds allowed for initialize + _on_start
+    stop_timeout: float = 10.0  # Seconds allowed for _on_stop
+    
     def __init__(self, bot):
         self.bot = bot
         self._initialized = False
         self._running = False
+        self._ready = asyncio.Event()
+        self._startup_duration: Optional[float] = None
+        self._last_error: Optional[str] = None
     
     @property
     def initialized(self) -> bool:
@@ -25,6 +36,26 @@ class BaseService(ABC):
         """Check if the service is running."""
         return self._running
     
+    @property
+    def ready(self) -> bool:
+        """Check if the service has started and is ready to serve requests."""
+        return self._ready.is_set()
+    
+    @property
+    def startup_duration(self) -> Optional[float]:
+        """Seconds the last successful start took, or None if never started."""
+        return self._startup_duration
+    
+    async def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the service is ready. Returns False if the timeout expires first."""
+        if self._ready.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
     async def initialize(self) -> bool:
         """Initialize the service."""
         try:
@@ -33,11 +64,21 @@ class BaseService(ABC):
             logger.info(f"Service {self.__class__.__name__} initialized")
             return True
         except Exception as e:
+            self._last_error = str(e)
             logger.error(f"Failed to initialize service {self.__class__.__name__}: {e}")
             return False
     
     async def start(self) -> bool:
-        """Start the service."""
+        """Start the service, giving up after ``start_timeout`` seconds."""
+        started_at = time.perf_counter()
+        try:
+            return await asyncio.wait_for(self._start(started_at), timeout=self.start_timeout)
+        except asyncio.TimeoutError:
+            self._last_error = f"start timed out after {self.start_timeout}s"
+            logger.error(f"Service {self.__class__.__name__} did not start within {self.start_timeout}s")
+            return False
+    
+    async def _start(self, started_at: float) -> bool:
         if not self._initialized:
             if not await self.initialize():
                 return False
@@ -45,22 +86,64 @@ class BaseService(ABC):
         try:
             await self._on_start()
             self._running = True
-            logger.info(f"Service {self.__class__.__name__} started")
+            self._startup_duration = time.perf_counter() - started_at
+            self._last_error = None
+            self._ready.set()
+            self._state_changed()
+            logger.info(f"Service {self.__class__.__name__} started in {self._startup_duration:.2f}s")
             return True
         except Exception as e:
+            self._last_error = str(e)
             logger.error(f"Failed to start service {self.__class__.__name__}: {e}")
             return False
     
     async def stop(self) -> bool:
-        """Stop the service."""
+        """Stop the service, giving up after ``stop_timeout`` seconds."""
+        self._ready.clear()
         try:
-            await self._on_stop()
+            await asyncio.wait_for(self._on_stop(), timeout=self.stop_timeout)
             self._running = False
             logger.info(f"Service {self.__class__.__name__} stopped")
             return True
+        except asyncio.TimeoutError:
+            self._running = False
+            self._last_error = f"stop timed out after {self.stop_timeout}s"
+            logger.error(f"Service {self.__class__.__name__} did not stop within {self.stop_timeout}s")
+            return False
         except Exception as e:
+            self._last_error = str(e)
             logger.error(f"Failed to stop service {self.__class__.__name__}: {e}")
             return False
+        finally:
+            self._state_changed()
+    
+    def _state_changed(self) -> None:
+        """Drop cached responses that show service states."""
+        response_cache = getattr(self.bot, "response_cache", None)
+        if response_cache is not None:
+            response_cache.invalidate("services")
+    
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run blocking I/O or GIL-releasing work (database, compression) on the shared thread pool."""
+        executors = getattr(self.bot, "executors", None)
+        if executors is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(func, *args))
+        return await executors.run_thread(func, *args)
+    
+    async def _run_cpu(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run pure-Python CPU work on the shared process pool; ``func`` and ``args`` must be picklable."""
+        executors = getattr(self.bot, "executors", None)
+        if executors is None:
+            return await self._run_blocking(func, *args)
+        return await executors.run_process(func, *args)
+    
+    async def _map_cpu(self, func: Callable[[Sequence[Any]], Any], items: Sequence[Any], chunk_size: int) -> List[Any]:
+        """Apply ``func`` to chunks of ``items`` across the process pool; results come back in order."""
+        executors = getattr(self.bot, "executors", None)
+        if executors is None:
+            return [await self._run_blocking(func, items)]
+        return await executors.map_chunks(func, items, chunk_size)
     
     @abstractmethod
     async def _on_initialize(self) -> None:
@@ -82,5 +165,9 @@ class BaseService(ABC):
         return {
             "name": self.__class__.__name__,
             "initialized": self._initialized,
-            "running": self._running
+            "running": self._running,
+            "ready": self.ready,
+            "dependencies": list(self.dependencies),
+            "startup_duration": self._startup_duration,
+            "last_error": self._last_error
         }
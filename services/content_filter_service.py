@@ -0,0 +1,122 @@
+"""
+Service for matching messages against known scam and spam phrases.
+"""
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from config import config
+from services.base_service import BaseService
+from utils.logger import logger
+from utils.patterns import ACTIONS, PatternMatch, PatternSet, parse_patterns
+
+
+def _load_pattern_set(path: str) -> PatternSet:
+    """Read, validate and compile a pattern file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return PatternSet(parse_patterns(f.read()))
+
+
+class ContentFilterService(BaseService):
+    """Service that scans messages for phrases and regexes from a pattern file.
+    
+    The file at ``CONTENT_PATTERNS_PATH`` is compiled into a ``PatternSet`` on
+    a worker thread, and recompiled whenever its modification time changes.
+    A file that fails to parse is logged and the previous set stays active;
+    if there is none yet, nothing is matched until a valid file appears.
+    """
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.path = config.CONTENT_PATTERNS_PATH
+        self.reload_interval = config.CONTENT_RELOAD_INTERVAL
+        self.pattern_set: Optional[PatternSet] = None
+        self.reload_task: Optional[asyncio.Task] = None
+        self.last_loaded: Optional[datetime] = None
+        self._file_version: Optional[Tuple[int, int]] = None
+        self.stats = {"scanned": 0, **{action: 0 for action in ACTIONS}}
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the content filter service."""
+        logger.info("Initializing ContentFilterService...")
+        if not self.path:
+            raise RuntimeError("No pattern file configured")
+    
+    async def _on_start(self) -> None:
+        """Load the pattern file and start watching it for changes."""
+        logger.info("Starting content filter...")
+        if not await self.reload():
+            logger.warning(f"Content filter starts with no patterns; watching {self.path} for a valid file")
+        self.reload_task = asyncio.create_task(self._reload_loop())
+    
+    async def _on_stop(self) -> None:
+        """Stop watching the pattern file."""
+        logger.info("Stopping content filter...")
+        if self.reload_task:
+            self.reload_task.cancel()
+            try:
+                await self.reload_task
+            except asyncio.CancelledError:
+                pass
+    
+    def _stat_version(self) -> Optional[Tuple[int, int]]:
+        """(mtime, size) of the pattern file, or None if it is missing."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    async def reload(self) -> bool:
+        """Recompile the pattern file. Returns False and keeps the current set if it is invalid."""
+        version = self._stat_version()
+        try:
+            started = time.perf_counter()
+            pattern_set = await self._run_blocking(_load_pattern_set, self.path)
+        except Exception as e:
+            logger.error(f"Failed to load content patterns from {self.path}: {e}")
+            self._file_version = version  # Don't retry until the file changes again
+            return False
+        
+        self.pattern_set = pattern_set
+        self._file_version = version
+        self.last_loaded = datetime.now()
+        logger.info(f"Loaded {len(pattern_set):,} content patterns from {self.path} "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return True
+    
+    async def _reload_loop(self) -> None:
+        """Reload the pattern file whenever it changes."""
+        while True:
+            try:
+                await asyncio.sleep(self.reload_interval)
+                version = self._stat_version()
+                if version is not None and version != self._file_version:
+                    await self.reload()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error watching content patterns: {e}")
+    
+    def scan(self, content: str) -> Optional[PatternMatch]:
+        """The most severe pattern in a message, or None."""
+        pattern_set = self.pattern_set
+        if pattern_set is None or not content:
+            return None
+        self.stats["scanned"] += 1
+        match = pattern_set.match(content)
+        if match is not None:
+            self.stats[match.pattern.action] += 1
+        return match
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status.update({
+            "patterns": len(self.pattern_set) if self.pattern_set else 0,
+            "last_loaded": self.last_loaded.isoformat() if self.last_loaded else None,
+            **self.stats
+        })
+        return status
@@ -0,0 +1,81 @@
+"""
+Service for correlating reports of one address across sensors.
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Set
+
+from config import config
+from services.base_service import BaseService
+from utils.correlation import SpreadTracker, source_id
+from utils.logger import logger
+
+
+class CorrelationService(BaseService):
+    """Service that raises a critical alert when an address is reported by many sources at once.
+    
+    An attacker hitting several honeypots within a short window is far more
+    significant than one sensor reporting it repeatedly, so every report is
+    tracked by its sensor or source ID and an alert is sent through
+    NotificationService when ``CORRELATION_MIN_SOURCES`` distinct sources see
+    the same address within ``CORRELATION_WINDOW_SECONDS``.
+    """
+    
+    dependencies = ("honeypot", "notification")
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.tracker = SpreadTracker(config.CORRELATION_WINDOW_SECONDS, config.CORRELATION_MIN_SOURCES)
+        self.alerts_raised = 0
+        self._alert_tasks: Set[asyncio.Task] = set()
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the correlation service."""
+        logger.info("Initializing CorrelationService...")
+    
+    async def _on_start(self) -> None:
+        """Start listening for reports."""
+        logger.info("Starting correlation service...")
+        self.bot.services["honeypot"].add_report_listener(self.record)
+    
+    async def _on_stop(self) -> None:
+        """Stop listening for reports and let pending alerts finish."""
+        logger.info("Stopping correlation service...")
+        self.bot.services["honeypot"].remove_report_listener(self.record)
+        if self._alert_tasks:
+            await asyncio.gather(*self._alert_tasks, return_exceptions=True)
+    
+    def record(self, address: str, activity_data: Dict[str, Any], reported_at: datetime) -> None:
+        """Track one report. Called synchronously by HoneypotService for every report."""
+        sources = self.tracker.add(address, source_id(activity_data), reported_at.timestamp())
+        if sources is None:
+            return
+        self.alerts_raised += 1
+        logger.warning(f"Address {address} reported by {len(sources)} sources: {', '.join(sources)}")
+        # Listeners are synchronous; send the alert in the background
+        task = asyncio.create_task(self._send_alert(address, sources))
+        self._alert_tasks.add(task)
+        task.add_done_callback(self._alert_tasks.discard)
+    
+    async def _send_alert(self, address: str, sources: List[str]) -> None:
+        """Send a critical alert for a correlated address."""
+        fields = [{"name": "Sources", "value": "\n".join(sources)[:1024], "inline": False}]
+        location = self.bot.services["honeypot"].describe_location(address)
+        if location:
+            fields.append({"name": "Location", "value": location, "inline": True})
+        await self.bot.services["notification"].send_alert(
+            "Multi-Sensor Activity",
+            f"`{address}` was reported by {len(sources)} distinct sources "
+            f"within {config.CORRELATION_WINDOW_SECONDS}s.",
+            severity="critical",
+            fields=fields
+        )
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status.update({
+            "tracked_addresses": len(self.tracker),
+            "alerts_raised": self.alerts_raised
+        })
+        return status
@@ -0,0 +1,289 @@
+"""
+Service for tailing honeypot log files (Cowrie-style JSON lines) into HoneypotService.
+"""
+import asyncio
+import functools
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import config
+from services.base_service import BaseService
+from services.ingestion import SensorReport, parse_event_lines
+from utils.logger import logger
+
+READ_SIZE = 1024 * 1024  # Bytes read per batch off the event loop
+INLINE_READ_SIZE = 64 * 1024  # Bytes read and parsed per batch on the event loop (a couple of ms)
+CHECKPOINT_INTERVAL = 1.0  # Minimum seconds between checkpoint writes for a file
+PARSE_CHUNK_LINES = 2000  # Lines per process pool task when parsing a large backlog
+
+
+def _find_by_inode(directory: str, inode: int) -> Optional[str]:
+    """Find the file in ``directory`` with the given inode, e.g. a log rotated while we were down."""
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.inode() == inode:
+                    return entry.path
+    except OSError:
+        pass
+    return None
+
+
+class TailedFile:
+    """Read position in one log file, following it across rotations by inode."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.source = f"file:{os.path.basename(path)}"
+        self.file = None
+        self.inode: Optional[int] = None
+        self.offset = 0
+        self.checkpointed: Tuple[Optional[int], int] = (None, 0)
+        self.last_checkpoint = 0.0
+        self.stats = {"reported": 0, "unmonitored": 0, "invalid": 0, "rotations": 0}
+        self.skipping = False  # Inside an overlong line whose end hasn't been read yet
+    
+    def open(self, file_path: str, offset: int) -> None:
+        """Open ``file_path`` (the tailed path or a rotated copy of it) at ``offset``."""
+        self.close()
+        self.file = open(file_path, "rb", buffering=0)
+        self.inode = os.fstat(self.file.fileno()).st_ino
+        self.offset = offset
+    
+    def close(self) -> None:
+        """Close the open file, if any."""
+        if self.file:
+            self.file.close()
+            self.file = None
+    
+    def size(self) -> int:
+        """Current size of the open file."""
+        return os.fstat(self.file.fileno()).st_size
+    
+    def rotated(self) -> bool:
+        """Whether the tailed path now refers to a different file than the one open."""
+        try:
+            return os.stat(self.path).st_ino != self.inode
+        except FileNotFoundError:
+            return False
+    
+    def read_lines(self, limit: int, max_line: int) -> Optional[List[bytes]]:
+        """Read up to ``limit`` bytes of complete lines and advance past them.
+        
+        A trailing partial line is left for the next read. If not even one
+        line fits, the read is retried with double the limit, up to
+        ``max_line`` bytes. Returns None, without advancing, when the next
+        line is longer than that.
+        """
+        while True:
+            self.file.seek(self.offset)
+            data = self.file.read(limit)
+            end = data.rfind(b"\n") + 1
+            if end:
+                self.offset += end
+                return data[:end].split(b"\n")
+            if len(data) < limit:
+                return []  # A line still being written
+            if limit >= max_line:
+                return None
+            limit = min(limit * 2, max_line)
+    
+    def skip_line(self) -> None:
+        """Advance past the rest of the current line; ``skipping`` stays set until its newline is read."""
+        self.skipping = True
+        self.file.seek(self.offset)
+        while True:
+            data = self.file.read(READ_SIZE)
+            if not data:
+                return
+            end = data.find(b"\n") + 1
+            if end:
+                self.offset += end
+                self.skipping = False
+                return
+            self.offset += len(data)
+
+
+class FileTailService(BaseService):
+    """Service that follows local honeypot log files and reports their events.
+    
+    Each file's ``(inode, offset)`` is checkpointed in the database after the
+    events before it have been flushed, so a restart resumes exactly there,
+    including in a file that was rotated away while the bot was down.
+    While a file's unread backlog exceeds ``TAIL_EXECUTOR_THRESHOLD`` bytes,
+    reading moves to the shared thread pool and parsing, which holds the GIL,
+    to the process pool in chunks, so catching up never starves the event loop.
+    Smaller backlogs are read inline ``INLINE_READ_SIZE`` bytes per poll;
+    a line that doesn't fit in that is read off the loop instead. Lines
+    longer than ``TAIL_MAX_LINE_BYTES`` are skipped and counted as invalid.
+    """
+    
+    dependencies = ("honeypot",)
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.db = getattr(bot, "db", None)
+        self.files = [TailedFile(path) for path in config.TAIL_PATHS]
+        self.poll_interval = config.TAIL_POLL_INTERVAL
+        self.executor_threshold = config.TAIL_EXECUTOR_THRESHOLD
+        self.max_line_bytes = config.TAIL_MAX_LINE_BYTES
+        self.batch_size = config.INGEST_BATCH_SIZE
+        self.tail_task: Optional[asyncio.Task] = None
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the file tail service."""
+        logger.info("Initializing FileTailService...")
+        if not self.files:
+            raise RuntimeError("No log files configured")
+    
+    async def _on_start(self) -> None:
+        """Open each file at its checkpoint and start tailing."""
+        logger.info("Starting log file tailing...")
+        for tailed in self.files:
+            await self._run_blocking(self._open_from_checkpoint, tailed)
+        self.tail_task = asyncio.create_task(self._tail_loop())
+    
+    async def _on_stop(self) -> None:
+        """Stop tailing and record final checkpoints."""
+        logger.info("Stopping log file tailing...")
+        if self.tail_task:
+            self.tail_task.cancel()
+            try:
+                await self.tail_task
+            except asyncio.CancelledError:
+                pass
+        for tailed in self.files:
+            await self._checkpoint(tailed, force=True)
+            tailed.close()
+    
+    def _open_from_checkpoint(self, tailed: TailedFile) -> None:
+        """Position a file at its saved checkpoint, finding it by inode if it was rotated."""
+        checkpoint = self.db.get_ingest_checkpoint(tailed.path) if self.db else None
+        try:
+            current = os.stat(tailed.path)
+        except FileNotFoundError:
+            current = None
+        
+        if checkpoint:
+            inode, offset = checkpoint
+            if current and current.st_ino == inode:
+                # A file smaller than the checkpoint was truncated; start it over
+                tailed.open(tailed.path, offset if offset <= current.st_size else 0)
+                logger.info(f"Resuming {tailed.path} at byte {tailed.offset}")
+                return
+            rotated = _find_by_inode(os.path.dirname(tailed.path) or ".", inode)
+            if rotated:
+                # Finish the rotated file first; the loop switches back to the path at its end
+                tailed.open(rotated, offset)
+                logger.info(f"Resuming {rotated} (rotated from {tailed.path}) at byte {offset}")
+                return
+            logger.warning(f"Checkpointed file for {tailed.path} is gone; reading the current file from the start")
+            if current:
+                tailed.open(tailed.path, 0)
+            return
+        
+        if current:
+            tailed.open(tailed.path, 0 if config.TAIL_FROM_START else current.st_size)
+    
+    async def _tail_loop(self) -> None:
+        """Poll every file, reading continuously while any has unread data."""
+        while True:
+            try:
+                busy = False
+                for tailed in self.files:
+                    busy = await self._poll(tailed) or busy
+                if not busy:
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error tailing log files: {e}")
+                await asyncio.sleep(self.poll_interval)
+    
+    async def _poll(self, tailed: TailedFile) -> bool:
+        """Read and report one batch from a file. Returns True if there may be more to read."""
+        if tailed.file is None:
+            if not os.path.exists(tailed.path):
+                return False
+            tailed.open(tailed.path, 0)
+        
+        size = tailed.size()
+        if size < tailed.offset:
+            logger.warning(f"{tailed.path} was truncated; reading from the start")
+            tailed.offset = 0
+        if size == tailed.offset:
+            # Only switch files at the end of the old one, so nothing written before rotation is lost
+            if tailed.rotated():
+                tailed.open(tailed.path, 0)
+                tailed.stats["rotations"] += 1
+                logger.info(f"{tailed.path} was rotated; following the new file")
+                await self._checkpoint(tailed, force=True)
+                return True
+            await self._checkpoint(tailed)
+            return False
+        
+        start = tailed.offset
+        lines: Optional[List[bytes]] = None
+        if tailed.skipping:
+            await self._run_blocking(tailed.skip_line)
+            lines = []
+        elif size - tailed.offset < self.executor_threshold:
+            # None when the next line doesn't fit in one inline read
+            lines = tailed.read_lines(INLINE_READ_SIZE, INLINE_READ_SIZE)
+        if lines is None:
+            lines = await self._run_blocking(tailed.read_lines, READ_SIZE, self.max_line_bytes)
+            if lines is None:
+                logger.warning(f"Skipping a line longer than {self.max_line_bytes} bytes in {tailed.path}")
+                tailed.stats["invalid"] += 1
+                await self._run_blocking(tailed.skip_line)
+                lines = []
+            reports, invalid = await self._parse_off_loop(lines, tailed.source)
+        else:
+            reports, invalid = parse_event_lines(lines, tailed.source)
+        tailed.stats["invalid"] += invalid
+        
+        honeypot_service = self.bot.services["honeypot"]
+        for i in range(0, len(reports), self.batch_size):
+            chunk = reports[i:i + self.batch_size]
+            reported = await honeypot_service.report_activities(chunk)
+            tailed.stats["reported"] += reported
+            tailed.stats["unmonitored"] += len(chunk) - reported
+            await asyncio.sleep(0)
+        await self._checkpoint(tailed)
+        # No progress means only a partial line is pending; wait for the writer
+        return tailed.offset != start
+    
+    async def _parse_off_loop(self, lines: List[bytes], source: str) -> Tuple[List[SensorReport], int]:
+        """Parse a large batch of lines in chunks across the process pool."""
+        reports: List[SensorReport] = []
+        invalid = 0
+        parse = functools.partial(parse_event_lines, source=source)
+        for chunk_reports, chunk_invalid in await self._map_cpu(parse, lines, PARSE_CHUNK_LINES):
+            reports.extend(chunk_reports)
+            invalid += chunk_invalid
+        return reports, invalid
+    
+    async def _checkpoint(self, tailed: TailedFile, force: bool = False) -> None:
+        """Flush reported events, then save the file position, at most once per interval."""
+        position = (tailed.inode, tailed.offset)
+        if not self.db or tailed.inode is None or position == tailed.checkpointed:
+            return
+        now = time.monotonic()
+        if not force and now - tailed.last_checkpoint < CHECKPOINT_INTERVAL:
+            return
+        # Persist the events before the position that claims them
+        await self.bot.services["honeypot"].flush()
+        await self._run_blocking(self.db.save_ingest_checkpoint, tailed.path, *position)
+        tailed.checkpointed = position
+        tailed.last_checkpoint = now
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        files = {}
+        for tailed in self.files:
+            backlog = tailed.size() - tailed.offset if tailed.file else None
+            files[tailed.path] = {"offset": tailed.offset, "backlog_bytes": backlog, **tailed.stats}
+        status["files"] = files
+        return status
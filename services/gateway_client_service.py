@@ -0,0 +1,191 @@
+"""
+Worker-side connection to the gateway process, standing in for HoneypotService.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import config
+from services.base_service import BaseService
+from utils.ipc import encode_frame, read_frame
+from utils.logger import logger
+from utils.metrics import ProcessMetrics, RateMeter
+
+RECONNECT_MIN_DELAY = 0.5
+RECONNECT_MAX_DELAY = 10.0
+
+
+class GatewayClientService(BaseService):
+    """Service that forwards a worker's sensor reports to the gateway over its Unix socket.
+    
+    A worker registers it as ``honeypot``, so the ingestion services run in
+    the worker unchanged. ``report_activities`` sends a whole batch as one
+    frame and returns the count the gateway accepted, so backpressure and
+    pipeline stats behave as in a single process. ``flush`` returns once the
+    gateway has written its activity buffer, which keeps file checkpoints safe.
+    While disconnected, requests wait for the connection to come back, and a
+    report batch cut off by a disconnect is sent again once it does; the
+    gateway's deduplication drops any reports it had already accepted.
+    """
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.socket_path = config.WORKER_SOCKET_PATH
+        self.worker_index: int = bot.worker_index
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.connection_task: Optional[asyncio.Task] = None
+        self.metrics_task: Optional[asyncio.Task] = None
+        self.reconnects = 0
+        self.forwarded = RateMeter()
+        self.accepted = 0
+        self.process_metrics = ProcessMetrics()
+        self._connected = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the gateway client."""
+        logger.info(f"Initializing GatewayClientService for worker {self.worker_index}...")
+    
+    async def _on_start(self) -> None:
+        """Connect to the gateway and start sending metrics."""
+        logger.info(f"Connecting to gateway at {self.socket_path}...")
+        self.connection_task = asyncio.create_task(self._connection_loop())
+        await self._connected.wait()
+        self.metrics_task = asyncio.create_task(self._metrics_loop())
+    
+    async def _on_stop(self) -> None:
+        """Disconnect from the gateway."""
+        logger.info("Disconnecting from gateway...")
+        for task in (self.metrics_task, self.connection_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+    
+    async def _connection_loop(self) -> None:
+        """Keep a connection to the gateway open, reconnecting with backoff."""
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                reader, self.writer = await asyncio.open_unix_connection(self.socket_path)
+                self.writer.write(encode_frame({"op": "hello", "worker": self.worker_index}))
+                self._connected.set()
+                delay = RECONNECT_MIN_DELAY
+                logger.info(f"Worker {self.worker_index} connected to gateway")
+                await self._read_replies(reader)
+                logger.warning(f"Worker {self.worker_index} lost its gateway connection")
+            except asyncio.CancelledError:
+                self._disconnect()
+                raise
+            except Exception as e:
+                logger.error(f"Worker {self.worker_index} gateway connection error: {e}")
+            self._disconnect()
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+    
+    async def _read_replies(self, reader: asyncio.StreamReader) -> None:
+        """Resolve pending requests as replies arrive, until the connection closes."""
+        while True:
+            reply = await read_frame(reader)
+            if reply is None:
+                return
+            future = self._pending.pop(reply.get("id"), None)
+            if future is None or future.done():
+                continue
+            if "error" in reply:
+                future.set_exception(RuntimeError(f"Gateway error: {reply['error']}"))
+            else:
+                future.set_result(reply.get("result"))
+    
+    def _disconnect(self) -> None:
+        """Close the connection and fail requests still waiting on it."""
+        self._connected.clear()
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Gateway connection lost"))
+    
+    async def _send(self, message: Dict[str, Any]) -> None:
+        """Write one frame once connected."""
+        await self._connected.wait()
+        async with self._write_lock:
+            if self.writer is None:
+                raise ConnectionError("Gateway connection lost")
+            self.writer.write(encode_frame(message))
+            await self.writer.drain()
+    
+    async def _request(self, message: Dict[str, Any]) -> Any:
+        """Send a request frame and wait for the gateway's reply."""
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._send({"id": request_id, **message})
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+    
+    async def report_activities(self, reports: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Forward a batch of reports to the gateway. Returns the number it accepted."""
+        if not reports:
+            return 0
+        while True:
+            try:
+                accepted = await self._request({"op": "report", "reports": reports})
+                break
+            except ConnectionError:
+                if not self.ready:
+                    raise
+                # The next attempt waits for the reconnect
+                logger.warning(f"Gateway connection lost during a batch of {len(reports)} reports; resending it")
+        self.forwarded.add(len(reports))
+        self.accepted += accepted
+        return accepted
+    
+    async def flush(self) -> None:
+        """Wait until the gateway has written every report forwarded so far."""
+        await self._request({"op": "flush"})
+    
+    async def _metrics_loop(self) -> None:
+        """Send this worker's throughput and resource use to the gateway."""
+        while True:
+            try:
+                await asyncio.sleep(config.WORKER_METRICS_INTERVAL)
+                await self._send({"op": "metrics", "metrics": self.get_metrics()})
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Failed to send worker metrics: {e}")
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Throughput and resource use of this worker process."""
+        services = {name: service.get_status() for name, service in self.bot.services.items() if service is not self}
+        return {
+            **self.process_metrics.snapshot(),
+            "events_per_second": round(self.forwarded.rate(), 1),
+            "forwarded": self.forwarded.total,
+            "accepted": self.accepted,
+            "reconnects": self.reconnects,
+            "services": services
+        }
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status.update({
+            "worker": self.worker_index,
+            "connected": self._connected.is_set(),
+            "pending_requests": len(self._pending),
+            "forwarded": self.forwarded.total,
+            "accepted": self.accepted,
+            "reconnects": self.reconnects
+        })
+        return status
@@ -0,0 +1,65 @@
+"""
+Service for offline GeoIP/ASN enrichment of addresses.
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+from config import config
+from services.base_service import BaseService
+from utils.geoip import GeoInfo, GeoIPDatabase, format_geo
+from utils.logger import logger
+
+
+class GeoIPService(BaseService):
+    """Service that answers country/ASN lookups from local range databases.
+    
+    The CSV files in ``GEOIP_PATHS`` are loaded on a worker thread at startup;
+    lookups afterwards are in-memory binary searches behind an LRU cache and
+    never touch the network.
+    """
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.paths: List[str] = config.GEOIP_PATHS
+        self.database = GeoIPDatabase(config.GEOIP_CACHE_SIZE)
+        self.load_seconds: Optional[float] = None
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the GeoIP service."""
+        logger.info("Initializing GeoIPService...")
+        if not self.paths:
+            raise RuntimeError("No GeoIP databases configured")
+    
+    async def _on_start(self) -> None:
+        """Load every configured range database."""
+        logger.info("Loading GeoIP databases...")
+        started = time.perf_counter()
+        for path in self.paths:
+            ranges = await self._run_blocking(self.database.load_csv, path)
+            logger.info(f"Loaded {ranges:,} GeoIP ranges from {path}")
+        self.load_seconds = time.perf_counter() - started
+    
+    async def _on_stop(self) -> None:
+        """Stop the GeoIP service."""
+        logger.info("Stopping GeoIP service...")
+    
+    def lookup(self, address: str) -> Optional[GeoInfo]:
+        """Country and ASN of an IP address or network, or None if unknown."""
+        return self.database.lookup(address)
+    
+    def describe(self, address: str) -> Optional[str]:
+        """Short location text for an address, e.g. ``DE · AS3320 Deutsche Telekom``."""
+        return format_geo(self.database.lookup(address))
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        cache = self.database.lookup.cache_info()
+        status.update({
+            "ranges": self.database.range_count,
+            "load_seconds": self.load_seconds,
+            "cache_hits": cache.hits,
+            "cache_misses": cache.misses,
+            "cache_size": cache.currsize
+        })
+        return status
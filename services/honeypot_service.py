@@ -2,11 +2,33 @@
 Service for monitoring honeypot activities.
 """
 import asyncio
+import csv
+import gzip
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, ItemsView, Iterable, List, Optional, Tuple
 
+from config import config
 from services.base_service import BaseService
+from utils import json_codec
+from utils.address_store import AddressRecord, AddressStore
+from utils.addresses import FeedEntry, normalize_address, parse_address_feed
+from utils.correlation import INTERACTIVE_SOURCE
+from utils.dedup import create_deduplicator, report_key
 from utils.logger import logger
+from utils.pagination import Cursor, KeysetIndex
+from utils.prefix_index import PrefixIndex
+
+IMPORT_BATCH_SIZE = 20000  # Entries per executemany transaction during bulk import
+EXPORT_COLUMNS = ("address", "description", "added_at", "suspicious_count", "last_checked")
+ACTIVITY_FLUSH_INTERVAL = 1.0  # Seconds between write-behind flushes of reports to the database
+ACTIVITY_FLUSH_SIZE = 5000  # Buffered reports that trigger an early flush
+ACTIVITY_BUFFER_LIMIT = 4 * ACTIVITY_FLUSH_SIZE  # Buffered reports at which batch reporters wait for a flush
+
+
+def _parse_timestamp(value: Optional[str]) -> float:
+    """Parse a timestamp stored by DatabaseManager into epoch seconds, defaulting to now."""
+    return (datetime.fromisoformat(value) if value else datetime.now()).timestamp()
 
 
 class HoneypotService(BaseService):
@@ -14,21 +36,79 @@ class HoneypotService(BaseService):
     
     def __init__(self, bot):
         super().__init__(bot)
-        self.monitored_addresses: Dict[str, Dict[str, Any]] = {}
+        self.monitored_addresses = AddressStore()
         self.alert_threshold = 5  # Number of suspicious activities before alert
         self.monitoring_task: Optional[asyncio.Task] = None
+        self.db = getattr(bot, "db", None)  # DatabaseManager for persistence, if configured
+        self.flush_task: Optional[asyncio.Task] = None
+        
+        # Write-behind buffers: reports are persisted in batches, not one transaction each
+        self._activity_buffer: List[Tuple[str, str, Dict[str, Any], Optional[str], str]] = []
+        self._dirty_counts: Dict[str, int] = {}
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        
+        # Repeats of a report within the window (sensor retries, double submissions) are counted once
+        self.deduplicator = create_deduplicator(
+            config.DEDUP_MODE, config.DEDUP_CAPACITY, config.DEDUP_ERROR_RATE, config.DEDUP_WINDOW_SECONDS
+        )
+        self.duplicate_reports = 0
+        
+        # Synchronous callbacks run for every accepted report: (address, activity_data, reported_at)
+        self._report_listeners: List[Callable[[str, Dict[str, Any], datetime], None]] = []
+        
+        # Keyset indexes for paginated listing, keyed on (added_at, id) and (suspicious_count, id)
+        self._recent_index = KeysetIndex()
+        self._count_index = KeysetIndex()
+        
+        # Prefix index backing address autocomplete
+        self.address_index = PrefixIndex()
     
     async def _on_initialize(self) -> None:
         """Initialize the honeypot service."""
         logger.info("Initializing HoneypotService...")
-        # Load monitored addresses from database or config
-        # This is where you'd load persistent data
-        pass
+        # Load persisted monitored addresses
+        if self.db:
+            rows = await self._run_blocking(lambda: list(self.db.iter_monitored_addresses()))
+            self._load_rows(rows)
+            logger.info(f"Loaded {len(rows)} monitored addresses from the database")
+    
+    def _load_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Bulk-load monitored address rows from the database into memory."""
+        loaded = []
+        for row in rows:
+            address = row["address"]
+            if address in self.monitored_addresses:
+                continue
+            metadata = json_codec.loads(row["metadata"]) if row.get("metadata") else {}
+            if row.get("description") and "description" not in metadata:
+                metadata["description"] = row["description"]
+            self._store_address(
+                address,
+                added_at=_parse_timestamp(row.get("added_at")),
+                suspicious_count=row.get("suspicious_count") or 0,
+                last_checked=_parse_timestamp(row.get("last_checked")),
+                metadata=metadata,
+                autocomplete=False
+            )
+            loaded.append(address)
+        self.address_index.add_many(loaded)
+    
+    def _store_address(self, address: str, added_at: float, suspicious_count: int, last_checked: float,
+                       metadata: Dict[str, Any], autocomplete: bool = True) -> None:
+        """Create or replace the in-memory record for an address and index it."""
+        if address in self.monitored_addresses:
+            self._unindex_address(address)
+            self.monitored_addresses.discard(address)
+        self.monitored_addresses.add(address, added_at, suspicious_count, last_checked, metadata)
+        self._index_address(address, autocomplete=autocomplete)
     
     async def _on_start(self) -> None:
         """Start monitoring honeypot activities."""
         logger.info("Starting honeypot monitoring...")
         self.monitoring_task = asyncio.create_task(self._monitoring_loop())
+        if self.db:
+            self.flush_task = asyncio.create_task(self._flush_loop())
     
     async def _on_stop(self) -> None:
         """Stop monitoring honeypot activities."""
@@ -39,6 +119,63 @@ class HoneypotService(BaseService):
                 await self.monitoring_task
             except asyncio.CancelledError:
                 pass
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+        # Persist whatever is still buffered
+        await self._flush_activity()
+    
+    async def _flush_loop(self) -> None:
+        """Periodically persist buffered reports and suspicious counts."""
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._flush_requested.wait(), timeout=ACTIVITY_FLUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_requested.clear()
+                await self._flush_activity()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error flushing activity to the database: {e}")
+                await asyncio.sleep(ACTIVITY_FLUSH_INTERVAL)
+    
+    async def flush(self) -> None:
+        """Persist buffered reports and counts now, e.g. before recording an ingestion checkpoint.
+        
+        Raises if the database write fails, so callers don't record progress
+        past reports that were not stored.
+        """
+        await self._flush_activity()
+    
+    async def _flush_activity(self) -> None:
+        """Write buffered activity logs and count updates in one batch each.
+        
+        On a failed write the rows go back into the buffers, ahead of anything
+        buffered meanwhile, and RuntimeError is raised; the next flush retries.
+        """
+        if not self.db or not (self._activity_buffer or self._dirty_counts):
+            return
+        # Serialize flushes so batch reporters waiting on one never race the flush loop
+        async with self._flush_lock:
+            activities, self._activity_buffer = self._activity_buffer, []
+            counts, self._dirty_counts = self._dirty_counts, {}
+            if activities and not await self._run_blocking(self.db.log_activities, activities):
+                self._activity_buffer[:0] = activities
+                self._restore_counts(counts)
+                raise RuntimeError(f"Could not save {len(activities)} buffered report(s); kept for the next flush")
+            if counts and not await self._run_blocking(self.db.update_suspicious_counts, list(counts.items())):
+                self._restore_counts(counts)
+                raise RuntimeError(f"Could not save {len(counts)} suspicious count(s); kept for the next flush")
+    
+    def _restore_counts(self, counts: Dict[str, int]) -> None:
+        """Put unsaved counts back, keeping any newer value buffered since."""
+        for address, count in counts.items():
+            self._dirty_counts.setdefault(address, count)
     
     async def _monitoring_loop(self) -> None:
         """Main monitoring loop."""
@@ -58,30 +195,77 @@ class HoneypotService(BaseService):
         # For now, this is a placeholder
         logger.debug("Checking honeypot activities...")
         
-        # Example: Check each monitored address
-        for address, data in self.monitored_addresses.items():
-            # Simulate checking for suspicious activity
-            suspicious_count = data.get("suspicious_count", 0)
-            if suspicious_count >= self.alert_threshold:
-                await self._trigger_alert(address, data)
+        # Only addresses at or above the threshold are visited, found through the count index
+        for _, address_id in self._count_index.at_least((self.alert_threshold, 0)):
+            address = self.monitored_addresses.address_for(address_id)
+            if address is None:
+                continue  # Removed while an earlier alert was being sent
+            await self._trigger_alert(address, self.monitored_addresses[address])
     
-    async def _trigger_alert(self, address: str, data: Dict[str, Any]) -> None:
+    async def _trigger_alert(self, address: str, data: AddressRecord) -> None:
         """Trigger an alert for suspicious activity."""
         logger.warning(f"Alert triggered for address {address}: {data}")
+        notification_service = self.bot.services.get("notification")
+        if notification_service and notification_service.ready:
+            fields = []
+            location = self.describe_location(address)
+            if location:
+                fields.append({"name": "Location", "value": location, "inline": True})
+            await notification_service.send_alert(
+                "Suspicious Activity Threshold Reached",
+                f"`{address}` has {data.suspicious_count} suspicious report(s).",
+                severity="warning",
+                fields=fields
+            )
         
         # Reset the suspicious count after alert
-        self.monitored_addresses[address]["suspicious_count"] = 0
-        self.monitored_addresses[address]["last_alert"] = datetime.now()
+        self._set_suspicious_count(address, 0)
+        data.last_alert = datetime.now().timestamp()
+    
+    def describe_location(self, address: str) -> Optional[str]:
+        """Country and ASN of an address from the GeoIP service, if one is running."""
+        geoip_service = self.bot.services.get("geoip")
+        if geoip_service and geoip_service.ready:
+            return geoip_service.describe(address)
+        return None
+    
+    def _set_suspicious_count(self, address: str, count: int) -> None:
+        """Update an address's suspicious count, keeping the count index in sync."""
+        data = self.monitored_addresses[address]
+        self._count_index.remove((data.suspicious_count, data.id))
+        data.suspicious_count = count
+        self._count_index.add((count, data.id))
+        if self.db:
+            self._dirty_counts[address] = count
+    
+    def _index_address(self, address: str, autocomplete: bool = True) -> None:
+        """Add an address to the listing indexes."""
+        data = self.monitored_addresses[address]
+        self._recent_index.add((data.added_at, data.id))
+        self._count_index.add((data.suspicious_count, data.id))
+        if autocomplete:
+            self.address_index.add(address)
+    
+    def _unindex_address(self, address: str) -> None:
+        """Remove an address from the listing indexes."""
+        data = self.monitored_addresses[address]
+        self._recent_index.remove((data.added_at, data.id))
+        self._count_index.remove((data.suspicious_count, data.id))
+        self.address_index.remove(address)
     
     async def add_monitored_address(self, address: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
-        """Add an address to monitor."""
+        """Add an address to monitor, in the same canonical form imports use."""
         try:
-            self.monitored_addresses[address] = {
-                "added_at": datetime.now(),
-                "suspicious_count": 0,
-                "last_checked": datetime.now(),
-                "metadata": metadata or {}
-            }
+            normalized = normalize_address(address)
+            if normalized is None:
+                logger.warning(f"Not monitoring invalid address {address!r}")
+                return False
+            address = normalized
+            metadata = metadata or {}
+            now = datetime.now().timestamp()
+            self._store_address(address, added_at=now, suspicious_count=0, last_checked=now, metadata=metadata)
+            if self.db:
+                await self._run_blocking(self.db.add_monitored_address, address, metadata.get("description"), metadata)
             logger.info(f"Added address to monitoring: {address}")
             return True
         except Exception as e:
@@ -91,8 +275,12 @@ class HoneypotService(BaseService):
     async def remove_monitored_address(self, address: str) -> bool:
         """Remove an address from monitoring."""
         try:
+            address = normalize_address(address) or address
             if address in self.monitored_addresses:
-                del self.monitored_addresses[address]
+                self._unindex_address(address)
+                self.monitored_addresses.discard(address)
+                if self.db:
+                    await self._run_blocking(self.db.remove_monitored_address, address)
                 logger.info(f"Removed address from monitoring: {address}")
                 return True
             return False
@@ -100,25 +288,264 @@ class HoneypotService(BaseService):
             logger.error(f"Failed to remove monitored address {address}: {e}")
             return False
     
-    async def get_monitored_addresses(self) -> List[Dict[str, Any]]:
-        """Get all monitored addresses."""
-        return [
-            {
-                "address": address,
-                **data
-            }
-            for address, data in self.monitored_addresses.items()
-        ]
+    async def get_monitored_addresses(self) -> ItemsView[str, AddressRecord]:
+        """Get a live ``(address, record)`` view of all monitored addresses, without copying them."""
+        return self.monitored_addresses.items()
+    
+    async def get_monitored_addresses_page(self, limit: int = 10, cursor: Optional[Cursor] = None,
+                                           direction: str = "next", min_suspicious: int = 0,
+                                           sort: str = "recent") -> Dict[str, Any]:
+        """Get one page of monitored addresses, newest (or most suspicious) first.
+        
+        Cursors are ``(added_at timestamp, id)`` for ``sort="recent"`` and
+        ``(suspicious_count, id)`` for ``sort="count"``. A recent-first listing
+        filtered by ``min_suspicious`` walks the recent index skipping the
+        rest, for at most as many keys as sorting the matches would cost; if
+        the matches are too sparse for that, the matching keys (taken from the
+        count index) are sorted by recency instead. Either way a page costs
+        O(page size + matches), never a scan of every address.
+        """
+        if sort == "count":
+            page = self._count_index.page(limit, cursor, direction, floor=(min_suspicious, 0))
+        elif min_suspicious > 0:
+            floor = (min_suspicious, 0)
+            
+            def above_minimum(key: Cursor) -> bool:
+                address = self.monitored_addresses.address_for(key[1])
+                return self.monitored_addresses[address].suspicious_count >= min_suspicious
+            
+            budget = limit + 1 + self._count_index.count_at_least(floor)
+            page = self._recent_index.page(limit, cursor, direction, predicate=above_minimum, max_visited=budget)
+            if page is None:
+                recent = KeysetIndex([
+                    (self.monitored_addresses[self.monitored_addresses.address_for(address_id)].added_at, address_id)
+                    for _, address_id in self._count_index.at_least(floor)
+                ])
+                page = recent.page(limit, cursor, direction)
+        else:
+            page = self._recent_index.page(limit, cursor, direction)
+        
+        items = []
+        for _, address_id in page["items"]:
+            address = self.monitored_addresses.address_for(address_id)
+            items.append(self.monitored_addresses[address].as_dict(address))
+        page["items"] = items
+        page["total"] = len(self.monitored_addresses)
+        return page
+    
+    async def import_addresses(self, chunks: AsyncIterator[bytes], filename: str,
+                               progress: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None) -> Dict[str, int]:
+        """Stream-import addresses from a newline, CSV or JSON feed.
+        
+        Entries are parsed chunk by chunk, then normalized and written to the
+        database in ``IMPORT_BATCH_SIZE`` transactions on a worker thread.
+        ``progress`` is awaited with running totals after every batch. If the
+        database fails to save a batch the import stops with an error; the
+        batches saved before it stay imported.
+        """
+        stats = {"read": 0, "imported": 0, "duplicates": 0, "invalid": 0}
+        imported: List[str] = []
+        pending: List[Optional[FeedEntry]] = []
+        in_flight: Optional[asyncio.Future] = None
+        
+        def mirror(entries: List[FeedEntry], invalid: int) -> None:
+            """Add a batch the database has committed to memory."""
+            stats["invalid"] += invalid
+            now = datetime.now().timestamp()
+            for address, description in entries:
+                if address in self.monitored_addresses:
+                    stats["duplicates"] += 1
+                    continue
+                metadata = {"description": description} if description else {}
+                self._store_address(address, added_at=now, suspicious_count=0, last_checked=now,
+                                    metadata=metadata, autocomplete=False)
+                imported.append(address)
+            stats["imported"] = len(imported)
+        
+        async def finish(batch: asyncio.Future) -> None:
+            mirror(*await batch)
+            if progress:
+                try:
+                    await progress(dict(stats))
+                except Exception as e:
+                    logger.warning(f"Failed to report import progress for {filename}: {e}")
+        
+        try:
+            # One batch is written on the worker thread while the next one is parsed here
+            async for batch in parse_address_feed(chunks, filename):
+                stats["read"] += len(batch)
+                pending.extend(batch)
+                if len(pending) >= IMPORT_BATCH_SIZE:
+                    if in_flight:
+                        writing, in_flight = in_flight, None
+                        await finish(writing)
+                    in_flight = asyncio.ensure_future(self._run_blocking(self._normalize_and_store, pending))
+                    pending = []
+            if in_flight:
+                writing, in_flight = in_flight, None
+                await finish(writing)
+            if pending:
+                await finish(asyncio.ensure_future(self._run_blocking(self._normalize_and_store, pending)))
+        finally:
+            if in_flight:
+                # The import stopped while a batch was being written; keep memory in step with what it committed
+                try:
+                    mirror(*await in_flight)
+                except Exception as e:
+                    logger.error(f"Batch being written when the import of {filename} stopped failed: {e}")
+            self.address_index.add_many(imported)
+        
+        logger.info(f"Imported {stats['imported']} addresses from {filename} ({stats['invalid']} invalid, {stats['duplicates']} duplicates)")
+        return stats
+    
+    def _normalize_and_store(self, entries: List[Optional[FeedEntry]]) -> Tuple[List[FeedEntry], int]:
+        """Validate a batch of feed entries and persist the valid ones. Runs on a worker thread."""
+        valid: Dict[str, Optional[str]] = {}
+        invalid = 0
+        for entry in entries:
+            address = normalize_address(entry[0]) if entry else None
+            if address is None:
+                invalid += 1
+            elif address not in valid or entry[1]:
+                valid[address] = entry[1]
+        normalized = list(valid.items())
+        if self.db and normalized and not self.db.add_monitored_addresses_batch(normalized):
+            raise RuntimeError(f"Could not save a batch of {len(normalized)} addresses to the database")
+        return normalized, invalid
+    
+    async def export_addresses(self, path: Path) -> int:
+        """Write the active set to ``path`` as gzip-compressed CSV. Returns the row count.
+        
+        Rows are streamed from the database in batches, so the export never holds
+        the whole table in memory.
+        """
+        snapshot = None
+        if not self.db:
+            snapshot = [
+                (address, data.metadata.get("description"), data.added_at, data.suspicious_count, data.last_checked)
+                for address, data in self.monitored_addresses.items()
+            ]
+        return await self._run_blocking(self._write_export, path, snapshot)
+    
+    def _write_export(self, path: Path, snapshot: Optional[List[Tuple]]) -> int:
+        """Write export rows to a gzip CSV file. Runs on a worker thread."""
+        if snapshot is not None:
+            batches: Iterable[List[Tuple]] = [[
+                (address, description, datetime.fromtimestamp(added_at), count, datetime.fromtimestamp(last_checked))
+                for address, description, added_at, count, last_checked in snapshot
+            ]]
+        else:
+            batches = self.db.iter_monitored_address_batches(EXPORT_COLUMNS)
+        count = 0
+        with gzip.open(path, "wt", newline="", encoding="utf-8", compresslevel=6) as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_COLUMNS)
+            for rows in batches:
+                writer.writerows(rows)
+                count += len(rows)
+        return count
+    
+    async def suggest_addresses(self, prefix: str, limit: int = 25) -> List[str]:
+        """Suggest monitored addresses starting with ``prefix``, most recently active first."""
+        def last_activity(address: str) -> float:
+            return self.monitored_addresses[address].last_checked
+        
+        return self.address_index.search(prefix.strip(), limit=limit, score=last_activity)
+    
+    async def search_activity(self, query: str, limit: int = 10, cursor: Optional[Cursor] = None,
+                              direction: str = "next", address: Optional[str] = None) -> Dict[str, Any]:
+        """Get one page of reported activity matching a free-text query, best matches first."""
+        if not self.db:
+            return {"items": [], "next_cursor": None, "prev_cursor": None}
+        return await self._run_blocking(self.db.search_activity_logs, query, limit, cursor, direction, address)
+    
+    async def count_activity_matches(self, query: str, address: Optional[str] = None) -> int:
+        """Count reported activity matching a free-text query."""
+        if not self.db:
+            return 0
+        return await self._run_blocking(self.db.count_activity_matches, query, address)
+    
+    def add_report_listener(self, listener: Callable[[str, Dict[str, Any], datetime], None]) -> None:
+        """Register a cheap synchronous callback invoked for every accepted report."""
+        self._report_listeners.append(listener)
+    
+    def remove_report_listener(self, listener: Callable[[str, Dict[str, Any], datetime], None]) -> None:
+        """Unregister a report callback."""
+        if listener in self._report_listeners:
+            self._report_listeners.remove(listener)
+    
+    def _record_report(self, address: str, activity_data: Dict[str, Any], now: datetime) -> bool:
+        """Count, buffer and announce one report. Returns False if the address is not monitored.
+        
+        A repeat of a recent report is accepted but otherwise ignored.
+        """
+        data = self.monitored_addresses.get(address)
+        if data is None:
+            return False
+        if self.deduplicator and self.deduplicator.check_and_add(
+                report_key(address, activity_data.get("reported_by"), activity_data)):
+            self.duplicate_reports += 1
+            return True
+        self._set_suspicious_count(address, data.suspicious_count + 1)
+        data.last_checked = now.timestamp()
+        if self.db:
+            self._activity_buffer.append(
+                (address, "suspicious_activity", activity_data, activity_data.get("reported_by"), now.isoformat())
+            )
+            if len(self._activity_buffer) >= ACTIVITY_FLUSH_SIZE:
+                self._flush_requested.set()
+        for listener in self._report_listeners:
+            try:
+                listener(address, activity_data, now)
+            except Exception as e:
+                logger.error(f"Report listener failed for {address}: {e}")
+        return True
     
     async def report_suspicious_activity(self, address: str, activity_data: Dict[str, Any]) -> bool:
         """Report suspicious activity for an address."""
         try:
-            if address in self.monitored_addresses:
-                self.monitored_addresses[address]["suspicious_count"] += 1
-                self.monitored_addresses[address]["last_checked"] = datetime.now()
+            # Reports without a sensor source came in through a bot command
+            activity_data = {"source": INTERACTIVE_SOURCE, **activity_data}
+            address = normalize_address(address) or address
+            if self._record_report(address, activity_data, datetime.now()):
                 logger.info(f"Reported suspicious activity for {address}")
                 return True
             return False
         except Exception as e:
             logger.error(f"Failed to report suspicious activity for {address}: {e}")
             return False
+
+    async def report_activities(self, reports: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Report a batch of ``(address, activity_data)`` pairs, e.g. from sensor ingestion.
+        
+        Reports for unmonitored addresses are skipped. When the write-behind
+        buffer is far behind, this waits for a flush, so ingestion slows down
+        to the database's pace instead of growing the buffer without bound.
+        Returns the number of reports accepted.
+        """
+        now = datetime.now()
+        accepted = 0
+        for address, activity_data in reports:
+            try:
+                accepted += self._record_report(address, activity_data, now)
+            except Exception as e:
+                logger.error(f"Failed to report suspicious activity for {address}: {e}")
+        if accepted:
+            logger.debug(f"Reported {accepted} of {len(reports)} sensor events")
+        if len(self._activity_buffer) >= ACTIVITY_BUFFER_LIMIT:
+            try:
+                await self._flush_activity()
+            except RuntimeError as e:
+                logger.error(f"Error flushing activity to the database: {e}")
+        return accepted
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status.update({
+            "monitored_addresses": len(self.monitored_addresses),
+            "address_store": self.monitored_addresses.get_status(),
+            "duplicate_reports": self.duplicate_reports,
+            "dedup": self.deduplicator.get_status() if self.deduplicator else {"mode": "off"}
+        })
+        return status
@@ -0,0 +1,226 @@
+"""
+Shared pipeline for ingesting honeypot sensor events from external sources.
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from utils import json_codec
+from utils.addresses import ADDRESS_FIELDS, normalize_address
+from utils.logger import logger
+
+SensorReport = Tuple[str, Dict[str, Any]]  # (address, activity_data) as accepted by HoneypotService
+RawPayload = Tuple[str, bytes]  # (source, undecoded payload)
+EventBatch = Tuple[str, List[Any]]  # (source, already decoded events)
+Decoder = Callable[[List[Any]], Tuple[List[SensorReport], int]]
+Offload = Callable[..., Awaitable[Any]]  # e.g. BaseService._run_blocking or _run_cpu
+
+# Keys treated as the event description, in order of preference (Cowrie uses eventid/message)
+ACTIVITY_FIELDS = ("activity", "message", "eventid", "event", "type")
+# Extra sensor fields worth keeping in the activity log
+EVENT_FIELDS = ("eventid", "sensor", "session", "protocol", "dst_ip", "dst_port", "username", "input")
+EXECUTOR_THRESHOLD = 256 * 1024  # Payload bytes per batch above which decoding moves to a worker thread
+
+
+def normalize_event(event: Any, source: str) -> Optional[SensorReport]:
+    """Turn one decoded sensor event into an ``(address, activity_data)`` report, or None if unusable."""
+    if not isinstance(event, dict):
+        return None
+    # Plain loops rather than next(generator): this runs for every ingested event
+    raw_address = None
+    for key in ADDRESS_FIELDS:
+        raw_address = event.get(key)
+        if raw_address:
+            break
+    address = normalize_address(raw_address) if isinstance(raw_address, str) else None
+    if not address:
+        return None
+    
+    activity = None
+    for key in ACTIVITY_FIELDS:
+        activity = event.get(key)
+        if activity:
+            break
+    activity_data = {
+        "activity": str(activity or "sensor event"),
+        "reported_by": str(event.get("sensor") or source),
+        "source": source,
+        "timestamp": str(event.get("timestamp") or datetime.now().isoformat())
+    }
+    for key in EVENT_FIELDS:
+        value = event.get(key)
+        if value is not None and key not in activity_data:
+            activity_data[key] = value
+    return address, activity_data
+
+
+def decode_events(data: bytes) -> List[Any]:
+    """Decode a payload holding one JSON event, a JSON array of events or NDJSON lines."""
+    data = data.strip()
+    if not data:
+        return []
+    if data[:1] == b"[":
+        return json_codec.loads(data)
+    try:
+        return [json_codec.loads(data)]
+    except ValueError:
+        if b"\n" not in data:
+            raise
+    return [json_codec.loads(line) for line in data.splitlines() if line.strip()]
+
+
+def parse_event_lines(lines: List[bytes], source: str) -> Tuple[List[SensorReport], int]:
+    """Parse one JSON event per line, skipping blank lines. Returns the reports and the invalid line count."""
+    reports: List[SensorReport] = []
+    invalid = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            report = normalize_event(json_codec.loads(line), source)
+        except ValueError:
+            report = None
+        if report is None:
+            invalid += 1
+        else:
+            reports.append(report)
+    return reports, invalid
+
+
+def decode_payloads(payloads: List[RawPayload]) -> Tuple[List[SensorReport], int]:
+    """Decode and normalize a batch of raw payloads. Returns the reports and the invalid event count."""
+    reports: List[SensorReport] = []
+    invalid = 0
+    for source, data in payloads:
+        try:
+            events = decode_events(data)
+        except ValueError:
+            invalid += 1
+            continue
+        for event in events:
+            report = normalize_event(event, source)
+            if report is None:
+                invalid += 1
+            else:
+                reports.append(report)
+    return reports, invalid
+
+
+def normalize_batches(batches: List[EventBatch]) -> Tuple[List[SensorReport], int]:
+    """Normalize batches of already decoded events. Returns the reports and the invalid event count."""
+    reports: List[SensorReport] = []
+    invalid = 0
+    for source, events in batches:
+        for event in events:
+            report = normalize_event(event, source)
+            if report is None:
+                invalid += 1
+            else:
+                reports.append(report)
+    return reports, invalid
+
+
+class IngestionPipeline:
+    """Bounded queue between an event source and a batch sink.
+    
+    Producers either ``put`` (waiting while the queue is full, which pushes
+    back on the source) or ``offer`` (failing fast so the caller can shed load).
+    A single consumer drains up to ``batch_size`` items at a time, decodes them
+    (on a worker thread for large batches) and hands the reports to ``sink``.
+    Items are tuples whose last element is sized: payload bytes for
+    ``RawPayload`` or events for ``EventBatch``, compared against
+    ``executor_threshold`` to decide where decoding runs: ``offload`` when
+    given (the owning service's thread or process pool), else the loop's
+    default executor.
+    """
+    
+    def __init__(self, sink: Callable[[List[SensorReport]], Awaitable[int]], decode: Decoder = decode_payloads,
+                 queue_size: int = 10000, batch_size: int = 500, name: str = "ingestion",
+                 executor_threshold: int = EXECUTOR_THRESHOLD, offload: Optional[Offload] = None):
+        self.sink = sink
+        self.decode = decode
+        self.executor_threshold = executor_threshold
+        self.offload = offload
+        self.batch_size = batch_size
+        self.name = name
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {"received": 0, "rejected": 0, "reported": 0, "unmonitored": 0, "invalid": 0, "batches": 0}
+    
+    @property
+    def backlog(self) -> int:
+        """Items waiting in the queue."""
+        return self.queue.qsize()
+    
+    async def put(self, item: Any) -> None:
+        """Queue an item, waiting for space if the queue is full."""
+        await self.queue.put(item)
+        self.stats["received"] += 1
+    
+    def offer(self, item: Any) -> bool:
+        """Queue an item if there is space. Returns False (and counts a rejection) when full."""
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            return False
+        self.stats["received"] += 1
+        return True
+    
+    def start(self) -> None:
+        """Start the consumer task."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._consume())
+    
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """Give queued items a chance to drain, then stop the consumer."""
+        if self.task is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.name}: stopping with {self.backlog} item(s) still queued")
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+    
+    async def _consume(self) -> None:
+        """Drain the queue in batches until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                if sum(len(item[-1]) for item in batch) >= self.executor_threshold:
+                    if self.offload is not None:
+                        reports, invalid = await self.offload(self.decode, batch)
+                    else:
+                        reports, invalid = await loop.run_in_executor(None, self.decode, batch)
+                else:
+                    reports, invalid = self.decode(batch)
+                self.stats["invalid"] += invalid
+                # One payload can hold many events; feed the sink in slices and yield in between
+                for i in range(0, len(reports), self.batch_size):
+                    chunk = reports[i:i + self.batch_size]
+                    reported = await self.sink(chunk)
+                    self.stats["reported"] += reported
+                    self.stats["unmonitored"] += len(chunk) - reported
+                    await asyncio.sleep(0)
+                self.stats["batches"] += 1
+            except Exception as e:
+                logger.error(f"{self.name}: failed to process a batch of {len(batch)} item(s): {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+            await asyncio.sleep(0)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get queue depth and counters."""
+        return {"backlog": self.backlog, **self.stats}
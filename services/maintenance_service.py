@@ -0,0 +1,110 @@
+"""
+Service for background database maintenance.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from config import config
+from services.base_service import BaseService
+from utils.logger import logger
+
+BATCH_PAUSE = 0.05  # Seconds to yield between batches so writers and the event loop get a turn
+
+
+class MaintenanceService(BaseService):
+    """Service that compacts old activity logs into rollups and enforces retention."""
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.db = getattr(bot, "db", None)
+        self.interval = config.COMPACTION_INTERVAL_SECONDS
+        self.batch_size = config.COMPACTION_BATCH_SIZE
+        self.maintenance_task: Optional[asyncio.Task] = None
+        self.last_run: Optional[datetime] = None
+        self.totals = {"compacted": 0, "pruned_hourly": 0, "search_indexed": 0, "search_pruned": 0}
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the maintenance service."""
+        logger.info("Initializing MaintenanceService...")
+        if not self.db:
+            raise RuntimeError("No database configured")
+    
+    async def _on_start(self) -> None:
+        """Start the maintenance loop."""
+        logger.info("Starting database maintenance...")
+        self.maintenance_task = asyncio.create_task(self._maintenance_loop())
+    
+    async def _on_stop(self) -> None:
+        """Stop the maintenance loop."""
+        logger.info("Stopping database maintenance...")
+        if self.maintenance_task:
+            self.maintenance_task.cancel()
+            try:
+                await self.maintenance_task
+            except asyncio.CancelledError:
+                pass
+    
+    async def _maintenance_loop(self) -> None:
+        """Run maintenance every ``interval`` seconds."""
+        while True:
+            try:
+                await self.run_maintenance()
+                await asyncio.sleep(self.interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in maintenance loop: {e}")
+                await asyncio.sleep(self.interval)
+    
+    async def _run_batches(self, func: Callable[..., int], *args: Any) -> int:
+        """Call a batched maintenance step until it has nothing left to do."""
+        total = 0
+        while True:
+            done = await self._run_blocking(func, *args)
+            total += done
+            if done < self.batch_size:
+                return total
+            await asyncio.sleep(BATCH_PAUSE)
+    
+    async def run_maintenance(self) -> Dict[str, int]:
+        """Compact raw activity past its retention and prune expired rollups and search rows."""
+        now = datetime.now()
+        raw_cutoff = (now - timedelta(hours=config.ACTIVITY_RAW_RETENTION_HOURS)).isoformat()
+        # Hourly rollups are pruned on whole days so they never partially overlap daily rollups
+        hourly_cutoff = (now - timedelta(days=config.ACTIVITY_HOURLY_RETENTION_DAYS)).strftime("%Y-%m-%d")
+        
+        # Backfill before compacting so pre-existing raw rows are indexed before they are deleted
+        indexed = await self._run_batches(self.db.backfill_search_index, self.batch_size)
+        compacted = await self._run_batches(
+            self.db.compact_activity_logs, raw_cutoff, self.batch_size, config.ACTIVITY_ARCHIVE_RAW
+        )
+        pruned = await self._run_batches(self.db.prune_hourly_rollups, hourly_cutoff, self.batch_size)
+        search_pruned = 0
+        if config.SEARCH_RETENTION_DAYS > 0:
+            search_cutoff = (now - timedelta(days=config.SEARCH_RETENTION_DAYS)).isoformat()
+            search_pruned = await self._run_batches(self.db.prune_search_index, search_cutoff, self.batch_size)
+        
+        results = {
+            "compacted": compacted,
+            "pruned_hourly": pruned,
+            "search_indexed": indexed,
+            "search_pruned": search_pruned
+        }
+        for key, value in results.items():
+            self.totals[key] += value
+        self.last_run = now
+        if compacted or pruned:
+            logger.info(f"Compacted {compacted} activity logs into rollups, pruned {pruned} hourly rollups")
+        if indexed or search_pruned:
+            logger.info(f"Backfilled {indexed} activity logs into the search index, pruned {search_pruned}")
+        return results
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status.update({
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            **self.totals
+        })
+        return status
@@ -0,0 +1,133 @@
+"""
+Service for ingesting honeypot sensor events from an MQTT broker.
+"""
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+from config import config
+from services.base_service import BaseService
+from services.ingestion import IngestionPipeline
+from utils.logger import logger
+
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+
+
+def _message_stream(client: Any, queue_maxsize: int) -> Any:
+    """Open the client's message stream, across asyncio-mqtt API versions."""
+    messages = getattr(client, "messages", None)
+    if callable(messages):
+        try:
+            return messages(queue_maxsize=queue_maxsize)
+        except TypeError:
+            return messages()
+    # asyncio-mqtt < 0.16
+    return client.unfiltered_messages()
+
+
+def _topic_name(topic: Any) -> str:
+    """Return a message topic as a string (newer clients wrap it in a Topic object)."""
+    return str(getattr(topic, "value", topic))
+
+
+class MqttIngestionService(BaseService):
+    """Service that subscribes to sensor topics and reports their events to HoneypotService.
+    
+    Each message may carry one JSON event, a JSON array or NDJSON lines; the
+    topic becomes the event's ``source``. Messages pass through a bounded
+    ``IngestionPipeline``: when reporting falls behind, the reader stops pulling
+    from the client, whose own bounded queue then sheds the overflow.
+    """
+    
+    dependencies = ("honeypot",)
+    
+    def __init__(self, bot, client_factory: Optional[Callable[[], Any]] = None):
+        super().__init__(bot)
+        # Injectable so tests and benchmarks can run against a broker stand-in
+        self.client_factory = client_factory or self._create_client
+        self.topics: List[str] = config.MQTT_TOPICS
+        self.listen_task: Optional[asyncio.Task] = None
+        self.connected = False
+        self.reconnects = 0
+        self.pipeline: Optional[IngestionPipeline] = None
+    
+    def _create_client(self) -> Any:
+        """Create an asyncio-mqtt client from the configured broker settings."""
+        # Imported here so paho-mqtt is only loaded when MQTT ingestion is enabled
+        from asyncio_mqtt import Client
+        
+        return Client(
+            hostname=config.MQTT_HOST,
+            port=config.MQTT_PORT,
+            username=config.MQTT_USERNAME,
+            password=config.MQTT_PASSWORD,
+            client_id=config.MQTT_CLIENT_ID
+        )
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the MQTT ingestion service."""
+        logger.info("Initializing MqttIngestionService...")
+        if not self.topics:
+            raise RuntimeError("No MQTT topics configured")
+    
+    async def _on_start(self) -> None:
+        """Start the ingestion pipeline and the broker connection loop."""
+        logger.info("Starting MQTT ingestion...")
+        honeypot_service = self.bot.services["honeypot"]
+        self.pipeline = IngestionPipeline(
+            honeypot_service.report_activities,
+            queue_size=config.INGEST_QUEUE_SIZE,
+            batch_size=config.INGEST_BATCH_SIZE,
+            name="mqtt",
+            offload=self._run_cpu  # Raw payloads are cheap to pickle; JSON decoding holds the GIL
+        )
+        self.pipeline.start()
+        self.listen_task = asyncio.create_task(self._listen_loop())
+    
+    async def _on_stop(self) -> None:
+        """Disconnect from the broker and drain the pipeline."""
+        logger.info("Stopping MQTT ingestion...")
+        if self.listen_task:
+            self.listen_task.cancel()
+            try:
+                await self.listen_task
+            except asyncio.CancelledError:
+                pass
+        if self.pipeline:
+            await self.pipeline.stop()
+    
+    async def _listen_loop(self) -> None:
+        """Stay subscribed, reconnecting with exponential backoff."""
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                async with self.client_factory() as client:
+                    async with _message_stream(client, config.INGEST_QUEUE_SIZE) as messages:
+                        for topic in self.topics:
+                            await client.subscribe(topic, qos=config.MQTT_QOS)
+                        self.connected = True
+                        delay = RECONNECT_MIN_DELAY
+                        logger.info(f"Subscribed to MQTT topics: {', '.join(self.topics)}")
+                        async for message in messages:
+                            await self.pipeline.put((_topic_name(message.topic), message.payload))
+                logger.warning("MQTT message stream ended")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"MQTT connection failed: {e}")
+            finally:
+                self.connected = False
+            self.reconnects += 1
+            logger.info(f"Reconnecting to MQTT broker in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status.update({
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            **(self.pipeline.get_status() if self.pipeline else {})
+        })
+        return status
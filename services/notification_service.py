@@ -6,6 +6,7 @@ from typing import Dict
 
 from discord import Color, Embed
 
+from config import config
 from services.base_service import BaseService
 from utils.logger import logger
 
@@ -22,8 +23,8 @@ class NotificationService(BaseService):
         """Initialize the notification service."""
         logger.info("Initializing NotificationService...")
         # Load notification channels and roles from config
-        # This is where you'd load persistent configuration
-        pass
+        if config.ALERT_CHANNEL_ID:
+            self.notification_channels["alerts"] = config.ALERT_CHANNEL_ID
     
     async def _on_start(self) -> None:
         """Start the notification service."""
@@ -0,0 +1,145 @@
+"""
+Service that degrades message handling gracefully when the bot is overloaded.
+"""
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from config import config
+from services.base_service import BaseService
+from utils.logger import logger
+from utils.overload import LEVEL_NAMES, NORMAL, OverloadController, parse_thresholds
+
+CHECK_INTERVAL = 0.25  # Seconds between load checks; the sleep's overshoot is the loop lag
+MAX_DEFERRED = 1000  # Deferred jobs (purges) kept while overloaded; the oldest are dropped beyond this
+
+
+class OverloadService(BaseService):
+    """Service that watches handler backlog and loop lag and sets the degradation level.
+    
+    ``on_message`` counts itself in ``in_flight`` and consults ``level``
+    to decide which work to skip (see ``utils.overload``). Work that can
+    wait, such as ban purges, goes to ``defer`` and runs once the level is
+    back to normal; a job dropped at ``MAX_DEFERRED`` or on shutdown is
+    logged with its description so it can be redone by hand. Every level
+    change is logged and counted.
+    """
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.controller: Optional[OverloadController] = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lag = 0.0
+        self.level_changes = 0
+        self.level_seconds: List[float] = [0.0] * len(LEVEL_NAMES)
+        self.deferred: Deque[Tuple[str, Callable[[], Awaitable[Any]]]] = deque()
+        self.dropped_deferred = 0
+        self.monitor_task: Optional[asyncio.Task] = None
+        self.drain_task: Optional[asyncio.Task] = None
+    
+    @property
+    def level(self) -> int:
+        """Current degradation level."""
+        return self.controller.level if self.controller else NORMAL
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the overload controller."""
+        logger.info("Initializing OverloadService...")
+        lag_thresholds = [ms / 1000 for ms in parse_thresholds(config.OVERLOAD_LAG_MS)]
+        self.controller = OverloadController(
+            parse_thresholds(config.OVERLOAD_IN_FLIGHT), lag_thresholds, config.OVERLOAD_COOLDOWN
+        )
+    
+    async def _on_start(self) -> None:
+        """Start watching load."""
+        logger.info("Starting overload controller...")
+        self.monitor_task = asyncio.create_task(self._monitor_loop())
+    
+    async def _on_stop(self) -> None:
+        """Stop watching load and drop any deferred work."""
+        logger.info("Stopping overload controller...")
+        for task in (self.monitor_task, self.drain_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        if self.deferred:
+            logger.warning(f"Dropping {len(self.deferred)} deferred job(s) on shutdown")
+            while self.deferred:
+                self._drop_deferred()
+    
+    async def _monitor_loop(self) -> None:
+        """Measure loop lag and backlog every ``CHECK_INTERVAL`` and update the level."""
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        while True:
+            try:
+                await asyncio.sleep(CHECK_INTERVAL)
+                now = loop.time()
+                self.lag = max(0.0, now - last - CHECK_INTERVAL)
+                self.level_seconds[self.level] += now - last
+                last = now
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                
+                previous = self.level
+                changed = self.controller.update(self.in_flight, self.lag, now)
+                if changed is not None:
+                    self._log_change(previous, changed)
+                if self.level == NORMAL and self.deferred and not (self.drain_task and not self.drain_task.done()):
+                    self.drain_task = asyncio.create_task(self._drain_deferred())
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in overload monitor: {e}")
+    
+    def _log_change(self, previous: int, level: int) -> None:
+        self.level_changes += 1
+        message = (f"Overload level {LEVEL_NAMES[previous]} -> {LEVEL_NAMES[level]} "
+                   f"({self.in_flight} handlers in flight, loop lag {self.lag * 1000:.0f} ms, "
+                   f"{len(self.deferred)} deferred)")
+        if level > previous:
+            logger.warning(message)
+        else:
+            logger.info(message)
+    
+    def defer(self, job: Callable[[], Awaitable[Any]], description: str) -> None:
+        """Queue ``job`` to run once the level is back to normal. ``description`` is logged if it is dropped."""
+        if len(self.deferred) >= MAX_DEFERRED:
+            self._drop_deferred()
+        self.deferred.append((description, job))
+    
+    def _drop_deferred(self) -> None:
+        """Drop the oldest deferred job, logging what it would have done."""
+        description, _ = self.deferred.popleft()
+        self.dropped_deferred += 1
+        logger.warning(f"Dropped deferred job, not run: {description}")
+    
+    async def _drain_deferred(self) -> None:
+        """Run deferred jobs one at a time, pausing as soon as load rises again."""
+        while self.deferred and self.level == NORMAL:
+            description, job = self.deferred.popleft()
+            try:
+                await job()
+            except Exception as e:
+                logger.error(f"Deferred {description} failed: {e}")
+        if not self.deferred:
+            logger.info("Finished deferred work from the last overload")
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status.update({
+            "level": self.level,
+            "level_name": LEVEL_NAMES[self.level],
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "loop_lag_ms": round(self.lag * 1000, 1),
+            "level_changes": self.level_changes,
+            "seconds_per_level": {name: round(seconds, 1) for name, seconds in zip(LEVEL_NAMES, self.level_seconds)},
+            "deferred": len(self.deferred),
+            "dropped_deferred": self.dropped_deferred
+        })
+        return status
@@ -0,0 +1,98 @@
+"""
+Concurrent, dependency-ordered lifecycle management for bot services.
+"""
+import asyncio
+from typing import Dict, List
+
+from services.base_service import BaseService
+from utils.logger import logger
+
+
+class ServiceManager:
+    """Starts and stops services concurrently in dependency order."""
+    
+    def __init__(self, services: Dict[str, BaseService]):
+        self.services = services
+    
+    def resolve_order(self) -> List[str]:
+        """Return service names in dependency order, raising ValueError on bad graphs."""
+        for name, service in self.services.items():
+            for dependency in service.dependencies:
+                if dependency not in self.services:
+                    raise ValueError(f"Service {name} depends on unknown service {dependency}")
+        
+        # Kahn's algorithm, keeping registration order among independent services
+        remaining = {name: set(service.dependencies) for name, service in self.services.items()}
+        order = []
+        while remaining:
+            batch = [name for name, deps in remaining.items() if not deps]
+            if not batch:
+                raise ValueError(f"Dependency cycle between services: {', '.join(sorted(remaining))}")
+            for name in batch:
+                del remaining[name]
+                order.append(name)
+            for deps in remaining.values():
+                deps.difference_update(batch)
+        return order
+    
+    async def start_all(self) -> Dict[str, bool]:
+        """Start every service, returning a mapping of service name to success."""
+        order = self.resolve_order()
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        # Each service waits only on its own dependencies, not on unrelated services
+        async def start_one(name: str) -> bool:
+            service = self.services[name]
+            if service.dependencies:
+                results = await asyncio.gather(*(tasks[dep] for dep in service.dependencies))
+                failed = [dep for dep, ok in zip(service.dependencies, results) if not ok]
+                if failed:
+                    logger.error(f"Not starting service {name}: dependencies failed ({', '.join(failed)})")
+                    return False
+            try:
+                return await service.start()
+            except Exception as e:
+                logger.error(f"Failed to start service {name}: {e}")
+                return False
+        
+        for name in order:
+            tasks[name] = asyncio.create_task(start_one(name))
+        
+        results = dict(zip(order, await asyncio.gather(*tasks.values())))
+        for name, ok in results.items():
+            if ok:
+                duration = self.services[name].startup_duration or 0.0
+                logger.info(f"Started service: {name} ({duration:.2f}s)")
+        return results
+    
+    async def stop_all(self) -> Dict[str, bool]:
+        """Stop every service in reverse dependency order."""
+        order = self.resolve_order()
+        dependents: Dict[str, List[str]] = {name: [] for name in order}
+        for name in order:
+            for dependency in self.services[name].dependencies:
+                dependents[dependency].append(name)
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        # A service stops only after everything that depends on it has stopped
+        async def stop_one(name: str) -> bool:
+            if dependents[name]:
+                await asyncio.gather(*(tasks[dep] for dep in dependents[name]))
+            try:
+                return await self.services[name].stop()
+            except Exception as e:
+                logger.error(f"Failed to stop service {name}: {e}")
+                return False
+        
+        for name in reversed(order):
+            tasks[name] = asyncio.create_task(stop_one(name))
+        
+        results = dict(zip(reversed(order), await asyncio.gather(*tasks.values())))
+        for name, ok in results.items():
+            if ok:
+                logger.info(f"Stopped service: {name}")
+        return results
+    
+    def get_status(self) -> Dict[str, Dict]:
+        """Get the status of every managed service."""
+        return {name: service.get_status() for name, service in self.services.items()}
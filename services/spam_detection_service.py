@@ -0,0 +1,81 @@
+"""
+Service for detecting the same text being spammed across channels.
+"""
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from config import config
+from services.base_service import BaseService
+from utils.logger import logger
+from utils.simhash import IndexedText, NearDuplicateIndex, SpreadMatch, find_spread, simhash, tokenize
+
+
+class SpamDetectionService(BaseService):
+    """Service that flags authors posting near-identical text in many channels.
+    
+    Each message of at least ``SPAM_MIN_TOKENS`` words is SimHashed and added
+    to a per-guild ``NearDuplicateIndex``; when one author's near-duplicates
+    reach ``SPAM_CHANNEL_THRESHOLD`` channels within ``SPAM_WINDOW_SECONDS``,
+    ``check`` returns the match so the bot can act on it. Everything runs
+    inline in ``on_message`` and costs microseconds per message.
+    """
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.indexes: Dict[int, NearDuplicateIndex] = {}
+        self.window_seconds = config.SPAM_WINDOW_SECONDS
+        self.min_channels = config.SPAM_CHANNEL_THRESHOLD
+        self.min_tokens = config.SPAM_MIN_TOKENS
+        # (guild_id, author_id) -> when last flagged, so one burst is acted on once
+        self._flagged: Dict[Tuple[int, int], float] = {}
+        self.stats = {"checked": 0, "flagged": 0}
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the spam detection service."""
+        logger.info("Initializing SpamDetectionService...")
+    
+    async def _on_start(self) -> None:
+        """Start the spam detection service."""
+        logger.info("Starting spam detection...")
+    
+    async def _on_stop(self) -> None:
+        """Stop the spam detection service."""
+        logger.info("Stopping spam detection...")
+        self.indexes.clear()
+    
+    def check(self, guild_id: int, author_id: int, channel_id: int, content: str,
+              timestamp: Optional[float] = None) -> Optional[SpreadMatch]:
+        """Fingerprint a message; returns a match if its author is now spamming across channels."""
+        tokens = tokenize(content)
+        if len(tokens) < self.min_tokens:
+            return None
+        now = time.monotonic() if timestamp is None else timestamp
+        self.stats["checked"] += 1
+        
+        index = self.indexes.get(guild_id)
+        if index is None:
+            index = self.indexes[guild_id] = NearDuplicateIndex(
+                self.window_seconds, config.SPAM_INDEX_SIZE, config.SPAM_MAX_DISTANCE
+            )
+        match = find_spread(index, IndexedText(now, simhash(tokens), author_id, channel_id), self.min_channels)
+        if match is None:
+            return None
+        
+        key = (guild_id, author_id)
+        flagged_at = self._flagged.get(key)
+        if flagged_at is not None and now - flagged_at < self.window_seconds:
+            return None
+        if len(self._flagged) >= config.SPAM_INDEX_SIZE:
+            self._flagged = {k: t for k, t in self._flagged.items() if now - t < self.window_seconds}
+        self._flagged[key] = now
+        self.stats["flagged"] += 1
+        return match
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status.update({
+            "indexed_messages": sum(len(index) for index in self.indexes.values()),
+            **self.stats
+        })
+        return status
@@ -0,0 +1,195 @@
+"""
+Service for live activity statistics.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import config
+from services.base_service import BaseService
+from utils.logger import logger
+from utils.sketches import WindowedTopK
+
+# Selectable windows in seconds
+WINDOWS = {"1h": 3600, "24h": 86400, "7d": 7 * 86400}
+DIMENSIONS = ("address", "reporter", "country", "asn")  # Country and ASN need a ready GeoIP service
+
+
+class StatsService(BaseService):
+    """Service that keeps top-N activity counters for fast statistics queries.
+    
+    Live reports are counted in memory as they arrive. The hour-bucketed
+    history is periodically rebuilt from the database (raw rows plus hourly
+    rollups), so it survives restarts and picks up compacted activity. While
+    the GeoIP service is ready, reports are also grouped by country and ASN;
+    it is optional, so stats keep working if its data fails to load.
+    """
+    
+    dependencies = ("honeypot",)
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.db = getattr(bot, "db", None)
+        self.geoip = bot.services.get("geoip")
+        self.capacity = config.STATS_SKETCH_CAPACITY
+        self.refresh_interval = config.STATS_REFRESH_SECONDS
+        self.refresh_task: Optional[asyncio.Task] = None
+        self.geoip_task: Optional[asyncio.Task] = None
+        self.last_refresh: Optional[datetime] = None
+        self._live_reports: Optional[List[Tuple[str, str, float]]] = None  # Captured while a refresh runs
+        self._refresh_lock = asyncio.Lock()
+        self.recent = self._new_trackers(60, 60)  # Minute buckets covering the last hour
+        self.history = self._new_trackers(3600, WINDOWS["7d"] // 3600)  # Hour buckets covering a week
+    
+    def _new_trackers(self, bucket_seconds: int, bucket_count: int) -> Dict[str, WindowedTopK]:
+        return {dimension: WindowedTopK(bucket_seconds, bucket_count, self.capacity) for dimension in DIMENSIONS}
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the stats service."""
+        logger.info("Initializing StatsService...")
+    
+    async def _on_start(self) -> None:
+        """Seed counters from the database and start listening for reports."""
+        logger.info("Starting stats service...")
+        if self.db:
+            await self.refresh(seed_recent=True)
+            self.refresh_task = asyncio.create_task(self._refresh_loop())
+            if self.geoip and not self.geoip.ready:
+                self.geoip_task = asyncio.create_task(self._refresh_when_geoip_ready())
+        self.bot.services["honeypot"].add_report_listener(self.record)
+    
+    async def _on_stop(self) -> None:
+        """Stop listening for reports."""
+        logger.info("Stopping stats service...")
+        self.bot.services["honeypot"].remove_report_listener(self.record)
+        for task in (self.refresh_task, self.geoip_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+    
+    def record(self, address: str, activity_data: Dict[str, Any], reported_at: datetime) -> None:
+        """Count one report. Called synchronously by HoneypotService for every report."""
+        timestamp = reported_at.timestamp()
+        reporter = activity_data.get("reported_by") or "unknown"
+        if self._live_reports is not None:
+            self._live_reports.append((address, reporter, timestamp))
+        self._count((self.recent, self.history), address, reporter, timestamp)
+    
+    def _count(self, tracker_sets: Tuple[Dict[str, WindowedTopK], ...], address: str, reporter: str, timestamp: float) -> None:
+        """Count one report in each set of trackers."""
+        for trackers in tracker_sets:
+            trackers["address"].add(address, timestamp)
+            trackers["reporter"].add(reporter, timestamp)
+            self._add_location(trackers, address, timestamp)
+    
+    def _add_location(self, trackers: Dict[str, WindowedTopK], address: str, timestamp: float, count: int = 1) -> None:
+        """Count an address's country and ASN, when GeoIP data is available."""
+        location = self.geoip.lookup(address) if self.geoip and self.geoip.ready else None
+        if location is None:
+            return
+        if location.country:
+            trackers["country"].add(location.country, timestamp, count)
+        if location.asn:
+            label = f"AS{location.asn} {location.organization}" if location.organization else f"AS{location.asn}"
+            trackers["asn"].add(label, timestamp, count)
+    
+    async def _refresh_loop(self) -> None:
+        """Rebuild the history counters from the database periodically."""
+        while True:
+            try:
+                await asyncio.sleep(self.refresh_interval)
+                await self.refresh()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error refreshing stats: {e}")
+    
+    async def _refresh_when_geoip_ready(self) -> None:
+        """Rebuild the counters once GeoIP data loads, so stored reports get countries and ASNs."""
+        await self.geoip.wait_until_ready()
+        try:
+            await self.refresh(seed_recent=True)
+        except Exception as e:
+            logger.error(f"Error refreshing stats after GeoIP loaded: {e}")
+        else:
+            logger.info("Rebuilt stats with GeoIP locations")
+    
+    async def refresh(self, seed_recent: bool = False) -> None:
+        """Rebuild the week of hourly counters (and optionally the last hour) from the database.
+        
+        HoneypotService's buffered reports are flushed first so the snapshot
+        includes them. Reports counted while the rebuild runs are captured and
+        those newer than the snapshot's latest row are replayed into the new
+        counters before they replace the live ones.
+        """
+        async with self._refresh_lock:
+            since = (datetime.now() - timedelta(seconds=WINDOWS["7d"])).isoformat()
+            self._live_reports = []
+            try:
+                try:
+                    await self.bot.services["honeypot"].flush()
+                except Exception as e:
+                    logger.warning(f"Could not flush reports before refreshing stats: {e}")
+                history, recent, high_water = await self._run_blocking(self._build_trackers, since, seed_recent)
+                live = self._live_reports
+            finally:
+                self._live_reports = None
+            newer_than = datetime.fromisoformat(high_water).timestamp() if high_water else float("-inf")
+            tracker_sets = (history,) if recent is None else (history, recent)
+            for address, reporter, timestamp in live:
+                if timestamp > newer_than:
+                    self._count(tracker_sets, address, reporter, timestamp)
+            self.history = history
+            if recent is not None:
+                self.recent = recent
+            self.last_refresh = datetime.now()
+    
+    def _build_trackers(self, since: str, seed_recent: bool) -> Tuple[Dict[str, WindowedTopK], Optional[Dict[str, WindowedTopK]], Optional[str]]:
+        """Build fresh counters from database counts, plus the snapshot's newest raw timestamp. Runs on a worker thread."""
+        history = self._new_trackers(3600, WINDOWS["7d"] // 3600)
+        recent = self._new_trackers(60, 60) if seed_recent else None
+        hour_ago = time.time() - WINDOWS["1h"]
+        # Add oldest first so each tracker's bucket deque is built in order
+        rows, high_water = self.db.get_activity_counts(since)
+        rows.sort(key=lambda row: row[2])
+        for address, reporter, bucket_start, count in rows:
+            timestamp = datetime.fromisoformat(bucket_start).timestamp()
+            targets = [history]
+            if recent is not None and timestamp >= hour_ago:
+                targets.append(recent)
+            for trackers in targets:
+                trackers["address"].add(address, timestamp, count)
+                self._add_location(trackers, address, timestamp, count)
+                # Rollups do not keep reporters
+                if reporter is not None:
+                    trackers["reporter"].add(reporter, timestamp, count)
+        return history, recent, high_water
+    
+    def get_stats(self, window: str = "1h", top: int = 10) -> Dict[str, Any]:
+        """Get top addresses, top reporters and the report rate over a window."""
+        seconds = WINDOWS[window]
+        trackers = self.recent if seconds <= WINDOWS["1h"] else self.history
+        now = time.time()
+        top_addresses, total = trackers["address"].query(seconds, now, top)
+        top_reporters, _ = trackers["reporter"].query(seconds, now, top)
+        top_countries, _ = trackers["country"].query(seconds, now, top)
+        top_asns, _ = trackers["asn"].query(seconds, now, top)
+        return {
+            "window": window,
+            "total": total,
+            "rate_per_hour": total / (seconds / 3600),
+            "top_addresses": top_addresses,
+            "top_reporters": top_reporters,
+            "top_countries": top_countries,
+            "top_asns": top_asns
+        }
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status["last_refresh"] = self.last_refresh.isoformat() if self.last_refresh else None
+        return status
@@ -0,0 +1,133 @@
+"""
+Service that samples process and event-loop health in the background.
+"""
+import asyncio
+import math
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config import config
+from services.base_service import BaseService
+from utils.logger import logger
+from utils.metrics import ProcessMetrics, SampleRing
+
+METRICS = ("rss_mb", "cpu_percent", "open_fds", "tasks", "loop_lag_ms", "gateway_latency_ms", "overload_level")
+WINDOWS = (("1m", 60), ("5m", 300), ("15m", 900))
+LAG_PROBE_INTERVAL = 0.25  # Seconds between event-loop lag probes
+
+
+class SystemMonitorService(BaseService):
+    """Service that records resource use, loop lag and gateway latency into ring buffers.
+    
+    Every ``SYSTEM_SAMPLE_INTERVAL`` seconds one sample of each metric is
+    stored and the min/avg/max over the last 1, 5 and 15 minutes is
+    recomputed into ``snapshot``, so status commands only read a dict.
+    Loop lag is the worst delay of a short timer since the previous sample.
+    """
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.interval = config.SYSTEM_SAMPLE_INTERVAL
+        capacity = math.ceil(WINDOWS[-1][1] / self.interval) + 1
+        self.rings = {name: SampleRing(capacity) for name in METRICS}
+        self.process_metrics: Optional[ProcessMetrics] = None
+        self.snapshot: Dict[str, Any] = {}
+        self._max_lag = 0.0
+        self.sample_task: Optional[asyncio.Task] = None
+        self.probe_task: Optional[asyncio.Task] = None
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the system monitor."""
+        logger.info("Initializing SystemMonitorService...")
+        self.process_metrics = ProcessMetrics()
+    
+    async def _on_start(self) -> None:
+        """Take a first sample and start the sampling loops."""
+        logger.info("Starting system sampler...")
+        self.sample()
+        self.probe_task = asyncio.create_task(self._probe_loop())
+        self.sample_task = asyncio.create_task(self._sample_loop())
+    
+    async def _on_stop(self) -> None:
+        """Stop the sampling loops."""
+        logger.info("Stopping system sampler...")
+        for task in (self.sample_task, self.probe_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+    
+    async def _probe_loop(self) -> None:
+        """Measure how late a short timer fires, keeping the worst since the last sample."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                expected = loop.time() + LAG_PROBE_INTERVAL
+                await asyncio.sleep(LAG_PROBE_INTERVAL)
+                self._max_lag = max(self._max_lag, loop.time() - expected)
+            except asyncio.CancelledError:
+                break
+    
+    async def _sample_loop(self) -> None:
+        """Sample every ``interval`` seconds."""
+        while True:
+            try:
+                await asyncio.sleep(self.interval)
+                self.sample()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error sampling system metrics: {e}")
+    
+    def _gateway_latency_ms(self) -> Optional[float]:
+        latency = getattr(self.bot, "latency", None)
+        # discord.py reports nan or inf until the first heartbeat is acknowledged
+        if latency is None or not math.isfinite(latency):
+            return None
+        return latency * 1000
+    
+    def _overload_level(self) -> Optional[int]:
+        overload = getattr(self.bot, "services", {}).get("overload")
+        return overload.level if overload else None
+    
+    def sample(self) -> None:
+        """Record one sample of every metric and rebuild the snapshot."""
+        now = time.monotonic()
+        process = self.process_metrics.snapshot()
+        values = {
+            "rss_mb": process["rss_mb"],
+            "cpu_percent": process["cpu_percent"],
+            "open_fds": self.process_metrics.open_fds(),
+            "tasks": len(asyncio.all_tasks()),
+            "loop_lag_ms": self._max_lag * 1000,
+            "gateway_latency_ms": self._gateway_latency_ms(),
+            "overload_level": self._overload_level()
+        }
+        self._max_lag = 0.0
+        for name, value in values.items():
+            if value is not None:
+                self.rings[name].add(value, now)
+        
+        metrics = {}
+        for name, ring in self.rings.items():
+            metrics[name] = {"current": values[name]}
+            for label, seconds in WINDOWS:
+                metrics[name][label] = ring.summary(seconds, now)
+        self.snapshot = {
+            "sampled_at": datetime.now().isoformat(),
+            "uptime": process["uptime"],
+            "metrics": metrics
+        }
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status.update({
+            "interval": self.interval,
+            "samples": len(self.rings["rss_mb"]),
+            "sampled_at": self.snapshot.get("sampled_at")
+        })
+        return status
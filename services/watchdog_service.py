@@ -0,0 +1,45 @@
+"""
+Service that watches the event loop for blocking calls.
+"""
+from typing import Any, Dict, Optional
+
+from config import config
+from services.base_service import BaseService
+from utils.logger import logger
+from utils.watchdog import LoopWatchdog
+
+
+class WatchdogService(BaseService):
+    """Service that runs a ``LoopWatchdog`` and reports the call sites that block the loop."""
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.watchdog: Optional[LoopWatchdog] = None
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the watchdog."""
+        logger.info("Initializing WatchdogService...")
+        self.watchdog = LoopWatchdog(config.WATCHDOG_THRESHOLD)
+    
+    async def _on_start(self) -> None:
+        """Start watching the event loop."""
+        logger.info(f"Starting event loop watchdog ({self.watchdog.threshold * 1000:.0f} ms threshold)...")
+        self.watchdog.start()
+    
+    async def _on_stop(self) -> None:
+        """Stop the watchdog thread."""
+        logger.info("Stopping event loop watchdog...")
+        self.watchdog.stop()
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        if self.watchdog:
+            top = self.watchdog.top_sites(1)
+            status.update({
+                "threshold": self.watchdog.threshold,
+                "stalls": self.watchdog.total_stalls,
+                "blocked_seconds": round(self.watchdog.total_blocked, 3),
+                "worst_site": top[0]["site"] if top else None
+            })
+        return status
@@ -0,0 +1,208 @@
+"""
+Service for ingesting honeypot sensor events over an HTTP webhook.
+"""
+import hmac
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from aiohttp import web
+
+from config import config
+from services.base_service import BaseService
+from services.ingestion import IngestionPipeline, decode_events, normalize_batches
+from utils import json_codec
+from utils.logger import logger
+from utils.streaming import PeekableStream, iter_json_batches, iter_line_batches
+
+READ_CHUNK_SIZE = 64 * 1024
+WHOLE_BODY_LIMIT = 256 * 1024  # Bodies up to this size are read and decoded in one call
+EXECUTOR_EVENTS = 5000  # Queued events per batch above which normalization moves to a worker thread
+
+
+class BodyTooLarge(Exception):
+    """Raised while streaming a request body that exceeds the configured limit."""
+
+
+def parse_tokens(spec: str) -> Dict[str, str]:
+    """Parse ``name:token`` pairs (or bare tokens) separated by commas into a token -> name map."""
+    tokens = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, token = entry.rpartition(":")
+        tokens[token] = name or "webhook"
+    return tokens
+
+
+class WebhookIngestionService(BaseService):
+    """Service that accepts sensor events over HTTP and reports them to HoneypotService.
+    
+    ``POST /ingest`` takes one JSON event, a JSON array or NDJSON, authenticated
+    with ``Authorization: Bearer <token>``. Large JSON arrays and NDJSON are
+    parsed as they stream in; a large single object is buffered up to the size
+    limit and decoded off the event loop, so every body size accepts the same
+    formats. Parsed batches go into a bounded ``IngestionPipeline``; when it
+    is full the request is answered with 429 and the number of events accepted
+    so far, so the sensor can retry the remainder.
+    """
+    
+    dependencies = ("honeypot",)
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.tokens = parse_tokens(config.WEBHOOK_TOKENS)
+        self.max_body_bytes = config.WEBHOOK_MAX_BODY_BYTES
+        self.runner: Optional[web.AppRunner] = None
+        self.pipeline: Optional[IngestionPipeline] = None
+        self.requests = {"accepted": 0, "unauthorized": 0, "invalid": 0, "too_large": 0, "throttled": 0}
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the webhook ingestion service."""
+        logger.info("Initializing WebhookIngestionService...")
+        if not self.tokens:
+            raise RuntimeError("No webhook tokens configured")
+    
+    async def _on_start(self) -> None:
+        """Start the ingestion pipeline and the HTTP server."""
+        logger.info("Starting webhook ingestion...")
+        self.pipeline = IngestionPipeline(
+            self.bot.services["honeypot"].report_activities,
+            decode=normalize_batches,
+            queue_size=config.WEBHOOK_QUEUE_SIZE,
+            batch_size=config.INGEST_BATCH_SIZE,
+            name="webhook",
+            executor_threshold=EXECUTOR_EVENTS,
+            offload=self._run_blocking  # Events are already decoded; pickling them would cost more than it saves
+        )
+        self.pipeline.start()
+        
+        app = web.Application()
+        app.router.add_post("/ingest", self._handle_ingest)
+        app.router.add_get("/health", self._handle_health)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        # Ingestion workers all bind the same port and let the kernel balance connections
+        reuse_port = getattr(self.bot, "worker_index", None) is not None
+        site = web.TCPSite(self.runner, config.WEBHOOK_HOST, config.WEBHOOK_PORT, reuse_port=reuse_port or None)
+        await site.start()
+        logger.info(f"Webhook ingestion listening on {config.WEBHOOK_HOST}:{config.WEBHOOK_PORT}")
+    
+    async def _on_stop(self) -> None:
+        """Stop accepting requests and drain the pipeline."""
+        logger.info("Stopping webhook ingestion...")
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+        if self.pipeline:
+            await self.pipeline.stop()
+    
+    def _authenticate(self, request: web.Request) -> Optional[str]:
+        """Return the sensor name for the request's bearer token, or None."""
+        scheme, _, presented = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not presented:
+            return None
+        for token, name in self.tokens.items():
+            if hmac.compare_digest(presented.encode(), token.encode()):
+                return name
+        return None
+    
+    async def _read_chunks(self, request: web.Request) -> AsyncIterator[bytes]:
+        """Yield the request body in chunks, enforcing the size limit."""
+        received = 0
+        async for chunk in request.content.iter_chunked(READ_CHUNK_SIZE):
+            received += len(chunk)
+            if received > self.max_body_bytes:
+                raise BodyTooLarge()
+            yield chunk
+    
+    async def _iter_events(self, request: web.Request) -> AsyncIterator[List[Any]]:
+        """Yield batches of decoded events from the request body."""
+        if request.content_length is not None and request.content_length <= WHOLE_BODY_LIMIT:
+            # Small bodies: one fast decode instead of incremental parsing
+            yield decode_events(await request.read())
+            return
+        chunks = PeekableStream(self._read_chunks(request))
+        first = await chunks.peek()
+        if first is None:
+            return
+        if first.lstrip()[:1] == b"[":
+            async for events in iter_json_batches(chunks):
+                yield events
+            return
+        # NDJSON is decoded line by line as it arrives. If the first line isn't a
+        # whole JSON value the body is one pretty-printed object, so the rest is
+        # buffered and decoded exactly like a small body.
+        buffered: Optional[List[str]] = None
+        started = False
+        async for lines in iter_line_batches(chunks):
+            if buffered is not None:
+                buffered.extend(lines)
+                continue
+            events = []
+            for i, line in enumerate(lines):
+                if not line.strip():
+                    continue
+                try:
+                    events.append(json_codec.loads(line))
+                except ValueError:
+                    if started:
+                        raise
+                    buffered = lines[i:]
+                    break
+                started = True
+            if events:
+                yield events
+        if buffered is not None:
+            body = "\n".join(buffered).encode()
+            yield await self._run_blocking(decode_events, body)
+    
+    async def _handle_ingest(self, request: web.Request) -> web.Response:
+        """Accept a batch of sensor events."""
+        name = self._authenticate(request)
+        if name is None:
+            self.requests["unauthorized"] += 1
+            return web.json_response({"error": "unauthorized"}, status=401)
+        if request.content_length is not None and request.content_length > self.max_body_bytes:
+            self.requests["too_large"] += 1
+            return web.json_response({"error": "body too large"}, status=413)
+        
+        source = f"webhook:{name}"
+        accepted = 0
+        try:
+            async for events in self._iter_events(request):
+                if not events:
+                    continue
+                if not self.pipeline.offer((source, events)):
+                    self.requests["throttled"] += 1
+                    return web.json_response(
+                        {"error": "ingestion queue full", "accepted": accepted},
+                        status=429, headers={"Retry-After": "1"}
+                    )
+                accepted += len(events)
+        except BodyTooLarge:
+            self.requests["too_large"] += 1
+            return web.json_response({"error": "body too large", "accepted": accepted}, status=413)
+        except ValueError as e:
+            self.requests["invalid"] += 1
+            return web.json_response({"error": f"invalid JSON: {e}", "accepted": accepted}, status=400)
+        
+        self.requests["accepted"] += 1
+        return web.json_response({"accepted": accepted}, status=202)
+    
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        """Report whether events can currently be accepted."""
+        if self.pipeline is None:
+            return web.json_response({"ready": False}, status=503)
+        full = self.pipeline.queue.full()
+        return web.json_response({"ready": self.ready and not full, **self.pipeline.get_status()},
+                                 status=503 if full else 200)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        status.update({
+            "requests": dict(self.requests),
+            **(self.pipeline.get_status() if self.pipeline else {})
+        })
+        return status
+
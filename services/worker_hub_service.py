@@ -0,0 +1,190 @@
+"""
+Service that runs ingestion in worker processes and feeds their reports into the gateway.
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import config
+from services.base_service import BaseService
+from utils.ipc import encode_frame, read_frame
+from utils.logger import logger
+from utils.metrics import ProcessMetrics, RateMeter
+
+RUN_SCRIPT = str(Path(__file__).resolve().parent.parent / "run.py")
+RESTART_MIN_DELAY = 1.0
+RESTART_MAX_DELAY = 60.0
+WORKER_EXIT_TIMEOUT = 15.0  # Seconds a worker gets to drain its queues before it is killed
+
+
+class WorkerHubService(BaseService):
+    """Service that supervises ingestion worker processes and serves their reports.
+    
+    Each of the ``WORKER_COUNT`` workers runs the webhook, MQTT and file tail
+    services in its own process and event loop, and sends the parsed reports
+    over a Unix socket in batched frames. This process stays the single owner
+    of monitored addresses and the database: every batch goes through
+    ``HoneypotService.report_activities``, so de-duplication, correlation and
+    alerts work exactly as with in-process ingestion. Workers that exit are
+    restarted with backoff.
+    """
+    
+    dependencies = ("honeypot",)
+    stop_timeout = WORKER_EXIT_TIMEOUT + 5.0
+    
+    def __init__(self, bot):
+        super().__init__(bot)
+        self.worker_count = config.WORKER_COUNT
+        self.socket_path = config.WORKER_SOCKET_PATH
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.processes: Dict[int, asyncio.subprocess.Process] = {}
+        self.worker_tasks: Dict[int, asyncio.Task] = {}
+        self.workers: Dict[int, Dict[str, Any]] = {}
+        self.received = RateMeter()
+        self.process_metrics = ProcessMetrics()
+        self._stopping = False
+    
+    async def _on_initialize(self) -> None:
+        """Initialize the worker hub."""
+        logger.info("Initializing WorkerHubService...")
+        if self.worker_count < 1:
+            raise RuntimeError("WORKER_COUNT must be at least 1")
+    
+    async def _on_start(self) -> None:
+        """Listen for workers, then launch them."""
+        logger.info(f"Starting {self.worker_count} ingestion worker(s)...")
+        self._stopping = False
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # Left behind by an unclean shutdown
+        self.server = await asyncio.start_unix_server(self._handle_worker, path=self.socket_path)
+        for index in range(self.worker_count):
+            self.workers[index] = {"pid": None, "connected": False, "restarts": 0, "batches": 0,
+                                   "reports": RateMeter(), "accepted": 0, "metrics": {}}
+            self.worker_tasks[index] = asyncio.create_task(self._run_worker(index))
+    
+    async def _on_stop(self) -> None:
+        """Ask workers to drain and exit, then close the socket."""
+        logger.info("Stopping ingestion workers...")
+        self._stopping = True
+        await asyncio.gather(*(self._terminate(process) for process in self.processes.values()))
+        for task in self.worker_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.worker_tasks.values(), return_exceptions=True)
+        self.worker_tasks.clear()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+    
+    def _worker_env(self, index: int) -> Dict[str, str]:
+        """Environment for a worker: the gateway's, with a log file of its own."""
+        base, ext = os.path.splitext(config.LOG_FILE)
+        return dict(os.environ, LOG_FILE=f"{base}.worker{index}{ext}", WORKER_SOCKET_PATH=self.socket_path)
+    
+    async def _run_worker(self, index: int) -> None:
+        """Run one worker process, restarting it with backoff whenever it exits."""
+        delay = RESTART_MIN_DELAY
+        while not self._stopping:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, RUN_SCRIPT, "--worker", str(index), env=self._worker_env(index)
+            )
+            self.processes[index] = process
+            self.workers[index].update(pid=process.pid, metrics={})
+            logger.info(f"Started ingestion worker {index} (pid {process.pid})")
+            started = asyncio.get_running_loop().time()
+            returncode = await process.wait()
+            if self._stopping:
+                return
+            self.workers[index]["restarts"] += 1
+            if asyncio.get_running_loop().time() - started > RESTART_MAX_DELAY:
+                delay = RESTART_MIN_DELAY  # It ran for a while; this is not a crash loop
+            logger.error(f"Ingestion worker {index} exited with code {returncode}; restarting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RESTART_MAX_DELAY)
+    
+    async def _terminate(self, process: asyncio.subprocess.Process) -> None:
+        """Send SIGTERM and wait for the worker to drain, killing it if it takes too long."""
+        if process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=WORKER_EXIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Ingestion worker {process.pid} did not exit in time; killing it")
+            process.kill()
+            await process.wait()
+    
+    async def _handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one worker connection: report and flush requests, and metrics updates."""
+        honeypot_service = self.bot.services["honeypot"]
+        state: Optional[Dict[str, Any]] = None
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message is None:
+                    break
+                op = message.get("op")
+                if op == "hello":
+                    state = self.workers.get(message.get("worker"))
+                    if state is None:
+                        logger.warning(f"Unknown worker {message.get('worker')} connected; closing it")
+                        break
+                    state["connected"] = True
+                    continue
+                if state is None:
+                    break
+                if op == "metrics":
+                    state["metrics"] = message.get("metrics", {})
+                    continue
+                
+                reply: Dict[str, Any] = {"id": message.get("id")}
+                try:
+                    if op == "report":
+                        reports = message["reports"]
+                        reply["result"] = await honeypot_service.report_activities(reports)
+                        self.received.add(len(reports))
+                        state["reports"].add(len(reports))
+                        state["batches"] += 1
+                        state["accepted"] += reply["result"]
+                    elif op == "flush":
+                        await honeypot_service.flush()
+                        reply["result"] = True
+                    else:
+                        reply["error"] = f"unknown op {op!r}"
+                except Exception as e:
+                    logger.error(f"Failed to handle {op} from a worker: {e}")
+                    reply["error"] = str(e)
+                writer.write(encode_frame(reply))
+                await writer.drain()
+        except Exception as e:
+            logger.error(f"Worker connection error: {e}")
+        finally:
+            if state is not None:
+                state["connected"] = False
+            writer.close()
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the current status of the service."""
+        status = super().get_status()
+        workers = {}
+        for index, state in self.workers.items():
+            workers[index] = {
+                **{key: value for key, value in state["metrics"].items() if key != "services"},
+                "pid": state["pid"],
+                "connected": state["connected"],
+                "restarts": state["restarts"],
+                "batches": state["batches"],
+                "reports": state["reports"].total,
+                "accepted": state["accepted"],
+                "events_per_second": round(state["reports"].rate(), 1)
+            }
+        status.update({
+            "gateway": {**self.process_metrics.snapshot(), "events_per_second": round(self.received.rate(), 1)},
+            "workers": workers
+        })
+        return status
@@ -0,0 +1,148 @@
+"""
+Compact in-memory records for monitored addresses.
+"""
+from datetime import datetime
+from typing import Any, Dict, ItemsView, Iterator, KeysView, Optional, Tuple, ValuesView
+
+EMPTY_METADATA: Dict[str, Any] = {}
+
+
+class AddressRecord:
+    """One monitored address. Timestamps are epoch seconds; ``metadata`` is shared and must not be mutated."""
+    
+    __slots__ = ("id", "added_at", "suspicious_count", "last_checked", "last_alert", "metadata")
+    
+    def __init__(self, record_id: int, added_at: float, suspicious_count: int, last_checked: float,
+                 metadata: Dict[str, Any]):
+        self.id = record_id
+        self.added_at = added_at
+        self.suspicious_count = suspicious_count
+        self.last_checked = last_checked
+        self.last_alert: Optional[float] = None
+        self.metadata = metadata
+    
+    def as_dict(self, address: str) -> Dict[str, Any]:
+        """The record as a plain dict with ``datetime`` timestamps, for display."""
+        return {
+            "address": address,
+            "id": self.id,
+            "added_at": datetime.fromtimestamp(self.added_at),
+            "suspicious_count": self.suspicious_count,
+            "last_checked": datetime.fromtimestamp(self.last_checked),
+            "last_alert": datetime.fromtimestamp(self.last_alert) if self.last_alert is not None else None,
+            "metadata": self.metadata
+        }
+    
+    def __repr__(self) -> str:
+        return (f"AddressRecord(id={self.id}, suspicious_count={self.suspicious_count}, "
+                f"last_checked={datetime.fromtimestamp(self.last_checked):%Y-%m-%d %H:%M:%S}, "
+                f"metadata={self.metadata})")
+
+
+class AddressStore:
+    """Monitored addresses keyed by address, with id lookup and interned metadata.
+    
+    Records use ``__slots__`` and float timestamps instead of a dict of
+    ``datetime`` objects each. Identical metadata dicts (most imported
+    addresses have none, or share a feed description) are stored once and
+    reference-counted so the intern table shrinks as addresses are removed.
+    ``items``, ``addresses`` and ``records`` are live views, not copies;
+    don't add or remove addresses while iterating one.
+    """
+    
+    def __init__(self):
+        self._records: Dict[str, AddressRecord] = {}
+        self._by_id: Dict[int, str] = {}
+        self._next_id = 1
+        self._metadata: Dict[Tuple, Dict[str, Any]] = {}
+        self._metadata_refs: Dict[Tuple, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __contains__(self, address: object) -> bool:
+        return address in self._records
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+    
+    def __getitem__(self, address: str) -> AddressRecord:
+        return self._records[address]
+    
+    def get(self, address: str) -> Optional[AddressRecord]:
+        """The record for ``address``, or None if it isn't monitored."""
+        return self._records.get(address)
+    
+    def address_for(self, record_id: int) -> Optional[str]:
+        """The address whose record has ``record_id``, or None if it was removed."""
+        return self._by_id.get(record_id)
+    
+    def items(self) -> ItemsView[str, AddressRecord]:
+        """Live ``(address, record)`` view."""
+        return self._records.items()
+    
+    def addresses(self) -> KeysView[str]:
+        """Live view of the monitored addresses."""
+        return self._records.keys()
+    
+    def records(self) -> ValuesView[AddressRecord]:
+        """Live view of the records."""
+        return self._records.values()
+    
+    def add(self, address: str, added_at: float, suspicious_count: int, last_checked: float,
+            metadata: Optional[Dict[str, Any]]) -> AddressRecord:
+        """Store a new record for ``address`` under a fresh id. The address must not already be stored."""
+        record = AddressRecord(self._next_id, added_at, suspicious_count, last_checked, self._intern(metadata))
+        self._next_id += 1
+        self._records[address] = record
+        self._by_id[record.id] = address
+        return record
+    
+    def discard(self, address: str) -> Optional[AddressRecord]:
+        """Remove and return the record for ``address``, if any."""
+        record = self._records.pop(address, None)
+        if record is not None:
+            self._by_id.pop(record.id, None)
+            self._release(record.metadata)
+        return record
+    
+    @staticmethod
+    def _metadata_key(metadata: Dict[str, Any]) -> Optional[Tuple]:
+        """Hashable key for a metadata dict, or None if a value is unhashable."""
+        key = tuple(sorted(metadata.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def _intern(self, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the shared copy of ``metadata``, registering it if it's new."""
+        if not metadata:
+            return EMPTY_METADATA
+        key = self._metadata_key(metadata)
+        if key is None:
+            return metadata
+        shared = self._metadata.get(key)
+        if shared is None:
+            shared = self._metadata[key] = dict(metadata)
+        self._metadata_refs[key] = self._metadata_refs.get(key, 0) + 1
+        return shared
+    
+    def _release(self, metadata: Dict[str, Any]) -> None:
+        """Drop one reference to interned ``metadata``, forgetting it when unused."""
+        if not metadata:
+            return
+        key = self._metadata_key(metadata)
+        if key is None or self._metadata.get(key) is not metadata:
+            return
+        refs = self._metadata_refs[key] - 1
+        if refs:
+            self._metadata_refs[key] = refs
+        else:
+            del self._metadata_refs[key]
+            del self._metadata[key]
+    
+    def get_status(self) -> Dict[str, int]:
+        """Record and distinct-metadata counts."""
+        return {"records": len(self._records), "distinct_metadata": len(self._metadata)}
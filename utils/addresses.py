@@ -0,0 +1,100 @@
+"""
+Address validation and threat feed parsing.
+"""
+import csv
+import ipaddress
+import re
+import socket
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from utils.streaming import iter_json_batches, iter_line_batches
+
+# Column or key names recognised as the address and description in CSV and JSON feeds
+ADDRESS_FIELDS = ("address", "ip", "ip_address", "src_ip", "indicator", "host")
+DESCRIPTION_FIELDS = ("description", "comment", "note", "tags")
+
+HOSTNAME_PATTERN = re.compile(
+    r"^(?=.{1,253}$)(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z](?:[a-z0-9-]{0,61}[a-z0-9])?$"
+)
+
+FeedEntry = Tuple[str, Optional[str]]  # (raw address, description)
+
+
+def normalize_address(raw: str) -> Optional[str]:
+    """Return the canonical form of an IP, CIDR network or hostname, or None if invalid."""
+    value = raw.strip().strip("\"'").lower()
+    if not value:
+        return None
+    # inet_pton/inet_ntop validate and canonicalize plain IPs far faster than ipaddress
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            return socket.inet_ntop(family, socket.inet_pton(family, value))
+        except (OSError, ValueError):
+            pass
+    if "/" in value:
+        try:
+            return str(ipaddress.ip_network(value, strict=False))
+        except ValueError:
+            return None
+    if HOSTNAME_PATTERN.match(value):
+        return value
+    return None
+
+
+def _entry_from_json(value: Any) -> Optional[FeedEntry]:
+    if isinstance(value, str):
+        return value, None
+    if isinstance(value, dict):
+        address = next((value[key] for key in ADDRESS_FIELDS if value.get(key)), None)
+        if isinstance(address, str):
+            description = next((value[key] for key in DESCRIPTION_FIELDS if value.get(key)), None)
+            return address, str(description) if description is not None else None
+    return None
+
+
+async def parse_address_feed(chunks: AsyncIterator[bytes], filename: str) -> AsyncIterator[List[Optional[FeedEntry]]]:
+    """Parse a newline, CSV or JSON/NDJSON feed into batches of raw entries.
+    
+    The format is chosen from the file extension. Unparseable records are
+    yielded as ``None`` so callers can count them as invalid.
+    """
+    name = filename.lower()
+    if name.endswith((".json", ".ndjson", ".jsonl")):
+        async for values in iter_json_batches(chunks):
+            yield [_entry_from_json(value) for value in values]
+    
+    elif name.endswith(".csv"):
+        address_column, description_column = 0, None
+        header_checked = False
+        async for lines in iter_line_batches(chunks):
+            batch: List[Optional[FeedEntry]] = []
+            for row in csv.reader(lines):
+                if not row:
+                    continue
+                if not header_checked:
+                    header_checked = True
+                    columns = [column.strip().lower() for column in row]
+                    if any(field in columns for field in ADDRESS_FIELDS):
+                        address_column = next(columns.index(f) for f in ADDRESS_FIELDS if f in columns)
+                        description_column = next((columns.index(f) for f in DESCRIPTION_FIELDS if f in columns), None)
+                        continue
+                if len(row) <= address_column:
+                    batch.append(None)
+                    continue
+                description = None
+                if description_column is not None and len(row) > description_column:
+                    description = row[description_column].strip() or None
+                batch.append((row[address_column], description))
+            if batch:
+                yield batch
+    
+    else:
+        async for lines in iter_line_batches(chunks):
+            batch = []
+            for line in lines:
+                # Plain feeds commonly carry "# comments" and trailing annotations
+                fields = line.split("#", 1)[0].split()
+                if fields:
+                    batch.append((fields[0], None))
+            if batch:
+                yield batch
@@ -0,0 +1,86 @@
+"""
+Sliding-window tracking of how many distinct sources report each address.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+INTERACTIVE_SOURCE = "discord"  # Source of reports made through bot commands
+
+
+def source_id(activity_data: Dict[str, Any]) -> str:
+    """Identify the sensor or source behind a report.
+    
+    Prefers the honeypot sensor name, then the ingestion source; each person
+    reporting through Discord counts as a source of their own.
+    """
+    sensor = activity_data.get("sensor")
+    if sensor:
+        return str(sensor)
+    source = activity_data.get("source") or INTERACTIVE_SOURCE
+    if source == INTERACTIVE_SOURCE:
+        return f"{source}:{activity_data.get('reported_by') or 'unknown'}"
+    return str(source)
+
+
+class SpreadTracker:
+    """Distinct sources per address over a sliding window.
+    
+    Each address keeps an ``OrderedDict`` of source -> last seen, ordered by
+    recency, so expiry only ever pops from the front; a second ordered map of
+    address -> last report drops idle addresses the same way. Every entry is
+    inserted and removed once, which makes ``add`` O(1) amortized.
+    """
+    
+    def __init__(self, window_seconds: float, threshold: int):
+        self.window_seconds = window_seconds
+        self.threshold = threshold
+        self._sources: Dict[str, "OrderedDict[str, float]"] = {}
+        self._last_seen: "OrderedDict[str, float]" = OrderedDict()
+        self._alerted: Dict[str, float] = {}  # address -> when its last spread alert fired
+    
+    def __len__(self) -> int:
+        return len(self._sources)
+    
+    def _expire_addresses(self, cutoff: float) -> None:
+        last_seen = self._last_seen
+        while last_seen:
+            address, seen = next(iter(last_seen.items()))
+            if seen > cutoff:
+                break
+            last_seen.popitem(last=False)
+            del self._sources[address]
+            self._alerted.pop(address, None)
+    
+    def add(self, address: str, source: str, timestamp: float) -> Optional[List[str]]:
+        """Record a report; returns the distinct sources if this one crosses the threshold, else None.
+        
+        After an alert the address stays quiet until its spread falls below
+        the threshold again, so one campaign raises one alert.
+        """
+        cutoff = timestamp - self.window_seconds
+        self._expire_addresses(cutoff)
+        
+        sources = self._sources.get(address)
+        if sources is None:
+            sources = self._sources[address] = OrderedDict()
+        sources[source] = timestamp
+        sources.move_to_end(source)
+        while True:
+            oldest = next(iter(sources.values()))
+            if oldest > cutoff:
+                break
+            sources.popitem(last=False)
+        self._last_seen[address] = timestamp
+        self._last_seen.move_to_end(address)
+        
+        if len(sources) < self.threshold:
+            self._alerted.pop(address, None)
+            return None
+        if address in self._alerted:
+            return None
+        self._alerted[address] = timestamp
+        return list(sources)
+    
+    def spread(self, address: str) -> int:
+        """Distinct sources currently in the window for ``address``."""
+        return len(self._sources.get(address, ()))
@@ -0,0 +1,177 @@
+"""
+Windowed de-duplication of activity reports, exact or with a rotating Bloom filter.
+"""
+import hashlib
+import math
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+
+from utils.correlation import INTERACTIVE_SOURCE
+
+# Fields that differ between copies of the same report and so are left out of its fingerprint
+VOLATILE_FIELDS = ("reported_by", "source")
+_MASK64 = (1 << 64) - 1
+
+
+def report_key(address: str, reporter: Optional[str], activity_data: Dict[str, Any]) -> bytes:
+    """Digest of (address, reporter, activity fingerprint) identifying repeats of one report.
+    
+    A sensor event's ``timestamp`` is when the event happened, so retries share
+    it and it is part of the fingerprint. Interactive reports stamp the time
+    of reporting, which is ignored so repeats still match.
+    """
+    interactive = activity_data.get("source", INTERACTIVE_SOURCE) == INTERACTIVE_SOURCE
+    ignored = VOLATILE_FIELDS + ("timestamp",) if interactive else VOLATILE_FIELDS
+    fingerprint = sorted((key, repr(value)) for key, value in activity_data.items() if key not in ignored)
+    data = f"{address}\0{reporter or ''}\0{fingerprint!r}".encode()
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class RotatingBloomFilter:
+    """Two Bloom filter generations that remember keys for one to two windows.
+    
+    Keys are added to the current generation and looked up in both; every
+    ``window_seconds`` (or sooner, once ``capacity`` keys fill it) the current
+    generation becomes the previous one and the oldest is dropped. Memory is
+    fixed at two filters sized for ``capacity`` keys at ``error_rate``, so the
+    chance of wrongly treating a new report as a duplicate is about twice that.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = 0.001, window_seconds: float = 3600.0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.window_seconds = window_seconds
+        self.bit_count = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self._current = bytearray((self.bit_count + 7) // 8)
+        self._previous = bytearray(len(self._current))
+        self._current_keys = 0
+        self._rotated_at: Optional[float] = None
+        self.early_rotations = 0
+    
+    def _rotate(self, now: float) -> None:
+        if self._rotated_at is not None and now - self._rotated_at >= 2 * self.window_seconds:
+            self._previous = bytearray(len(self._current))  # Idle for two windows: forget both
+        else:
+            self._previous = self._current
+        self._current = bytearray(len(self._previous))
+        self._current_keys = 0
+        self._rotated_at = now
+    
+    def check_and_add(self, key: bytes, now: Optional[float] = None) -> bool:
+        """Add ``key``, returning True if it was (probably) already seen within the window."""
+        now = time.monotonic() if now is None else now
+        if self._rotated_at is None or now - self._rotated_at >= self.window_seconds:
+            self._rotate(now)
+        elif self._current_keys >= self.capacity:
+            # Overfull filters lose accuracy; shorten the window instead
+            self.early_rotations += 1
+            self._rotate(now)
+        
+        # Double hashing (Kirsch-Mitzenmacher): k positions from two 64-bit halves of the digest
+        value = int.from_bytes(key, "little")
+        h1 = value & _MASK64
+        h2 = (value >> 64) | 1
+        bit_count = self.bit_count
+        current = self._current
+        previous = self._previous
+        in_current = in_previous = True
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % bit_count
+            byte = position >> 3
+            mask = 1 << (position & 7)
+            if not current[byte] & mask:
+                in_current = False
+                current[byte] |= mask
+            if in_previous and not previous[byte] & mask:
+                in_previous = False
+        if in_current:
+            return True
+        self._current_keys += 1
+        return in_previous
+    
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the filter bits."""
+        return len(self._current) + len(self._previous)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get sizing and fill information."""
+        return {
+            "mode": "bloom",
+            "window_seconds": self.window_seconds,
+            "capacity": self.capacity,
+            "hash_count": self.hash_count,
+            "memory_bytes": self.memory_bytes,
+            "current_keys": self._current_keys,
+            "false_positive_rate": 2 * self.error_rate,
+            "early_rotations": self.early_rotations
+        }
+
+
+class ExactDeduplicator:
+    """Remembers every key for ``window_seconds`` after it is first seen.
+    
+    No false positives, but memory grows with the number of distinct reports
+    in the window (roughly 250 bytes each; see ``memory_bytes``), so ``capacity`` caps it by
+    forgetting the oldest keys early.
+    """
+    
+    def __init__(self, capacity: int, window_seconds: float = 3600.0):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self._seen: "OrderedDict[bytes, float]" = OrderedDict()
+        self.evicted = 0
+    
+    def check_and_add(self, key: bytes, now: Optional[float] = None) -> bool:
+        """Add ``key``, returning True if it was already seen within the window."""
+        now = time.monotonic() if now is None else now
+        seen = self._seen
+        cutoff = now - self.window_seconds
+        while seen:
+            if next(iter(seen.values())) > cutoff:
+                break
+            seen.popitem(last=False)
+        if key in seen:
+            return True
+        if len(seen) >= self.capacity:
+            seen.popitem(last=False)
+            self.evicted += 1
+        seen[key] = now
+        return False
+    
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the remembered keys and their timestamps."""
+        per_key = sys.getsizeof(b"\0" * 16) + sys.getsizeof(0.0)
+        return sys.getsizeof(self._seen) + len(self._seen) * per_key
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get sizing and fill information."""
+        return {
+            "mode": "exact",
+            "window_seconds": self.window_seconds,
+            "capacity": self.capacity,
+            "keys": len(self._seen),
+            "memory_bytes": self.memory_bytes,
+            "false_positive_rate": 0.0,
+            "evicted": self.evicted
+        }
+
+
+Deduplicator = Union[RotatingBloomFilter, ExactDeduplicator]
+
+
+def create_deduplicator(mode: str, capacity: int, error_rate: float,
+                        window_seconds: float) -> Optional[Deduplicator]:
+    """Build the deduplicator for ``mode`` ("bloom", "exact" or "off")."""
+    mode = mode.lower()
+    if mode == "bloom":
+        return RotatingBloomFilter(capacity, error_rate, window_seconds)
+    if mode == "exact":
+        return ExactDeduplicator(capacity, window_seconds)
+    if mode == "off":
+        return None
+    raise ValueError(f"Unknown de-duplication mode: {mode}")
@@ -0,0 +1,137 @@
+"""
+Shared executor tier: a thread pool for I/O and compression, a process pool for pure-Python CPU work.
+"""
+import asyncio
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+LATENCY_SAMPLES = 1024  # Recent task latencies kept per pool for percentiles
+
+
+def _shutdown(executor: Executor, wait: bool) -> None:
+    try:
+        executor.shutdown(wait=wait, cancel_futures=True)
+    except TypeError:  # Python 3.8 has no cancel_futures; queued tasks still run
+        executor.shutdown(wait=wait)
+
+
+class PoolStats:
+    """Task counters and recent latencies (submission to result) for one pool."""
+    
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+    
+    @property
+    def in_flight(self) -> int:
+        """Tasks queued or running."""
+        return self.submitted - self.completed - self.failed - self.cancelled
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus p50/p95/max latency in milliseconds over recent tasks."""
+        latencies = sorted(self.latencies)
+        
+        def percentile(fraction: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000, 2)
+        
+        return {
+            "in_flight": self.in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "latency_p50_ms": percentile(0.5),
+            "latency_p95_ms": percentile(0.95),
+            "latency_max_ms": round(latencies[-1] * 1000, 2) if latencies else None
+        }
+
+
+class ExecutorTier:
+    """Thread and process pools shared by every service, with queue depth and latency metrics.
+    
+    ``run_thread`` suits blocking I/O and work that releases the GIL (SQLite,
+    zlib, file reads). ``run_process`` suits pure-Python CPU work, which
+    would otherwise hold the GIL and delay the event loop even from a thread;
+    its function and arguments must be picklable. ``map_chunks`` splits a
+    large input across the pool. Cancelling the awaiting task cancels every
+    chunk that has not started yet.
+    The process pool is created on first use; with ``process_workers=0``
+    process work runs on the thread pool instead.
+    """
+    
+    def __init__(self, thread_workers: int, process_workers: int):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.threads = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="executor")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self.stats = {"thread": PoolStats(), "process": PoolStats()}
+    
+    def _process_pool(self) -> Executor:
+        if self._processes is None:
+            # forkserver children don't inherit the bot's threads, sockets or event loop
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._processes = ProcessPoolExecutor(max_workers=self.process_workers,
+                                                  mp_context=multiprocessing.get_context(method))
+        return self._processes
+    
+    async def _run(self, kind: str, executor: Executor, func: Callable[..., Any], *args: Any) -> Any:
+        stats = self.stats[kind]
+        stats.submitted += 1
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wrap_future(executor.submit(func, *args))
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            raise
+        except Exception:
+            stats.failed += 1
+            raise
+        stats.completed += 1
+        stats.latencies.append(time.perf_counter() - started)
+        return result
+    
+    async def run_thread(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the thread pool."""
+        return await self._run("thread", self.threads, func, *args)
+    
+    async def run_process(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the process pool (the thread pool if it is disabled)."""
+        if self.process_workers < 1:
+            return await self.run_thread(func, *args)
+        return await self._run("process", self._process_pool(), func, *args)
+    
+    async def map_chunks(self, func: Callable[[Sequence[Any]], Any], items: Sequence[Any], chunk_size: int,
+                         process: bool = True) -> List[Any]:
+        """Apply ``func`` to consecutive slices of ``items`` in parallel; results come back in slice order."""
+        run = self.run_process if process else self.run_thread
+        tasks = [asyncio.ensure_future(run(func, items[i:i + chunk_size])) for i in range(0, len(items), chunk_size)]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            # One chunk failed or the caller was cancelled: don't leave the rest running
+            for task in tasks:
+                task.cancel()
+            raise
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop both pools, cancelling queued tasks."""
+        _shutdown(self.threads, wait)
+        if self._processes is not None:
+            _shutdown(self._processes, wait)
+            self._processes = None
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Pool sizes, queue depth, counters and latency percentiles."""
+        return {
+            "thread": {"workers": self.thread_workers, **self.stats["thread"].snapshot()},
+            "process": {"workers": self.process_workers, "started": self._processes is not None,
+                        **self.stats["process"].snapshot()}
+        }
@@ -0,0 +1,218 @@
+"""
+Offline GeoIP/ASN lookups from local IP range databases.
+"""
+import bisect
+import csv
+import ipaddress
+import socket
+from array import array
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Header names recognised in range CSVs (DB-IP, IP2Location LITE, GeoLite2 ASN and similar exports)
+START_COLUMNS = ("start", "start_ip", "ip_from", "range_start", "first")
+END_COLUMNS = ("end", "end_ip", "ip_to", "range_end", "last")
+NETWORK_COLUMNS = ("network", "cidr", "prefix")
+COUNTRY_COLUMNS = ("country", "country_code", "country_iso_code", "cc")
+ASN_COLUMNS = ("asn", "autonomous_system_number", "as_number")
+ORGANIZATION_COLUMNS = ("as_org", "as_name", "org", "organization", "autonomous_system_organization")
+BLOCK_BITS = 16  # Leading address bits of the lookup table in front of each range index
+BLOCK_COUNT = 1 << BLOCK_BITS
+
+
+class GeoInfo(NamedTuple):
+    """Country and autonomous system of an address; any part may be unknown."""
+    
+    country: Optional[str] = None
+    asn: Optional[int] = None
+    organization: Optional[str] = None
+    
+    def merge(self, other: "GeoInfo") -> "GeoInfo":
+        """Fill unknown fields from ``other``."""
+        return GeoInfo(self.country or other.country, self.asn or other.asn,
+                       self.organization or other.organization)
+
+
+def format_geo(info: Optional[GeoInfo]) -> Optional[str]:
+    """Render e.g. ``DE · AS3320 Deutsche Telekom``, or None if nothing is known."""
+    if info is None:
+        return None
+    parts = []
+    if info.country:
+        parts.append(info.country)
+    if info.asn:
+        parts.append(f"AS{info.asn} {info.organization}" if info.organization else f"AS{info.asn}")
+    return " · ".join(parts) or None
+
+
+def _ip_value(text: str) -> Tuple[int, int]:
+    """Parse an IP (or an integer as IP2Location stores them) into (version, integer value)."""
+    text = text.strip()
+    if text.isdigit():
+        value = int(text)
+        return (4 if value < 1 << 32 else 6), value
+    for version, family in ((4, socket.AF_INET), (6, socket.AF_INET6)):
+        try:
+            return version, int.from_bytes(socket.inet_pton(family, text), "big")
+        except OSError:
+            pass
+    raise ValueError(f"Invalid IP address: {text}")
+
+
+class RangeIndex:
+    """Sorted, non-overlapping address ranges of one IP family, searched with bisect.
+    
+    Range starts, ends and record ids live in parallel arrays (plain lists of
+    ints for IPv6, whose values exceed 64 bits), so a million ranges cost a few
+    megabytes rather than a million Python objects. A table indexed by the top
+    16 address bits narrows each binary search to the ranges in that block.
+    """
+    
+    __slots__ = ("starts", "ends", "records", "shift", "blocks")
+    
+    def __init__(self, ranges: List[Tuple[int, int, int]], typecode: Optional[str], bits: int):
+        ranges.sort()
+        starts, ends, records = [], [], []
+        last_end = -1
+        for start, end, record in ranges:
+            if start <= last_end:
+                continue  # Overlapping or nested range; the first one wins
+            starts.append(start)
+            ends.append(end)
+            records.append(record)
+            last_end = end
+        if typecode:
+            self.starts: Sequence[int] = array(typecode, starts)
+            self.ends: Sequence[int] = array(typecode, ends)
+        else:
+            self.starts, self.ends = starts, ends
+        self.records = array("I", records)
+        # blocks[p] is the first range starting in block p or later, so block p's candidates are
+        # blocks[p] - 1 (a range spilling in from below) up to blocks[p + 1] - 1
+        self.shift = bits - BLOCK_BITS
+        self.blocks = array("I", (bisect.bisect_left(starts, p << self.shift) for p in range(BLOCK_COUNT + 1)))
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def find(self, value: int) -> int:
+        """Return the record id of the range containing ``value``, or -1."""
+        block = value >> self.shift
+        i = bisect.bisect_right(self.starts, value, self.blocks[block], self.blocks[block + 1]) - 1
+        if i >= 0 and value <= self.ends[i]:
+            return self.records[i]
+        return -1
+
+
+class GeoIPDatabase:
+    """Address -> ``GeoInfo`` from one or more range CSV files, with an LRU cache in front.
+    
+    Each file gets its own pair of IPv4/IPv6 indexes, so a country database
+    and an ASN database can be combined; their answers are merged. Repeated
+    lookups (the common case, since the same attackers keep coming back) are
+    served from the cache in well under a microsecond.
+    """
+    
+    def __init__(self, cache_size: int = 65536):
+        self.records: List[GeoInfo] = []
+        self._record_ids: Dict[GeoInfo, int] = {}
+        self._indexes: List[Tuple[RangeIndex, RangeIndex]] = []
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+    
+    @property
+    def range_count(self) -> int:
+        """Ranges across every loaded file."""
+        return sum(len(v4) + len(v6) for v4, v6 in self._indexes)
+    
+    def _record_id(self, info: GeoInfo) -> int:
+        record_id = self._record_ids.get(info)
+        if record_id is None:
+            record_id = self._record_ids[info] = len(self.records)
+            self.records.append(info)
+        return record_id
+    
+    def load_csv(self, path: str) -> int:
+        """Load a range CSV. Returns the number of ranges read.
+        
+        Files with a header are matched by column name; headerless files are
+        read as ``start,end,country`` or ``start,end,asn,organization``.
+        """
+        ranges: Dict[int, List[Tuple[int, int, int]]] = {4: [], 6: []}
+        with open(path, newline="", encoding="utf-8", errors="replace") as f:
+            reader = csv.reader(f)
+            columns = None
+            for row in reader:
+                if not row or row[0].startswith("#"):
+                    continue
+                if columns is None:
+                    columns = self._columns(row)
+                    if columns.pop("header", False):
+                        continue
+                try:
+                    ip_range = self._parse_range(row, columns)
+                except (ValueError, IndexError):
+                    continue
+                version, start, end = ip_range
+                country = row[columns["country"]].strip().upper() if "country" in columns else None
+                asn_text = row[columns["asn"]].strip().upper().lstrip("AS") if "asn" in columns else ""
+                organization = row[columns["organization"]].strip() if "organization" in columns else None
+                info = GeoInfo(country or None, int(asn_text) if asn_text.isdigit() else None, organization or None)
+                ranges[version].append((start, end, self._record_id(info)))
+        
+        self._indexes.append((RangeIndex(ranges[4], "I", 32), RangeIndex(ranges[6], None, 128)))
+        self.lookup.cache_clear()
+        return len(ranges[4]) + len(ranges[6])
+    
+    @staticmethod
+    def _columns(first_row: List[str]) -> Dict[str, int]:
+        """Map field names to column positions from a header row, or guess them for headerless files."""
+        names = [name.strip().lower() for name in first_row]
+        columns: Dict[str, int] = {}
+        for field, candidates in (("start", START_COLUMNS), ("end", END_COLUMNS), ("network", NETWORK_COLUMNS),
+                                  ("country", COUNTRY_COLUMNS), ("asn", ASN_COLUMNS),
+                                  ("organization", ORGANIZATION_COLUMNS)):
+            position = next((names.index(name) for name in candidates if name in names), None)
+            if position is not None:
+                columns[field] = position
+        if "network" in columns or "start" in columns:
+            columns["header"] = True
+            return columns
+        # No header: start,end then either a country code or an AS number and name
+        columns = {"start": 0, "end": 1}
+        if len(first_row) > 2:
+            if first_row[2].strip().upper().lstrip("AS").isdigit():
+                columns["asn"] = 2
+                if len(first_row) > 3:
+                    columns["organization"] = 3
+            else:
+                columns["country"] = 2
+        return columns
+    
+    @staticmethod
+    def _parse_range(row: List[str], columns: Dict[str, int]) -> Tuple[int, int, int]:
+        if "network" in columns:
+            network = ipaddress.ip_network(row[columns["network"]].strip(), strict=False)
+            return network.version, int(network.network_address), int(network.broadcast_address)
+        version, start = _ip_value(row[columns["start"]])
+        end_version, end = _ip_value(row[columns["end"]])
+        if end_version != version or end < start:
+            raise ValueError("Invalid range")
+        return version, start, end
+    
+    def _lookup(self, address: str) -> Optional[GeoInfo]:
+        """Uncached lookup of an IP or CIDR network address; hostnames are not resolved."""
+        host = address.partition("/")[0]
+        try:
+            version, value = 4, int.from_bytes(socket.inet_pton(socket.AF_INET, host), "big")
+        except OSError:
+            try:
+                version, value = 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, host), "big")
+            except OSError:
+                return None
+        result: Optional[GeoInfo] = None
+        for v4, v6 in self._indexes:
+            record_id = (v4 if version == 4 else v6).find(value)
+            if record_id >= 0:
+                info = self.records[record_id]
+                result = info if result is None else result.merge(info)
+        return result
@@ -0,0 +1,31 @@
+"""
+Length-prefixed JSON frames over asyncio streams, for gateway/worker messages.
+"""
+import asyncio
+import struct
+from typing import Any, Optional
+
+from utils import json_codec
+
+HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+def encode_frame(message: Any) -> bytes:
+    """Serialize ``message`` into one frame: a 4-byte big-endian length, then JSON."""
+    body = json_codec.dumps(message).encode()
+    if len(body) > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {len(body)} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+    return HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Any]:
+    """Read and decode the next frame, or return None at end of stream."""
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+    return json_codec.loads(await reader.readexactly(length))
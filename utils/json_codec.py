@@ -0,0 +1,40 @@
+"""
+JSON encoding and decoding, using orjson when it is installed.
+"""
+import json
+from datetime import datetime
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library is always available
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson else "json"
+
+
+def _default(value: Any) -> Any:
+    """Encode the extra types orjson handles natively, so both backends agree."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+    
+    def dumps(value: Any) -> str:
+        """Serialize ``value`` to a compact JSON string."""
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS).decode()
+    
+    def loads(data: Union[str, bytes]) -> Any:
+        """Deserialize a JSON document."""
+        return orjson.loads(data)
+else:
+    def dumps(value: Any) -> str:
+        """Serialize ``value`` to a compact JSON string."""
+        return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False)
+    
+    def loads(data: Union[str, bytes]) -> Any:
+        """Deserialize a JSON document."""
+        return json.loads(data)
@@ -21,7 +21,8 @@ def setup_logger():
         colorize=True
     )
     
-    # Add file logging
+    # Add file logging; enqueue hands writes (and the zip compression on rotation) to a
+    # background thread, so a rotation never stalls the event loop
     os.makedirs(os.path.dirname(config.LOG_FILE), exist_ok=True)
     logger.add(
         sink=config.LOG_FILE,
@@ -29,7 +30,8 @@ def setup_logger():
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
         rotation="10 MB",
         retention="7 days",
-        compression="zip"
+        compression="zip",
+        enqueue=True
     )
     
     return logger
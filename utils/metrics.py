@@ -0,0 +1,158 @@
+"""
+Lightweight throughput and per-process resource metrics.
+"""
+import bisect
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import psutil
+
+
+class RateMeter:
+    """Event rate over a sliding window, kept as one counter per second."""
+    
+    def __init__(self, window_seconds: int = 60):
+        self.window_seconds = window_seconds
+        self.total = 0
+        self._buckets: Deque[List[int]] = deque()  # [second, count], oldest first
+    
+    def _expire(self, second: int) -> None:
+        buckets = self._buckets
+        while buckets and buckets[0][0] <= second - self.window_seconds:
+            buckets.popleft()
+    
+    def add(self, count: int = 1, now: Optional[float] = None) -> None:
+        """Record ``count`` events."""
+        second = int(time.monotonic() if now is None else now)
+        self.total += count
+        buckets = self._buckets
+        if buckets and buckets[-1][0] == second:
+            buckets[-1][1] += count
+            return
+        buckets.append([second, count])
+        self._expire(second)
+    
+    def rate(self, now: Optional[float] = None) -> float:
+        """Mean events per second over the window."""
+        second = int(time.monotonic() if now is None else now)
+        self._expire(second)
+        return sum(count for _, count in self._buckets) / self.window_seconds
+
+
+class SampleRing:
+    """Fixed-capacity ring of timestamped samples; the oldest is overwritten once full."""
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._times = [0.0] * capacity
+        self._values = [0.0] * capacity
+        self._next = 0
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def add(self, value: float, now: Optional[float] = None) -> None:
+        """Record a sample, taken at ``now`` (monotonic seconds)."""
+        self._times[self._next] = time.monotonic() if now is None else now
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+    
+    def latest(self) -> Optional[float]:
+        """The most recent sample, or None if there are none."""
+        return self._values[self._next - 1] if self._count else None
+    
+    def summary(self, seconds: float, now: Optional[float] = None) -> Optional[Tuple[float, float, float]]:
+        """Min, mean and max of the samples from the last ``seconds``, or None if there are none."""
+        cutoff = (time.monotonic() if now is None else now) - seconds
+        low = high = total = 0.0
+        count = 0
+        index = self._next
+        for _ in range(self._count):
+            index = (index - 1) % self.capacity
+            if self._times[index] < cutoff:
+                break
+            value = self._values[index]
+            if not count or value < low:
+                low = value
+            if not count or value > high:
+                high = value
+            total += value
+            count += 1
+        return (low, total / count, high) if count else None
+
+
+class LatencyHistogram:
+    """Counts of latencies in fixed buckets, for cheap percentiles over an unbounded number of samples."""
+    
+    BOUNDS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)  # The last bucket is everything above the top bound
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+    
+    def record(self, seconds: float) -> None:
+        """Record one latency."""
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound in ms of the bucket holding the given percentile (the max for the top bucket)."""
+        if not self.total:
+            return None
+        rank = fraction * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return float(self.BOUNDS_MS[index]) if index < len(self.BOUNDS_MS) else round(self.max_ms, 1)
+        return round(self.max_ms, 1)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Count, mean, p50/p95/p99 and max in ms, plus the raw bucket counts."""
+        buckets = {f"<={bound}": count for bound, count in zip(self.BOUNDS_MS, self.counts)}
+        buckets[f">{self.BOUNDS_MS[-1]}"] = self.counts[-1]
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum_ms / self.total, 1) if self.total else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": buckets
+        }
+
+
+class ProcessMetrics:
+    """CPU and memory of the current process, for comparing gateway and worker load."""
+    
+    def __init__(self):
+        self.process = psutil.Process(os.getpid())
+        self.process.cpu_percent()  # The first call only sets the baseline
+        self.started = time.monotonic()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """CPU use since the previous snapshot, resident memory and uptime."""
+        return {
+            "pid": self.process.pid,
+            "cpu_percent": self.process.cpu_percent(),
+            "rss_mb": round(self.process.memory_info().rss / 1024 / 1024, 1),
+            "uptime": round(time.monotonic() - self.started, 1)
+        }
+
+    def open_fds(self) -> Optional[int]:
+        """Open file descriptors (handles on Windows), or None if unavailable."""
+        try:
+            if hasattr(self.process, "num_fds"):
+                return self.process.num_fds()
+            return self.process.num_handles()
+        except (psutil.Error, AttributeError):
+            return None
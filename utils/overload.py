@@ -0,0 +1,63 @@
+"""
+Degradation levels and the hysteresis controller that picks one from load signals.
+"""
+from typing import Optional, Sequence
+
+# Levels are cumulative: each one also sheds everything the levels below it shed
+NORMAL = 0
+DEFER_PURGES = 1  # Ban history purges wait until load returns to normal
+DROP_COSMETIC = 2  # No elimination GIFs, ban logs or match notices in the log channel
+SKIP_COMMANDS = 3  # Prefix commands in on_message are ignored
+ESSENTIAL_ONLY = 4  # Only honeypot and content-pattern deletes and bans run
+LEVEL_NAMES = ("normal", "defer_purges", "drop_cosmetic", "skip_commands", "essential_only")
+
+
+def parse_thresholds(value: str) -> Sequence[float]:
+    """Parse a comma-separated list of per-level thresholds, one for each level above normal."""
+    thresholds = [float(part) for part in value.split(",") if part.strip()]
+    if len(thresholds) != len(LEVEL_NAMES) - 1:
+        raise ValueError(f"Expected {len(LEVEL_NAMES) - 1} thresholds, got {len(thresholds)}: {value!r}")
+    return thresholds
+
+
+class OverloadController:
+    """Maps in-flight handler count and event-loop lag to a degradation level.
+    
+    A level is due when either signal reaches that level's threshold. The
+    controller escalates straight to the highest due level, but steps down
+    only one level at a time, and only after the load has stayed below the
+    current level for ``cooldown`` seconds, so it doesn't flap mid-raid.
+    """
+    
+    def __init__(self, in_flight_thresholds: Sequence[float], lag_thresholds: Sequence[float], cooldown: float):
+        self.in_flight_thresholds = in_flight_thresholds
+        self.lag_thresholds = lag_thresholds
+        self.cooldown = cooldown
+        self.level = NORMAL
+        self._calm_since: Optional[float] = None
+    
+    def due_level(self, in_flight: int, lag: float) -> int:
+        """The highest level whose in-flight or lag (seconds) threshold is reached."""
+        level = NORMAL
+        for index, (in_flight_limit, lag_limit) in enumerate(zip(self.in_flight_thresholds, self.lag_thresholds), 1):
+            if in_flight >= in_flight_limit or lag >= lag_limit:
+                level = index
+        return level
+    
+    def update(self, in_flight: int, lag: float, now: float) -> Optional[int]:
+        """Feed the latest signals. Returns the new level if it changed, else None."""
+        due = self.due_level(in_flight, lag)
+        if due > self.level:
+            self.level = due
+            self._calm_since = None
+            return due
+        if due == self.level:
+            self._calm_since = None
+            return None
+        if self._calm_since is None:
+            self._calm_since = now
+        elif now - self._calm_since >= self.cooldown:
+            self.level -= 1
+            self._calm_since = now  # Restart the cooldown for the next step down
+            return self.level
+        return None
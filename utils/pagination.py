@@ -0,0 +1,98 @@
+"""
+Keyset (cursor) pagination helpers shared by in-memory stores and the database.
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Cursor = Tuple[Any, int]  # (sort value, row id)
+
+
+def build_page(rows: List[Any], limit: int, cursor: Optional[Cursor], direction: str,
+               key: Callable[[Any], Cursor]) -> Dict[str, Any]:
+    """Assemble a page from up to ``limit + 1`` rows fetched in travel order.
+    
+    Pages are always returned newest/highest first. ``next`` walks towards lower
+    keys and ``prev`` towards higher keys, so ``prev`` rows arrive reversed.
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == "prev":
+        rows.reverse()
+        prev_cursor = key(rows[0]) if rows and has_more else None
+        next_cursor = key(rows[-1]) if rows else None
+    else:
+        next_cursor = key(rows[-1]) if rows and has_more else None
+        prev_cursor = key(rows[0]) if rows and cursor is not None else None
+    return {
+        "items": rows,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
+    }
+
+
+class KeysetIndex:
+    """Sorted index of ``(sort value, id)`` keys supporting O(page size) keyset pages."""
+    
+    def __init__(self, keys: Optional[List[Cursor]] = None):
+        self._keys: List[Cursor] = sorted(keys) if keys else []
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def add(self, key: Cursor) -> None:
+        """Insert a key, keeping the index sorted."""
+        insort(self._keys, key)
+    
+    def remove(self, key: Cursor) -> bool:
+        """Remove a key if present."""
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+            return True
+        return False
+    
+    def clear(self) -> None:
+        """Remove every key."""
+        self._keys.clear()
+    
+    def at_least(self, floor: Cursor) -> List[Cursor]:
+        """Keys greater than or equal to ``floor``, ascending, found without scanning the rest."""
+        return self._keys[bisect_left(self._keys, floor):]
+    
+    def count_at_least(self, floor: Cursor) -> int:
+        """Number of keys greater than or equal to ``floor``, by binary search."""
+        return len(self._keys) - bisect_left(self._keys, floor)
+    
+    def page(self, limit: int, cursor: Optional[Cursor] = None, direction: str = "next",
+             predicate: Optional[Callable[[Cursor], bool]] = None,
+             floor: Optional[Cursor] = None, max_visited: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Return a page of keys in descending order.
+        
+        The cursor is located by binary search, so only the keys on the page are
+        visited (plus any skipped by ``predicate``), regardless of index size.
+        Keys below ``floor`` are excluded without being scanned. Returns None
+        if filling the page would visit more than ``max_visited`` keys.
+        """
+        keys = self._keys
+        lowest = bisect_left(keys, floor) if floor is not None else 0
+        found: List[Cursor] = []
+        if direction == "prev":
+            i = bisect_right(keys, cursor) if cursor is not None else len(keys)
+            i = max(i, lowest)
+            stop = len(keys) if max_visited is None else min(len(keys), i + max_visited)
+            while i < stop and len(found) <= limit:
+                if predicate is None or predicate(keys[i]):
+                    found.append(keys[i])
+                i += 1
+            if i < len(keys) and len(found) <= limit:
+                return None
+        else:
+            i = (bisect_left(keys, cursor) if cursor is not None else len(keys)) - 1
+            stop = lowest if max_visited is None else max(lowest, i - max_visited + 1)
+            while i >= stop and len(found) <= limit:
+                if predicate is None or predicate(keys[i]):
+                    found.append(keys[i])
+                i -= 1
+            if i >= lowest and len(found) <= limit:
+                return None
+        return build_page(found, limit, cursor, direction, key=lambda k: k)
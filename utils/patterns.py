@@ -0,0 +1,195 @@
+"""
+Multi-pattern content matching: an Aho-Corasick automaton for phrases plus one combined regex.
+"""
+import re
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from utils.json_codec import loads
+
+ACTIONS = ("log", "delete", "ban")  # Ascending severity
+# Words and single punctuation marks, so "discord.gg" is three tokens
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+# Numbered backreferences and group conditionals; group numbers shift once regexes are combined
+NUMBERED_GROUP_REFERENCE = re.compile(r"(?<!\\)(?:\\\\)*(?:\\[1-9]|\(\?\(\d)")
+
+
+def normalize(text: str) -> str:
+    """Lower-case ``text`` and collapse whitespace, so regexes match however it is spaced."""
+    return " ".join(text.lower().split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word and punctuation tokens of ``text``."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class ContentPattern(NamedTuple):
+    """One phrase or regex and the action to take when it matches."""
+    
+    name: str
+    pattern: str
+    action: str
+    regex: bool = False
+
+
+class PatternMatch(NamedTuple):
+    """The most severe pattern found in a message."""
+    
+    pattern: ContentPattern
+    text: str  # The matched phrase, or the part of the normalized message a regex matched
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over token sequences; finds every phrase in one pass.
+    
+    Phrases are matched token by token rather than character by character:
+    a message is a few dozen steps instead of a few hundred, the automaton has
+    several times fewer states, and phrases only match whole words. States are
+    list indices with one dict of transitions each. Output sets are merged
+    along failure links at build time, so matching never walks them.
+    """
+    
+    def __init__(self, phrases: Iterable[Tuple[Sequence[str], int]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._count = 0
+        for phrase, value in phrases:
+            if phrase:
+                self._add(phrase, value)
+        self._build_failure_links()
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def state_count(self) -> int:
+        """Number of automaton states."""
+        return len(self._goto)
+    
+    def _add(self, phrase: Sequence[str], value: int) -> None:
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (value,)
+        self._count += 1
+    
+    def _build_failure_links(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                target = goto[link].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] += out[fail[nxt]]
+    
+    def search(self, tokens: Sequence[str]) -> List[int]:
+        """Values of all phrases occurring in ``tokens``, in order of where they end."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: List[int] = []
+        state = 0
+        for token in tokens:
+            nxt = goto[state].get(token)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(token)
+            state = nxt or 0
+            if out[state]:
+                found.extend(out[state])
+        return found
+
+
+class PatternSet:
+    """Compiled phrases and regexes; ``match`` returns the most severe hit in a message.
+    
+    Phrases go into one Aho-Corasick automaton, so their cost per message does
+    not grow with their number; they match whole words, case-insensitively.
+    Regexes are joined into one pattern per action, with a named group each,
+    and run on the lower-cased message most severe action first, so a less
+    severe alternative can't hide a more severe one at the same position;
+    keep them few, since the regex engine still tries every alternative at
+    every position.
+    """
+    
+    def __init__(self, patterns: List[ContentPattern]):
+        self.patterns = patterns
+        self._severity = [ACTIONS.index(p.action) for p in patterns]
+        self.phrases = AhoCorasick(
+            (tokenize(p.pattern), i) for i, p in enumerate(patterns) if not p.regex
+        )
+        # (severity, combined regex), most severe first
+        self.regexes: List[Tuple[int, "re.Pattern[str]"]] = []
+        for severity in reversed(range(len(ACTIONS))):
+            regexes = [f"(?P<p{i}>{p.pattern})" for i, p in enumerate(patterns)
+                       if p.regex and self._severity[i] == severity]
+            if regexes:
+                self.regexes.append((severity, re.compile("|".join(regexes), re.IGNORECASE)))
+    
+    def __len__(self) -> int:
+        return len(self.patterns)
+    
+    def match(self, content: str) -> Optional[PatternMatch]:
+        """The most severe pattern found in ``content``, or None."""
+        best, best_text = -1, ""
+        severity = self._severity
+        for index in self.phrases.search(tokenize(content)):
+            if best < 0 or severity[index] > severity[best]:
+                best, best_text = index, self.patterns[index].pattern
+        if self.regexes:
+            text = normalize(content)
+            for regex_severity, regex in self.regexes:
+                if best >= 0 and severity[best] >= regex_severity:
+                    break
+                found = regex.search(text)
+                if found is not None:
+                    best, best_text = int(found.lastgroup[1:]), found.group()
+                    break
+        if best < 0:
+            return None
+        return PatternMatch(self.patterns[best], best_text)
+
+
+def parse_patterns(data: str) -> List[ContentPattern]:
+    """Parse a JSON list of ``{"pattern", "action", "regex", "name"}`` objects.
+    
+    Raises ValueError naming the first invalid entry, so a bad edit can be
+    rejected as a whole.
+    """
+    entries = loads(data)
+    if not isinstance(entries, list):
+        raise ValueError("Pattern file must contain a JSON list")
+    patterns = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not isinstance(entry.get("pattern"), str) or not entry["pattern"]:
+            raise ValueError(f"Pattern {i}: missing \"pattern\"")
+        action = entry.get("action", "log")
+        if action not in ACTIONS:
+            raise ValueError(f"Pattern {i}: action must be one of {', '.join(ACTIONS)}")
+        is_regex = bool(entry.get("regex", False))
+        if is_regex:
+            try:
+                compiled = re.compile(entry["pattern"])
+            except re.error as e:
+                raise ValueError(f"Pattern {i}: invalid regex: {e}")
+            if compiled.groupindex:
+                raise ValueError(f"Pattern {i}: named groups are not allowed in regexes")
+            if NUMBERED_GROUP_REFERENCE.search(entry["pattern"]):
+                raise ValueError(f"Pattern {i}: numbered backreferences are not allowed in regexes")
+            if compiled.match(""):
+                raise ValueError(f"Pattern {i}: regex matches empty text")
+        patterns.append(ContentPattern(str(entry.get("name") or entry["pattern"]), entry["pattern"], action, is_regex))
+    return patterns
@@ -0,0 +1,64 @@
+"""
+Cache of prebuilt command responses, invalidated by tag when the data behind them changes.
+"""
+from typing import Any, Callable, Dict, Iterable, Set
+
+from utils.logger import logger
+
+
+class ResponseCache:
+    """Built responses (embeds, field text) keyed by name, each with hit and build counters.
+    
+    ``get`` returns the cached value or builds and stores it. Entries carry
+    tags such as ``"guilds"`` or ``"services"``; events call ``invalidate``
+    with a tag to drop every entry built from that data, and the next
+    ``get`` rebuilds it. Entries with no data tags are static and only
+    dropped when the cog that owns them (also a tag) unloads.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[str, Any] = {}
+        self._tags: Dict[str, Set[str]] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+    
+    def get(self, key: str, build: Callable[[], Any], tags: Iterable[str] = ()) -> Any:
+        """Return the response cached under ``key``, building it first on a miss."""
+        stats = self.stats.setdefault(key, {"hits": 0, "builds": 0, "invalidations": 0})
+        if key in self._entries:
+            stats["hits"] += 1
+            return self._entries[key]
+        value = build()
+        stats["builds"] += 1
+        self._entries[key] = value
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        return value
+    
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry carrying any of ``tags``. Returns the number dropped."""
+        dropped = 0
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                if self._entries.pop(key, None) is not None:
+                    self.stats[key]["invalidations"] += 1
+                    dropped += 1
+        if dropped:
+            logger.debug(f"Invalidated {dropped} cached responses for {', '.join(tags)}")
+        return dropped
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._tags.clear()
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Entry count, overall hit rate and per-key counters."""
+        hits = sum(stats["hits"] for stats in self.stats.values())
+        builds = sum(stats["builds"] for stats in self.stats.values())
+        return {
+            "entries": len(self._entries),
+            "hits": hits,
+            "builds": builds,
+            "hit_rate": round(hits / (hits + builds), 3) if hits + builds else None,
+            "keys": {key: dict(stats) for key, stats in self.stats.items()}
+        }
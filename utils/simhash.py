@@ -0,0 +1,136 @@
+"""
+SimHash fingerprints and a time-bounded near-duplicate index for short texts.
+"""
+import re
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+TOKEN_PATTERN = re.compile(r"\w+")
+MAX_TOKENS = 4096  # Keeps every per-bit count below 2**15, inside its 16-bit lane
+MAX_AUTHOR_ENTRIES = 50  # Recent messages compared per author
+_LANE_BITS = 16
+_MASK64 = (1 << 64) - 1
+# Bit k of a byte value spread into the 16-bit lane k
+_BYTE_LANES = [sum(((value >> k) & 1) << (_LANE_BITS * k) for k in range(8)) for value in range(256)]
+_LANES_PER_LANE_SET = sum(1 << (_LANE_BITS * i) for i in range(64))
+# Lane high bytes >= 0x80 (count above threshold) become b"1", the rest b"0"
+_HIGH_BIT_TABLE = bytes(0x31 if value >= 0x80 else 0x30 for value in range(256))
+_TOKEN_CACHE_LIMIT = 50000
+_token_cache: Dict[str, int] = {}  # Chat vocabulary repeats a lot; most tokens hit this
+
+
+def _token_lanes(token: str) -> int:
+    """A token's 64 hash bits spread into 64 lanes, so bit counts can be summed with one addition."""
+    cache = _token_cache
+    lanes = cache.get(token)
+    if lanes is None:
+        if len(cache) >= _TOKEN_CACHE_LIMIT:
+            cache.clear()
+        h = hash(token) & _MASK64
+        lanes = 0
+        for byte_index in range(8):
+            lanes |= _BYTE_LANES[(h >> (8 * byte_index)) & 0xFF] << (_LANE_BITS * 8 * byte_index)
+        cache[token] = lanes
+    return lanes
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens of ``text``."""
+    return TOKEN_PATTERN.findall(text.lower())[:MAX_TOKENS]
+
+
+def simhash(tokens: List[str]) -> int:
+    """64-bit SimHash of a token list: bit i is set when most tokens' hashes have bit i set.
+    
+    Per-bit counts are kept in 16-bit lanes of one big integer, so each token
+    costs a single addition and the majority vote for all 64 bits is done
+    with bytes operations rather than a Python loop per bit.
+    """
+    if not tokens:
+        return 0
+    total = 0
+    for token in tokens:
+        total += _token_lanes(token)
+    # Lift every lane by 0x8000 - threshold: lanes reaching the threshold get their high bit set
+    threshold = len(tokens) // 2 + 1
+    total += (0x8000 - threshold) * _LANES_PER_LANE_SET
+    high_bytes = total.to_bytes(64 * 2, "little")[1::2]
+    return int(high_bytes.translate(_HIGH_BIT_TABLE)[::-1], 2)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+class IndexedText(NamedTuple):
+    """One fingerprinted message in a ``NearDuplicateIndex``."""
+    
+    timestamp: float
+    fingerprint: int
+    author_id: int
+    channel_id: int
+
+
+class NearDuplicateIndex:
+    """Recent fingerprints per author, evicted by age and total count.
+    
+    Entries sit in one deque in arrival order and in a per-author deque, so a
+    new message is compared only against its author's recent messages, and
+    expiry pops from the left of both, O(1) per entry. Each author keeps at
+    most ``MAX_AUTHOR_ENTRIES`` so one flooder cannot make checks quadratic.
+    """
+    
+    def __init__(self, window_seconds: float, max_entries: int = 10000, max_distance: int = 12):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._entries: Deque[IndexedText] = deque()
+        self._by_author: Dict[int, Deque[IndexedText]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _evict(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        entries = self._entries
+        while entries and (entries[0].timestamp <= cutoff or len(entries) >= self.max_entries):
+            entry = entries.popleft()
+            recent = self._by_author.get(entry.author_id)
+            # The author's deque may already have dropped it when it hit the per-author cap
+            if recent and recent[0] is entry:
+                recent.popleft()
+                if not recent:
+                    del self._by_author[entry.author_id]
+    
+    def add(self, entry: IndexedText) -> List[IndexedText]:
+        """Index ``entry`` and return its author's earlier messages that are near-duplicates of it."""
+        self._evict(entry.timestamp)
+        recent = self._by_author.get(entry.author_id)
+        if recent is None:
+            recent = self._by_author[entry.author_id] = deque(maxlen=MAX_AUTHOR_ENTRIES)
+        fingerprint = entry.fingerprint
+        max_distance = self.max_distance
+        matches = [other for other in recent if bin(fingerprint ^ other.fingerprint).count("1") <= max_distance]
+        recent.append(entry)
+        self._entries.append(entry)
+        return matches
+
+
+class SpreadMatch(NamedTuple):
+    """An author whose near-duplicate messages span several channels."""
+    
+    author_id: int
+    channel_ids: List[int]
+    similar_messages: int  # The author's near-duplicates in the window
+
+
+def find_spread(index: NearDuplicateIndex, entry: IndexedText, min_channels: int) -> Optional[SpreadMatch]:
+    """Index ``entry`` and report its author if their near-duplicates now span ``min_channels`` channels."""
+    matches = index.add(entry)
+    channels = {entry.channel_id}
+    for other in matches:
+        channels.add(other.channel_id)
+    if len(channels) < min_channels:
+        return None
+    return SpreadMatch(entry.author_id, sorted(channels), len(matches))
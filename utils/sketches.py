@@ -0,0 +1,116 @@
+"""
+Bounded-memory streaming counters for heavy-hitter statistics.
+"""
+import heapq
+from collections import deque
+from typing import Deque, Dict, Hashable, List, Optional, Tuple
+
+
+class SpaceSaving:
+    """Space-Saving top-k sketch (Metwally et al.).
+    
+    Tracks at most ``capacity`` items. An unseen item replaces the current
+    minimum and inherits its count, so counts are overestimates by at most the
+    evicted minimum; any item more frequent than ``total / capacity`` is kept.
+    """
+    
+    __slots__ = ("capacity", "counts", "_heap")
+    
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self.counts: Dict[Hashable, int] = {}
+        # One (count, item) entry per tracked item; counts may lag behind self.counts
+        self._heap: List[Tuple[int, Hashable]] = []
+    
+    def __len__(self) -> int:
+        return len(self.counts)
+    
+    def add(self, item: Hashable, count: int = 1) -> None:
+        """Count ``count`` occurrences of ``item``."""
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+            return
+        if len(counts) < self.capacity:
+            counts[item] = count
+            heapq.heappush(self._heap, (count, item))
+            return
+        
+        # Pop stale heap entries (refreshing them) until the true minimum surfaces
+        heap = self._heap
+        while True:
+            heap_count, victim = heap[0]
+            current = counts[victim]
+            if heap_count == current:
+                break
+            heapq.heapreplace(heap, (current, victim))
+        del counts[victim]
+        counts[item] = current + count
+        heapq.heapreplace(heap, (current + count, item))
+    
+    def top(self, n: int) -> List[Tuple[Hashable, int]]:
+        """Return the ``n`` items with the highest counts."""
+        return heapq.nlargest(n, self.counts.items(), key=lambda entry: entry[1])
+
+
+class WindowedTopK:
+    """Heavy hitters over a sliding window, built from per-bucket Space-Saving sketches.
+    
+    Events land in the sketch for their time bucket; old buckets fall off the
+    left of a deque. A query merges only the buckets inside the window, so its
+    cost depends on ``bucket_count * capacity``, never on history size.
+    """
+    
+    def __init__(self, bucket_seconds: int, bucket_count: int, capacity: int = 200):
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = bucket_count
+        self.capacity = capacity
+        self._buckets: Deque[List] = deque()  # [bucket id, sketch, event total]
+    
+    def _bucket(self, timestamp: float) -> Optional[List]:
+        bucket_id = int(timestamp // self.bucket_seconds)
+        buckets = self._buckets
+        if buckets and buckets[-1][0] == bucket_id:
+            return buckets[-1]
+        if buckets and bucket_id < buckets[-1][0]:
+            # Late event: find its bucket, if it is still retained
+            for bucket in reversed(buckets):
+                if bucket[0] == bucket_id:
+                    return bucket
+                if bucket[0] < bucket_id:
+                    break
+            return None
+        bucket = [bucket_id, SpaceSaving(self.capacity), 0]
+        buckets.append(bucket)
+        self._expire(bucket_id)
+        return bucket
+    
+    def _expire(self, current_bucket: int) -> None:
+        while self._buckets and self._buckets[0][0] <= current_bucket - self.bucket_count:
+            self._buckets.popleft()
+    
+    def add(self, item: Hashable, timestamp: float, count: int = 1) -> None:
+        """Count ``count`` occurrences of ``item`` at ``timestamp`` (epoch seconds)."""
+        bucket = self._bucket(timestamp)
+        if bucket is not None:
+            bucket[1].add(item, count)
+            bucket[2] += count
+    
+    def clear(self) -> None:
+        """Drop every bucket."""
+        self._buckets.clear()
+    
+    def query(self, window_seconds: int, now: float, n: int = 10) -> Tuple[List[Tuple[Hashable, int]], int]:
+        """Return the top ``n`` items and the event total over the last ``window_seconds``."""
+        self._expire(int(now // self.bucket_seconds))
+        oldest = int((now - window_seconds) // self.bucket_seconds)
+        merged: Dict[Hashable, int] = {}
+        total = 0
+        for bucket_id, sketch, bucket_total in reversed(self._buckets):
+            if bucket_id <= oldest:
+                break
+            total += bucket_total
+            for item, count in sketch.counts.items():
+                merged[item] = merged.get(item, 0) + count
+        top = heapq.nlargest(n, merged.items(), key=lambda entry: entry[1])
+        return top, total
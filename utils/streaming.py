@@ -0,0 +1,135 @@
+"""
+Incremental parsers for line, CSV and JSON data arriving in chunks.
+"""
+import codecs
+import json
+from typing import Any, AsyncIterator, List
+
+from utils import json_codec
+
+
+async def iter_line_batches(chunks: AsyncIterator[bytes], encoding: str = "utf-8") -> AsyncIterator[List[str]]:
+    """Split a stream of byte chunks into batches of complete lines.
+    
+    One batch is yielded per chunk, so per-line work stays in tight loops
+    instead of paying async generator overhead for every line.
+    """
+    remainder = b""
+    async for chunk in chunks:
+        data = remainder + chunk
+        lines = data.split(b"\n")
+        remainder = lines.pop()
+        if lines:
+            yield [line.decode(encoding, errors="replace").rstrip("\r") for line in lines]
+    if remainder:
+        yield [remainder.decode(encoding, errors="replace").rstrip("\r")]
+
+
+class JSONArrayDecoder:
+    """Incrementally decode the elements of a top-level JSON array.
+    
+    Feed text as it arrives; each call returns the elements completed so far.
+    Only the partially received element is kept in the buffer.
+    """
+    
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self.done = False
+    
+    def feed(self, text: str, final: bool = False) -> List[Any]:
+        """Add text to the buffer and return newly completed elements."""
+        buffer = self._buffer + text
+        items = []
+        pos = 0
+        length = len(buffer)
+        while not self.done:
+            while pos < length and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= length:
+                break
+            if not self._started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                self._started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                self.done = True
+                pos += 1
+                break
+            try:
+                item, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break  # Element is not complete yet
+            if end == length and not final:
+                break  # A number at the end of the buffer may still be growing
+            items.append(item)
+            pos = end
+        self._buffer = buffer[pos:]
+        return items
+
+
+class PeekableStream:
+    """Async iterator wrapper that can peek at the first non-empty chunk."""
+    
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._peeked: List[bytes] = []
+    
+    async def peek(self):
+        """Return the first chunk with non-whitespace content without consuming it."""
+        async for chunk in self._chunks:
+            self._peeked.append(chunk)
+            if chunk.strip():
+                return chunk
+        return None
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> bytes:
+        if self._peeked:
+            return self._peeked.pop(0)
+        return await self._chunks.__anext__()
+
+
+def _loads_or_none(line: str) -> Any:
+    """Decode one NDJSON line, or return None if it isn't valid JSON."""
+    try:
+        return json_codec.loads(line)
+    except ValueError:
+        return None
+
+
+async def iter_json_batches(chunks: AsyncIterator[bytes], encoding: str = "utf-8") -> AsyncIterator[List[Any]]:
+    """Decode a JSON array or NDJSON stream into batches of values.
+    
+    The format is detected from the first non-whitespace character: ``[``
+    starts a streamed array, anything else is treated as one value per line.
+    NDJSON lines that fail to decode are yielded as ``None``.
+    """
+    chunks = PeekableStream(chunks)
+    first = await chunks.peek()
+    if first is None:
+        return
+    
+    if first.lstrip()[:1] == b"[":
+        decoder = JSONArrayDecoder()
+        # Holds back partial multi-byte characters split across chunks
+        text_decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        async for chunk in chunks:
+            items = decoder.feed(text_decoder.decode(chunk))
+            if items:
+                yield items
+        items = decoder.feed(text_decoder.decode(b"", final=True), final=True)
+        if items:
+            yield items
+    else:
+        async for lines in iter_line_batches(chunks, encoding):
+            items = [_loads_or_none(line) for line in lines if line.strip()]
+            if items:
+                yield items
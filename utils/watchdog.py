@@ -0,0 +1,137 @@
+"""
+Event-loop stall detection from a watchdog thread, with stack capture of the blocking call.
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from utils.logger import logger
+
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+RECENT_INCIDENTS = 50  # Individual stalls kept for the admin command
+LONG_STALL_FACTOR = 20  # Log a still-running stall once it reaches this many thresholds
+
+
+def _call_site(frames: List[traceback.FrameSummary]) -> str:
+    """The innermost frame in this project's code, i.e. where the blocking call was made."""
+    for frame in reversed(frames):
+        if frame.filename.startswith(PROJECT_ROOT) and "site-packages" not in frame.filename:
+            return f"{Path(frame.filename).relative_to(PROJECT_ROOT)}:{frame.lineno} in {frame.name}"
+    frame = frames[-1] if frames else None
+    return f"{frame.filename}:{frame.lineno} in {frame.name}" if frame else "unknown"
+
+
+class LoopWatchdog:
+    """Detects event-loop stalls longer than ``threshold`` seconds.
+    
+    The loop reschedules a heartbeat callback every ``interval`` seconds; a
+    daemon thread checks the last heartbeat and, once it is overdue by more
+    than ``threshold``, captures the loop thread's stack. When the loop
+    catches up the stall is recorded against its call site with its
+    duration. The loop side costs one timer callback per interval, and
+    stacks are only walked when a stall is detected.
+    """
+    
+    def __init__(self, threshold: float, interval: float = 0.1):
+        self.threshold = threshold
+        self.interval = interval
+        self.sites: Dict[str, Dict[str, Any]] = {}
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=RECENT_INCIDENTS)
+        self.total_stalls = 0
+        self.total_blocked = 0.0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_beat = 0.0
+    
+    def start(self) -> None:
+        """Start watching the running event loop; call from the loop's thread."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._beat()
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the heartbeat and the watchdog thread."""
+        self._stop.set()
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+    
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()
+        self._handle = self._loop.call_later(self.interval, self._beat)
+    
+    def _capture(self) -> List[traceback.FrameSummary]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        return traceback.extract_stack(frame) if frame else []
+    
+    def _watch(self) -> None:
+        """Watchdog thread: poll the heartbeat, capture stacks of stalls and record them when they end."""
+        check_interval = max(self.threshold / 2, 0.01)
+        stalled_beat: Optional[float] = None
+        frames: List[traceback.FrameSummary] = []
+        reported_long = False
+        while not self._stop.wait(check_interval):
+            beat = self._last_beat
+            if stalled_beat is not None:
+                if beat != stalled_beat:
+                    # The loop caught up: the next heartbeat ran this late
+                    self._record(beat - stalled_beat - self.interval, frames)
+                    stalled_beat = None
+                    continue
+                overdue = time.monotonic() - beat - self.interval
+                if not reported_long and overdue >= self.threshold * LONG_STALL_FACTOR:
+                    reported_long = True
+                    logger.error(f"Event loop blocked for {overdue:.1f}s so far at {_call_site(frames)}\n"
+                                 f"{''.join(traceback.format_list(frames))}")
+                continue
+            if time.monotonic() - beat - self.interval > self.threshold:
+                stalled_beat, reported_long = beat, False
+                frames = self._capture()
+    
+    def _record(self, duration: float, frames: List[traceback.FrameSummary]) -> None:
+        site = _call_site(frames)
+        stack = "".join(traceback.format_list(frames[-8:]))
+        now = datetime.now().isoformat()
+        with self._lock:
+            entry = self.sites.get(site)
+            if entry is None:
+                entry = self.sites[site] = {"site": site, "count": 0, "total": 0.0, "max": 0.0, "stack": stack}
+            entry["count"] += 1
+            entry["total"] += duration
+            entry["last_seen"] = now
+            if duration >= entry["max"]:
+                entry["max"], entry["stack"] = duration, stack
+            self.recent.append({"time": now, "duration": duration, "site": site})
+            self.total_stalls += 1
+            self.total_blocked += duration
+        logger.warning(f"Event loop blocked for {duration:.3f}s at {site}\n{stack}")
+    
+    def top_sites(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Call sites by total time blocked, worst first."""
+        with self._lock:
+            sites = [dict(entry) for entry in self.sites.values()]
+        return sorted(sites, key=lambda entry: entry["total"], reverse=True)[:limit]
+    
+    def reset(self) -> None:
+        """Forget all recorded stalls."""
+        with self._lock:
+            self.sites.clear()
+            self.recent.clear()
+            self.total_stalls = 0
+            self.total_blocked = 0.0
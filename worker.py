@@ -0,0 +1,77 @@
+"""
+Ingestion worker process entry point, launched by the gateway's WorkerHubService.
+"""
+import asyncio
+import signal
+import sys
+
+from config import config
+from config.database import DatabaseManager
+from services import (FileTailService, GatewayClientService, MqttIngestionService, ServiceManager,
+                      WebhookIngestionService)
+from utils.executors import ExecutorTier
+from utils.logger import logger
+
+
+class IngestionWorker:
+    """Runs the sensor ingestion services in a process of their own.
+    
+    Services get this object in place of the bot: ``services["honeypot"]`` is
+    a ``GatewayClientService`` that forwards reports to the gateway. Every
+    worker serves the webhook (the port is shared with ``SO_REUSEPORT``, so
+    the kernel spreads connections across them); MQTT and file tailing run
+    in worker 0 only, since they would otherwise read every event N times.
+    """
+    
+    def __init__(self, worker_index: int):
+        self.worker_index = worker_index
+        # Only the file tailer needs the database, for its checkpoints
+        self.db = DatabaseManager(config.DATABASE_PATH) if config.TAIL_ENABLED and worker_index == 0 else None
+        self.executors = ExecutorTier(config.EXECUTOR_THREADS, config.EXECUTOR_PROCESSES)
+        self.services = {}
+        self._init_services()
+        self.service_manager = ServiceManager(self.services)
+    
+    def _init_services(self):
+        """Initialize this worker's services."""
+        self.services['honeypot'] = GatewayClientService(self)
+        if config.WEBHOOK_ENABLED:
+            self.services['webhook_ingestion'] = WebhookIngestionService(self)
+        if self.worker_index == 0:
+            if config.MQTT_ENABLED:
+                self.services['mqtt_ingestion'] = MqttIngestionService(self)
+            if config.TAIL_ENABLED:
+                self.services['file_tail'] = FileTailService(self)
+    
+    async def run(self):
+        """Run until SIGTERM or SIGINT, then drain and stop every service."""
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stop.set)
+        
+        results = await self.service_manager.start_all()
+        failed = [name for name, ok in results.items() if not ok]
+        if failed:
+            logger.warning(f"Worker {self.worker_index}: some services failed to start: {', '.join(failed)}")
+        if not results.get('honeypot'):
+            logger.error(f"Worker {self.worker_index} could not reach the gateway; exiting")
+            await self.service_manager.stop_all()
+            self.executors.shutdown(wait=False)
+            return 1
+        
+        logger.info(f"Ingestion worker {self.worker_index} running")
+        await stop.wait()
+        logger.info(f"Ingestion worker {self.worker_index} shutting down...")
+        await self.service_manager.stop_all()
+        self.executors.shutdown(wait=False)
+        return 0
+
+
+async def main(worker_index: int):
+    """Main function to run an ingestion worker."""
+    try:
+        sys.exit(await IngestionWorker(worker_index).run())
+    except Exception as e:
+        logger.error(f"Worker {worker_index} crashed: {e}")
+        sys.exit(1)